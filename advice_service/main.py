@@ -4,8 +4,9 @@ from pydantic import BaseModel
 import os
 import traceback
 
-OLLAMA_URL = os.getenv("OLLAMA_URL", "http://ollama:11434")
-MODEL_NAME = os.getenv("OLLAMA_MODEL", "phi3:mini")
+# Advice is generated through the summarization service's LLM gateway, which queues it
+# behind interactive summaries and shares one loaded model with them.
+LLM_GATEWAY_URL = os.getenv("LLM_GATEWAY_URL", "http://summarization:9002")
 
 app = FastAPI()
 
@@ -36,12 +37,13 @@ class adviceResponse(BaseModel):
 @app.post("/advice", response_model=adviceResponse)
 async def advise(request: adviceRequest):
     prompt = PROMPT_TEMPLATE.replace("{{TRANSCRIPT}}", request.text)
-    payload = {"model": MODEL_NAME, "prompt": prompt, "stream": False}
+    payload = {"prompt": prompt, "priority": "background"}
 
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
+        # Generous timeout: background requests wait in the gateway's queue first.
+        async with httpx.AsyncClient(timeout=600.0) as client:
             response = await client.post(
-                f"{OLLAMA_URL}/api/generate",
+                f"{LLM_GATEWAY_URL}/generate",
                 json=payload,
             )
             response.raise_for_status()
@@ -50,7 +52,7 @@ async def advise(request: adviceRequest):
             if "response" not in data:
                 raise HTTPException(
                     status_code=500,
-                    detail="Invalid response from Ollama"
+                    detail="Invalid response from the LLM gateway"
                 )
 
             return adviceResponse(advice=data["response"].strip())
@@ -50,3 +50,21 @@ def test_advice_endpoint_ollama_exception():
 
         assert response.status_code == 500
         assert "error" in response.json()["detail"].lower()
+
+
+def test_advice_goes_through_the_llm_gateway_in_the_background():
+    with patch("main.httpx.AsyncClient") as mock_client:
+        mock_instance = mock_client.return_value.__aenter__.return_value
+
+        mock_response = AsyncMock()
+        mock_response.json = Mock(return_value={"response": "Mock advice here."})
+
+        mock_instance.post.return_value = mock_response
+
+        client.post("/advice", json={"text": "Hello"})
+
+        url = mock_instance.post.call_args.args[0]
+        payload = mock_instance.post.call_args.kwargs["json"]
+        assert url.endswith("/generate")
+        assert payload["priority"] == "background"
+        assert "Hello" in payload["prompt"]
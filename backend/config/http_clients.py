@@ -0,0 +1,102 @@
+import importlib.util
+import logging
+import os
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def _service_settings(prefix: str, timeout: float, max_connections: int) -> dict:
+    """Reads the pool settings for one downstream service, e.g. STT_MAX_CONNECTIONS."""
+    return {
+        "timeout": float(os.getenv(f"{prefix}_TIMEOUT_SECONDS", timeout)),
+        "max_connections": int(os.getenv(f"{prefix}_MAX_CONNECTIONS", max_connections)),
+        "max_keepalive_connections": int(
+            os.getenv(f"{prefix}_MAX_KEEPALIVE_CONNECTIONS", max_connections // 2)
+        ),
+        "keepalive_expiry": float(os.getenv(f"{prefix}_KEEPALIVE_EXPIRY_SECONDS", 30.0)),
+    }
+
+
+# --- Configuration ---
+# Every backend-to-service call goes through one of these pools, and callers rely on the
+# pool's timeout (set with e.g. STT_TIMEOUT_SECONDS) rather than passing their own. The STT
+# and translation pools are sized for hundreds of concurrently streaming headsets, with room
+# for whole-file uploads to /api/process-audio; the LLM-backed services are slow and few, so
+# they get small pools with long timeouts (advice may first wait in the LLM gateway's queue).
+SERVICE_CLIENT_SETTINGS = {
+    "stt": _service_settings("STT", timeout=60.0, max_connections=200),
+    "translation": _service_settings("TRANSLATION", timeout=60.0, max_connections=200),
+    "summarization": _service_settings("SUMMARIZATION", timeout=120.0, max_connections=20),
+    "advice": _service_settings("ADVICE", timeout=600.0, max_connections=20),
+}
+HTTP2_ENABLED = os.getenv("SERVICE_HTTP2_ENABLED", "false").lower() == "true"
+
+
+def _http2_supported() -> bool:
+    """HTTP/2 needs the optional `h2` package (installed with `httpx[http2]`)."""
+    if not HTTP2_ENABLED:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("SERVICE_HTTP2_ENABLED is set but 'h2' is not installed; using HTTP/1.1.")
+        return False
+    return True
+
+
+class ServiceClients:
+    """
+    Registry of long-lived, pooled httpx clients, one per downstream service.
+
+    Clients are opened by the application lifespan and closed on shutdown. A client that
+    is requested before startup (e.g. in tests that don't run the lifespan) is created
+    lazily on first use.
+    """
+
+    def __init__(self, settings: dict[str, dict]):
+        self._settings = settings
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        settings = self._settings[name]
+        limits = httpx.Limits(
+            max_connections=settings["max_connections"],
+            max_keepalive_connections=settings["max_keepalive_connections"],
+            keepalive_expiry=settings["keepalive_expiry"],
+        )
+        logger.info(
+            "Opening pooled HTTP client for '%s' (max_connections=%d, timeout=%.1fs).",
+            name,
+            settings["max_connections"],
+            settings["timeout"],
+        )
+        return httpx.AsyncClient(
+            timeout=settings["timeout"], limits=limits, http2=_http2_supported()
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        if name not in self._settings:
+            raise KeyError(f"Unknown service client: {name}")
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create(name)
+            self._clients[name] = client
+        return client
+
+    def start(self) -> None:
+        for name in self._settings:
+            self.get(name)
+
+    async def aclose(self) -> None:
+        for name, client in list(self._clients.items()):
+            await client.aclose()
+            logger.info("Closed pooled HTTP client for '%s'.", name)
+        self._clients.clear()
+
+
+service_clients = ServiceClients(SERVICE_CLIENT_SETTINGS)
+
+
+def get_service_client(name: str) -> httpx.AsyncClient:
+    """Returns the shared, pooled client for a downstream service ('stt', 'translation', ...)."""
+    return service_clients.get(name)
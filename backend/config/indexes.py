@@ -0,0 +1,106 @@
+import logging
+import os
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+# When disabled, startup only reports missing indexes (e.g. where indexes are managed by
+# a migration tool instead).
+MONGO_CREATE_INDEXES = os.getenv("MONGO_CREATE_INDEXES", "true").lower() == "true"
+# How long generated summaries stay in the shared summary cache.
+SUMMARY_CACHE_MONGO_TTL_SECONDS = int(os.getenv("SUMMARY_CACHE_MONGO_TTL_SECONDS", "2592000"))
+
+# The indexes each collection needs, keyed by collection name. Every index is named so
+# that creating it again is a no-op and missing ones can be found by name.
+INDEXES: dict[str, list[IndexModel]] = {
+    "translations": [
+        # History and transcripts: a user's translations, newest first. `_id` is the
+        # tie-breaker of history's keyset pagination.
+        IndexModel(
+            [("userId", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+            name="userId_timestamp_id",
+        ),
+        IndexModel(
+            [("userId", ASCENDING), ("conversationId", ASCENDING), ("timestamp", DESCENDING)],
+            name="userId_conversationId_timestamp",
+        ),
+    ],
+    "summaries": [
+        IndexModel(
+            [("userId", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="userId_created_at_id",
+        ),
+        IndexModel(
+            [
+                ("userId", ASCENDING),
+                ("conversationId", ASCENDING),
+                ("created_at", DESCENDING),
+                ("_id", DESCENDING),
+            ],
+            name="userId_conversationId_created_at_id",
+        ),
+    ],
+    "summary_cache": [
+        IndexModel(
+            [("created_at", ASCENDING)],
+            name="created_at_ttl",
+            expireAfterSeconds=SUMMARY_CACHE_MONGO_TTL_SECONDS,
+        ),
+    ],
+    "users": [IndexModel([("googleId", ASCENDING)], name="googleId_unique", unique=True)],
+    "settings": [IndexModel([("userId", ASCENDING)], name="userId_unique", unique=True)],
+}
+
+
+async def find_missing_indexes(db, indexes: dict[str, list[IndexModel]] = INDEXES) -> dict:
+    """Returns the names of the expected indexes that don't exist, keyed by collection."""
+    missing: dict[str, list[str]] = {}
+    for collection_name, models in indexes.items():
+        existing = await db.get_collection(collection_name).index_information()
+        names = [
+            model.document["name"] for model in models if model.document["name"] not in existing
+        ]
+        if names:
+            missing[collection_name] = names
+    return missing
+
+
+async def ensure_indexes(
+    db, indexes: dict[str, list[IndexModel]] = INDEXES, create: bool = MONGO_CREATE_INDEXES
+) -> dict:
+    """
+    Creates any missing indexes and returns the ones that are still missing afterwards.
+
+    Safe to run on every startup: existing indexes are left alone, and a collection whose
+    indexes can't be created (e.g. duplicate values for a unique index) is logged and
+    skipped without affecting the others.
+    """
+    missing = await find_missing_indexes(db, indexes)
+    if not missing:
+        logger.info("All MongoDB indexes are present.")
+        return {}
+    if not create:
+        for collection_name, names in missing.items():
+            logger.warning("Collection '%s' is missing indexes: %s", collection_name, names)
+        return missing
+
+    still_missing: dict[str, list[str]] = {}
+    for collection_name, names in missing.items():
+        models = [model for model in indexes[collection_name] if model.document["name"] in names]
+        try:
+            await db.get_collection(collection_name).create_indexes(models)
+            logger.info("Created indexes on '%s': %s", collection_name, names)
+        except Exception as e:
+            logger.error("Could not create indexes %s on '%s': %s", names, collection_name, e)
+            still_missing[collection_name] = names
+    return still_missing
+
+
+async def bootstrap_indexes(db) -> None:
+    """Startup hook for `ensure_indexes`; a database that can't be reached is only logged."""
+    try:
+        await ensure_indexes(db)
+    except Exception as e:
+        logger.error("MongoDB index check failed: %s", e)
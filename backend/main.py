@@ -1,10 +1,14 @@
+import asyncio
 import logging
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from config.database import db
+from config.http_clients import service_clients
+from config.indexes import bootstrap_indexes
 from routes.auth import router as auth_router
 from routes.auth_unity import router as auth_unity_router
 from routes.genadvice import router as advice_router
@@ -16,6 +20,8 @@ from routes.summarization import router as summarization_router
 from routes.transcripts import router as transcripts_router
 from routes.users import router as users_router
 from routes.websocket import router as websocket_router
+from services.summary_cache import SUMMARY_CACHE_COLLECTION, summary_cache
+from services.translation_log_writer import translation_log_writer
 
 # --- Logging Configuration ---
 logging.basicConfig(level=logging.INFO, format="%(name)s - %(levelname)s - %(message)s")
@@ -28,8 +34,25 @@ SUMMARIZATION_SERVICE_URL = os.getenv("SUMMARIZATION_URL", "http://summarization
 ADVICE_SERVICE_URL = os.getenv("ADVICE_URL", "http://advice:9003")
 MONGO_DATABASE_URL = os.getenv("DATABASE_URL", "mongodb://mongodb:27017")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Application startup...")
+    service_clients.start()
+    # Index builds on large collections can take a while, so they don't hold up startup.
+    index_bootstrap = asyncio.create_task(bootstrap_indexes(app.state.db))
+    translation_log_writer.start(db.get_collection("translations"))
+    app.state.translation_log_writer = translation_log_writer
+    summary_cache.start(db.get_collection(SUMMARY_CACHE_COLLECTION))
+    yield
+    logger.info("Application shutdown...")
+    index_bootstrap.cancel()
+    await translation_log_writer.close()
+    await service_clients.aclose()
+
+
 # --- FastAPI App & Router Setup ---
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 router = APIRouter()
 app.add_middleware(
     CORSMiddleware,
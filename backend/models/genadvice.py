@@ -7,3 +7,8 @@ class adviceRequest(BaseModel):
 
 class adviceResponse(BaseModel):
     advice: str
+
+
+class conversationAdviceResponse(adviceResponse):
+    conversationId: str
+    segments: int
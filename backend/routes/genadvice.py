@@ -1,28 +1,71 @@
 import os
 
-import httpx
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 
-from models.genadvice import adviceRequest, adviceResponse
+from config.http_clients import get_service_client
+from models.genadvice import adviceRequest, adviceResponse, conversationAdviceResponse
+from security.auth import get_current_user
+from services.transcript_service import fetch_conversation_text
 
 # --- Configuration ---
 ADVICE_SERVICE_URL = os.getenv("ADVICE_URL", "http://advice:9003")
+# Transcript sent to the model for conversation advice; older speech beyond it is left out.
+ADVICE_TRANSCRIPT_MAX_TOKENS = int(os.getenv("ADVICE_TRANSCRIPT_MAX_TOKENS", "3000"))
+# Rough characters per token for English text; close enough to size prompts.
+CHARS_PER_TOKEN = 4
 router = APIRouter()
 
 
+async def _generate_advice(text: str) -> str:
+    response = await get_service_client("advice").post(
+        f"{ADVICE_SERVICE_URL}/advice", json={"text": text}
+    )
+    response.raise_for_status()
+    advice_text = response.json().get("advice")
+    if advice_text is None:
+        raise HTTPException(status_code=500, detail="Advice generation failed.")
+    return advice_text
+
+
 @router.post("", response_model=adviceResponse)
 async def get_advice(request: adviceRequest):
     """
     Receives text, then forwards to the advice generation service.
     """
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            payload = {"text": request.text}
-            response = await client.post(f"{ADVICE_SERVICE_URL}/advice", json=payload)
-            response.raise_for_status()
-            advice_text = response.json().get("advice")
-            if advice_text is None:
-                raise HTTPException(status_code=500, detail="Advice generation failed.")
-            return adviceResponse(advice=advice_text)
+        return adviceResponse(advice=await _generate_advice(request.text))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error during advice generation: {e}") from e
+
+
+@router.post("/conversation/{conversation_id}", response_model=conversationAdviceResponse)
+async def get_conversation_advice(
+    conversation_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user),  # noqa: B008
+):
+    """
+    Gives advice on one of the user's conversations. The transcript is assembled here from
+    the logged translations, so clients send only the conversation's id; if it is longer
+    than the model's budget, the most recent part is used.
+    """
+    user_id = str(current_user["_id"])
+    try:
+        transcript, segments = await fetch_conversation_text(
+            request.app.state.db,
+            user_id=user_id,
+            conversation_id=conversation_id,
+            max_chars=ADVICE_TRANSCRIPT_MAX_TOKENS * CHARS_PER_TOKEN,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load the conversation: {e}") from e
+    if not segments:
+        raise HTTPException(status_code=404, detail="Conversation not found.")
+
+    try:
+        advice_text = await _generate_advice(transcript)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error during advice generation: {e}") from e
+    return conversationAdviceResponse(
+        advice=advice_text, conversationId=conversation_id, segments=segments
+    )
@@ -1,28 +1,121 @@
-from fastapi import APIRouter, HTTPException, Request, Depends
+import os
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
 from security.auth import get_current_user
+from services.history_export import iter_csv, iter_ndjson
+from services.pagination import InvalidCursorError, fetch_page
 
 router = APIRouter()
 
+# --- Configuration ---
+HISTORY_DEFAULT_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+# Documents fetched from MongoDB per round trip while exporting.
+HISTORY_EXPORT_BATCH_SIZE = int(os.getenv("HISTORY_EXPORT_BATCH_SIZE", "500"))
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", iter_ndjson),
+    "csv": ("text/csv; charset=utf-8", iter_csv),
+}
+
+# Only the fields the history views show.
+HISTORY_PROJECTION = {
+    "original_text": 1,
+    "translated_text": 1,
+    "source_lang": 1,
+    "target_lang": 1,
+    "detected_language": 1,
+    "language_probability": 1,
+    "userId": 1,
+    "conversationId": 1,
+    "timestamp": 1,
+}
+
 
 @router.get("")
-async def get_history(request: Request, current_user: dict = Depends(get_current_user)):
+async def get_history(
+    request: Request,
+    limit: int = Query(HISTORY_DEFAULT_PAGE_SIZE, ge=1, le=HISTORY_MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    current_user: dict = Depends(get_current_user),  # noqa: B008
+):
     """
-    Retrieves the translation records for the authenticated user.
+    Retrieves the translation records for the authenticated user, newest first.
+
+    Pass the returned `next_cursor` as `cursor` to get the next page; it is null on the
+    last page.
     """
     try:
         translations_collection = request.app.state.db.get_collection("translations")
-        
+
         # Filter by userId
         user_id = str(current_user["_id"])
-        history_cursor = translations_collection.find({"userId": user_id}).sort("timestamp", -1).limit(50)
+        history_list, next_cursor = await fetch_page(
+            translations_collection,
+            {"userId": user_id},
+            "timestamp",
+            limit,
+            cursor,
+            HISTORY_PROJECTION,
+        )
 
-        history_list = []
-        async for doc in history_cursor:
+        for doc in history_list:
             doc["_id"] = str(doc["_id"])
-            history_list.append(doc)
 
-        return {"history": history_list}
+        return {"history": history_list, "next_cursor": next_cursor}
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to retrieve history from database: {e}"
         ) from e
+
+
+@router.get("/export")
+async def export_history(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    conversationId: str | None = Query(None),
+    current_user: dict = Depends(get_current_user),  # noqa: B008
+):
+    """
+    Streams the user's full translation history, oldest first, as NDJSON or CSV.
+
+    Records are read from a MongoDB cursor batch by batch and written out as they arrive,
+    so memory use doesn't grow with the size of the history. `start` (inclusive) and `end`
+    (exclusive) limit the time range; `conversationId` limits it to one conversation.
+    """
+    if start and end and start >= end:
+        raise HTTPException(status_code=400, detail="'start' must be before 'end'.")
+
+    query: dict = {"userId": str(current_user["_id"])}
+    if conversationId:
+        query["conversationId"] = conversationId
+    if start or end:
+        query["timestamp"] = {}
+        if start:
+            query["timestamp"]["$gte"] = start
+        if end:
+            query["timestamp"]["$lt"] = end
+
+    translations_collection = request.app.state.db.get_collection("translations")
+    documents = (
+        translations_collection.find(query, HISTORY_PROJECTION)
+        .sort("timestamp", 1)
+        .batch_size(HISTORY_EXPORT_BATCH_SIZE)
+    )
+
+    media_type, serialize = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        serialize(documents),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="translation-history.{format}"'
+        },
+    )
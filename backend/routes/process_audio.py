@@ -4,11 +4,11 @@ import logging
 import os
 from datetime import UTC, datetime
 
-import httpx
-from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile, Depends
-from security.auth import get_current_user
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
 
+from config.http_clients import get_service_client
 from models.translation import TranslationResponse
+from security.auth import get_current_user
 
 # --- Configuration ---
 STT_SERVICE_URL = os.getenv("STT_URL", "http://stt:9000")
@@ -33,45 +33,50 @@ async def process_audio_and_translate(
     )
     translations_collection = request.app.state.db.get_collection("translations")
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        # Step 1: STT call
-        try:
-            logger.info("Forwarding audio to STT service at %s", STT_SERVICE_URL)
-            stt_files = {
-                "audio_file": (
-                    audio_file.filename,
-                    await audio_file.read(),
-                    audio_file.content_type,
-                )
-            }
-            stt_response = await client.post(f"{STT_SERVICE_URL}/transcribe", files=stt_files)
-            stt_response.raise_for_status()
-            stt_data = stt_response.json()
-            
-            original_text = stt_data.get("transcription")
-            detected_language = stt_data.get("detected_language", source_lang)
-            language_probability = stt_data.get("language_probability", 0.0)
-            
-            if not original_text:
-                logger.warning("STT service returned an empty transcription.")
-                raise HTTPException(
-                    status_code=400, detail="Transcription failed (no speech detected)."
-                )
-            logger.info(
-                "Successfully transcribed text: '%s' (detected: %s, prob: %.2f)",
-                original_text,
-                detected_language,
-                language_probability,
+    # Step 1: STT call
+    try:
+        logger.info("Forwarding audio to STT service at %s", STT_SERVICE_URL)
+        stt_files = {
+            "audio_file": (
+                audio_file.filename,
+                await audio_file.read(),
+                audio_file.content_type,
             )
-            
-            # Use detected language if confidence is high
-            effective_source_lang = detected_language if language_probability > 0.5 else source_lang
-            
-        except Exception as e:
-            logger.error("Error calling STT service: %s", e, exc_info=True)
-            raise HTTPException(status_code=502, detail=f"Error in STT service: {e}") from e
+        }
+        stt_response = await get_service_client("stt").post(
+            f"{STT_SERVICE_URL}/transcribe", files=stt_files
+        )
+        stt_response.raise_for_status()
+        stt_data = stt_response.json()
+        
+        original_text = stt_data.get("transcription")
+        detected_language = stt_data.get("detected_language", source_lang)
+        language_probability = stt_data.get("language_probability", 0.0)
+        
+        if not original_text:
+            logger.warning("STT service returned an empty transcription.")
+            raise HTTPException(
+                status_code=400, detail="Transcription failed (no speech detected)."
+            )
+        logger.info(
+            "Successfully transcribed text: '%s' (detected: %s, prob: %.2f)",
+            original_text,
+            detected_language,
+            language_probability,
+        )
+        
+        # Use detected language if confidence is high
+        effective_source_lang = detected_language if language_probability > 0.5 else source_lang
+        
+    except Exception as e:
+        logger.error("Error calling STT service: %s", e, exc_info=True)
+        raise HTTPException(status_code=502, detail=f"Error in STT service: {e}") from e
 
-        # Step 2: Translation call
+    # Step 2: Translation call (skipped when the audio is already in the target language)
+    if effective_source_lang == target_lang:
+        logger.info("Source and target language are both '%s'; skipping translation.", target_lang)
+        translated_text = original_text
+    else:
         try:
             logger.info("Forwarding text to translation service at %s", TRANSLATION_SERVICE_URL)
             translation_payload = {
@@ -79,7 +84,7 @@ async def process_audio_and_translate(
                 "source_lang": effective_source_lang,
                 "target_lang": target_lang,
             }
-            translation_response = await client.post(
+            translation_response = await get_service_client("translation").post(
                 f"{TRANSLATION_SERVICE_URL}/translate", json=translation_payload
             )
             translation_response.raise_for_status()
@@ -92,24 +97,24 @@ async def process_audio_and_translate(
             logger.error("Error calling Translation service: %s", e, exc_info=True)
             raise HTTPException(status_code=502, detail=f"Error in Translation service: {e}") from e
 
-        # Step 3: Save to the DB
-        try:
-            logger.info("Saving translation to the database.")
-            translation_log = {
-                "original_text": original_text,
-                "translated_text": translated_text,
-                "source_lang": effective_source_lang,
-                "target_lang": target_lang,
-                "detected_language": detected_language,
-                "language_probability": language_probability,
-                "userId": str(current_user["_id"]),
-                "timestamp": datetime.now(UTC),
-            }
-            await translations_collection.insert_one(translation_log)
-            logger.info("Successfully saved translation to the database.")
-        except Exception as e:
-            logger.critical(
-                "CRITICAL: Failed to save translation to database: %s", e, exc_info=True
-            )
+    # Step 3: Save to the DB
+    try:
+        logger.info("Saving translation to the database.")
+        translation_log = {
+            "original_text": original_text,
+            "translated_text": translated_text,
+            "source_lang": effective_source_lang,
+            "target_lang": target_lang,
+            "detected_language": detected_language,
+            "language_probability": language_probability,
+            "userId": str(current_user["_id"]),
+            "timestamp": datetime.now(UTC),
+        }
+        await translations_collection.insert_one(translation_log)
+        logger.info("Successfully saved translation to the database.")
+    except Exception as e:
+        logger.critical(
+            "CRITICAL: Failed to save translation to database: %s", e, exc_info=True
+        )
 
-        return TranslationResponse(original_text=original_text, translated_text=translated_text)
\ No newline at end of file
+    return TranslationResponse(original_text=original_text, translated_text=translated_text)
\ No newline at end of file
@@ -1,13 +1,30 @@
 import logging
+import os
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 
 from models.settings import SettingsModel, SettingsResponse
 from security.auth import get_current_user
+from services.ttl_cache import TTLCache
+from services.user_connections import user_connections
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# --- Configuration ---
+SETTINGS_CACHE_TTL_SECONDS = float(os.getenv("SETTINGS_CACHE_TTL_SECONDS", "300"))
+SETTINGS_CACHE_MAX_ENTRIES = int(os.getenv("SETTINGS_CACHE_MAX_ENTRIES", "10000"))
+# Push saved settings to the user's open WebSocket connections (e.g. their headset).
+SETTINGS_PUSH_ENABLED = os.getenv("SETTINGS_PUSH_ENABLED", "true").lower() == "true"
+
+# Settings by user id. `save_settings` replaces the entry after writing, so this process
+# never serves settings older than its own last save; the TTL bounds staleness from saves
+# made through other instances.
+_settings_cache = TTLCache(SETTINGS_CACHE_MAX_ENTRIES, SETTINGS_CACHE_TTL_SECONDS)
+# Saves per user id, so a read that raced a save of the same user's settings doesn't put
+# the older settings in the cache.
+_settings_saves: dict[str, int] = {}
+
 
 @router.get("", response_model=SettingsResponse)
 async def get_settings(
@@ -18,21 +35,28 @@ async def get_settings(
     If no settings exist for the user, returns default values.
     """
     user_id = str(current_user["_id"])
+    cached = _settings_cache.get(user_id)
+    if cached is not None:
+        return SettingsResponse(settings=cached)
+
     logger.info(f"Attempting to retrieve settings from database for user: {user_id}")
     try:
+        saves_before_read = _settings_saves.get(user_id, 0)
         settings_collection = request.app.state.db.get_collection("settings")
         settings_doc = await settings_collection.find_one({"userId": user_id})
 
         if not settings_doc:
             logger.info(f"No settings found for user {user_id}, returning default values.")
-            default_settings = SettingsModel()
-            return SettingsResponse(settings=default_settings)
+            settings = SettingsModel()
         else:
             logger.info(f"Successfully retrieved settings for user {user_id}.")
             settings_doc.pop("_id", None)
             settings_doc.pop("userId", None)
             settings = SettingsModel(**settings_doc)
-            return SettingsResponse(settings=settings)
+
+        if _settings_saves.get(user_id, 0) == saves_before_read:
+            _settings_cache.set(user_id, settings)
+        return SettingsResponse(settings=settings)
 
     except Exception as e:
         logger.error(f"Failed to retrieve settings for user {user_id}: {e}", exc_info=True)
@@ -46,7 +70,8 @@ async def save_settings(
     current_user: dict = Depends(get_current_user),  # noqa: B008
 ):
     """
-    Saves or updates application settings for the authenticated user in the database.
+    Saves or updates application settings for the authenticated user in the database, and
+    pushes them to the user's open WebSocket connections.
     """
     user_id = str(current_user["_id"])
     logger.info(f"Attempting to save settings to database for user: {user_id}")
@@ -62,9 +87,21 @@ async def save_settings(
             settings_dict,
             upsert=True,
         )
+        _settings_saves[user_id] = _settings_saves.get(user_id, 0) + 1
+        _settings_cache.set(user_id, settings_update)
         logger.info(f"Successfully saved settings for user {user_id}.")
-        return SettingsResponse(settings=settings_update)
-
     except Exception as e:
+        # The write may still have been applied, so drop what we have.
+        _settings_saves[user_id] = _settings_saves.get(user_id, 0) + 1
+        _settings_cache.invalidate(user_id)
         logger.error(f"Failed to save settings for user {user_id}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to save settings: {e}") from e
+
+    if SETTINGS_PUSH_ENABLED:
+        delivered = await user_connections.send_to_user(
+            user_id,
+            {"type": "settings_updated", "settings": settings_update.model_dump()},
+        )
+        if delivered:
+            logger.info(f"Pushed new settings to {delivered} connection(s) of user {user_id}.")
+    return SettingsResponse(settings=settings_update)
@@ -1,15 +1,23 @@
+import json
 import logging
 import os
 from datetime import UTC, datetime
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
+from config.http_clients import get_service_client
 from models.summarization import SummarizationRequest, SummarizationResponse, SummarySaveRequest
 from security.auth import get_current_user
+from services.pagination import InvalidCursorError, fetch_page
+from services.rolling_summary import rolling_summarizer
+from services.summary_cache import summary_cache, summary_cache_key
 
 # --- Configuration ---
 SUMMARIZATION_SERVICE_URL = os.getenv("SUMMARIZATION_URL", "http://summarization:9002")
+SUMMARY_HISTORY_DEFAULT_PAGE_SIZE = 50
+SUMMARY_HISTORY_MAX_PAGE_SIZE = 100
 
 # --- Logger Setup ---
 logger = logging.getLogger(__name__)
@@ -21,37 +29,47 @@ router = APIRouter()
 async def get_summary(request: SummarizationRequest):
     """
     Receives text and a desired length, then forwards to the summarization service.
+    Summaries are cached by content, so asking again for the same text and length doesn't
+    run the model again.
     """
     logger.info(
         "Received request: summarize text of length %d with length '%s'.",
         len(request.text),
         request.length,
     )
+    cache_key = summary_cache_key(request.text, request.length)
+    cached_summary = await summary_cache.get(cache_key)
+    if cached_summary is not None:
+        logger.info("Returning cached summary.")
+        return SummarizationResponse(summary=cached_summary)
+
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            payload = {"text": request.text, "length": request.length}
-            logger.info(
-                "Forwarding request to summarization service at %s/summarize",
-                SUMMARIZATION_SERVICE_URL,
-            )
-            response = await client.post(f"{SUMMARIZATION_SERVICE_URL}/summarize", json=payload)
+        payload = {"text": request.text, "length": request.length}
+        logger.info(
+            "Forwarding request to summarization service at %s/summarize",
+            SUMMARIZATION_SERVICE_URL,
+        )
+        response = await get_service_client("summarization").post(
+            f"{SUMMARIZATION_SERVICE_URL}/summarize", json=payload
+        )
+
+        logger.info(
+            "Received response with status code %d from summarization service.",
+            response.status_code,
+        )
 
-            logger.info(
-                "Received response with status code %d from summarization service.",
-                response.status_code,
+        response.raise_for_status()
+        summary_text = response.json().get("summary")
+        if summary_text is None:
+            logger.error(
+                "Summarization service returned a successful status code "
+                "but the response did not contain a 'summary' key."
             )
+            raise HTTPException(status_code=500, detail="Summarization failed.")
 
-            response.raise_for_status()
-            summary_text = response.json().get("summary")
-            if summary_text is None:
-                logger.error(
-                    "Summarization service returned a successful status code "
-                    "but the response did not contain a 'summary' key."
-                )
-                raise HTTPException(status_code=500, detail="Summarization failed.")
-
-            logger.info("Successfully received summary from summarization service.")
-            return SummarizationResponse(summary=summary_text)
+        logger.info("Successfully received summary from summarization service.")
+        await summary_cache.put(cache_key, summary_text, request.length)
+        return SummarizationResponse(summary=summary_text)
     except httpx.RequestError as e:
         logger.error(
             f"Could not connect to the summarization service at {SUMMARIZATION_SERVICE_URL}: {e}",
@@ -80,6 +98,92 @@ async def get_summary(request: SummarizationRequest):
         raise HTTPException(status_code=500, detail=f"Error during summarization: {e}") from e
 
 
+class _UpstreamStreamingResponse(StreamingResponse):
+    """
+    Relays an upstream streaming response and closes it however the response ends,
+    including when the client has gone away before the body starts (then the relay never
+    runs and could not close it itself).
+    """
+
+    def __init__(self, content, upstream: httpx.Response):
+        super().__init__(content, media_type="application/x-ndjson")
+        self._upstream = upstream
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._upstream.aclose()
+
+
+@router.post("/stream")
+async def stream_summary(request: SummarizationRequest):
+    """
+    Streams a summary as it is generated. The summarization service's NDJSON lines
+    (`{"token": ...}` pieces, then `{"done": true, "summary": ...}`, or `{"error": ...}`)
+    are passed through to the client unchanged as they arrive.
+    """
+    logger.info(
+        "Received request: stream summary of text of length %d with length '%s'.",
+        len(request.text),
+        request.length,
+    )
+    cache_key = summary_cache_key(request.text, request.length)
+    cached_summary = await summary_cache.get(cache_key)
+    if cached_summary is not None:
+        logger.info("Returning cached summary.")
+        line = json.dumps({"done": True, "summary": cached_summary}) + "\n"
+        return StreamingResponse(iter([line]), media_type="application/x-ndjson")
+
+    client = get_service_client("summarization")
+    payload = {"text": request.text, "length": request.length}
+    try:
+        response = await client.send(
+            client.build_request(
+                "POST", f"{SUMMARIZATION_SERVICE_URL}/summarize/stream", json=payload
+            ),
+            stream=True,
+        )
+    except httpx.RequestError as e:
+        logger.error(
+            f"Could not connect to the summarization service at {SUMMARIZATION_SERVICE_URL}: {e}",
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=503,
+            detail="The summarization service is currently unavailable.",
+        ) from e
+
+    if response.is_error:
+        body = (await response.aread()).decode(errors="replace")
+        await response.aclose()
+        logger.error(
+            "The summarization service returned an error: %d - %s", response.status_code, body
+        )
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"Summarization service failed: {body}",
+        )
+
+    async def relay():
+        # Lines are only inspected to find the final summary for the cache.
+        partial_line = b""
+        try:
+            async for chunk in response.aiter_bytes():
+                yield chunk
+                *lines, partial_line = (partial_line + chunk).split(b"\n")
+                for line in lines:
+                    if b'"done"' in line:
+                        event = json.loads(line)
+                        if event.get("done") and "summary" in event:
+                            await summary_cache.put(cache_key, event["summary"], request.length)
+        except httpx.HTTPError as e:
+            logger.error("Summary stream from the summarization service broke off: %s", e)
+            yield b'{"error": "The summary stream was interrupted."}\n'
+
+    return _UpstreamStreamingResponse(relay(), response)
+
+
 @router.post("/save")
 async def save_summary(
     payload: SummarySaveRequest,
@@ -116,8 +220,16 @@ async def save_summary(
 async def get_summary_history(
     request: Request,
     conversationId: str | None = Query(None),
+    limit: int = Query(SUMMARY_HISTORY_DEFAULT_PAGE_SIZE, ge=1, le=SUMMARY_HISTORY_MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    include_original_text: bool = Query(False),
     current_user: dict = Depends(get_current_user),  # noqa: B008
 ):
+    """
+    Returns the user's saved summaries, newest first, one page at a time (pass the returned
+    `next_cursor` as `cursor` for the next page). The full transcript each summary was made
+    from is left out unless `include_original_text` is set.
+    """
     if not current_user:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
@@ -127,11 +239,70 @@ async def get_summary_history(
     if conversationId:
         query["conversationId"] = conversationId
 
-    cursor = summaries.find(query).sort("created_at", -1)
+    projection = None if include_original_text else {"original_text": 0}
+    try:
+        history, next_cursor = await fetch_page(
+            summaries, query, "created_at", limit, cursor, projection
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
-    history = []
-    async for doc in cursor:
+    for doc in history:
         doc["_id"] = str(doc["_id"])
-        history.append(doc)
 
-    return {"history": history}
+    return {"history": history, "next_cursor": next_cursor}
+
+
+@router.get("/conversation/{conversation_id}")
+async def get_conversation_summary(
+    conversation_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user),  # noqa: B008
+):
+    """
+    Returns the running summary of one of the user's conversations, first folding in any
+    transcript segments logged since it was last brought up to date.
+    """
+    user_id = str(current_user["_id"])
+
+    async def fold(summary: str, new_text: str) -> str:
+        response = await get_service_client("summarization").post(
+            f"{SUMMARIZATION_SERVICE_URL}/summarize/update",
+            json={"summary": summary, "text": new_text},
+        )
+        response.raise_for_status()
+        return response.json()["summary"]
+
+    try:
+        state = await rolling_summarizer.refresh(
+            request.app.state.db, user_id, conversation_id, fold
+        )
+    except httpx.RequestError as e:
+        logger.error(
+            f"Could not connect to the summarization service at {SUMMARIZATION_SERVICE_URL}: {e}",
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=503,
+            detail="The summarization service is currently unavailable.",
+        ) from e
+    except httpx.HTTPStatusError as e:
+        logger.error(
+            "The summarization service returned an error: %d - %s",
+            e.response.status_code,
+            e.response.text,
+        )
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=f"Summarization service failed: {e.response.text}",
+        ) from e
+    except Exception as e:
+        logger.error(f"Failed to update the conversation summary: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error during summarization: {e}") from e
+
+    return {
+        "conversationId": conversation_id,
+        "summary": state["summary"],
+        "segments": state["segments"],
+        "updated_at": state["updated_at"],
+    }
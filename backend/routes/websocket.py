@@ -8,7 +8,16 @@ from uuid import uuid4
 import httpx
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from config.http_clients import get_service_client
 from security.auth import verify_jwt_token
+from services.audio_formats import PcmAudio, audio_duration_seconds, audio_from_frame
+from services.chunk_pipeline import ChunkPipeline
+from services.conversation_hub import conversation_hub
+from services.language_tracker import LanguageTracker
+from services.streaming_session import StreamingSession
+from services.transcript_stitcher import StitchTicket, TranscriptStitcher
+from services.user_connections import user_connections
+from services.voice_activity import VoiceActivityGate
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +28,84 @@ STT_SERVICE_URL = os.getenv("STT_URL", "http://stt:9000")
 TRANSLATION_SERVICE_URL = os.getenv("TRANSLATION_URL", "http://translation:9001")
 
 
+def _unpack_frame(data: bytes) -> tuple[dict, bytes]:
+    """Splits a frame into its JSON metadata (4-byte little-endian length prefix) and audio."""
+    metadata_length = int.from_bytes(data[:4], byteorder="little")
+    metadata_json = data[4 : 4 + metadata_length].decode("utf-8")
+    return json.loads(metadata_json), data[4 + metadata_length :]
+
+
+async def _submit_chunk(
+    pipeline: ChunkPipeline,
+    gate: VoiceActivityGate,
+    stitcher: TranscriptStitcher,
+    language_tracker: LanguageTracker,
+    metadata: dict,
+    audio_data: bytes | PcmAudio,
+    *args,
+) -> None:
+    """Sends speech through the pipeline; silent chunks get an empty result without STT."""
+    gated_audio, leading_offset = gate.apply(audio_data)
+    stitch_ticket = stitcher.ticket(
+        audio_duration_seconds(audio_data),
+        leading_offset,
+        metadata.get("chunk_overlap_seconds"),
+    )
+    if gated_audio is None:
+        stitch_ticket.resolve([])
+        await pipeline.submit_result({"original_text": "", "translated_text": "", "silent": True})
+    else:
+        await pipeline.submit(gated_audio, *args, stitch_ticket, language_tracker)
+
+
+async def _may_listen(websocket: WebSocket, user_id: str, conversation_id: str) -> bool:
+    """
+    A user belongs to a conversation if they are speaking in it right now or have spoken
+    in it before (their translations are logged under it).
+    """
+    if conversation_hub.is_speaker(conversation_id, user_id):
+        return True
+    db = getattr(websocket.app.state, "db", None)
+    if db is None:
+        return False
+    doc = await db.get_collection("translations").find_one(
+        {"userId": user_id, "conversationId": conversation_id}, {"_id": 1}
+    )
+    return doc is not None
+
+
+async def _after_results_sent(websocket, callback) -> None:
+    """
+    Runs `callback(sequence)` once the chunk's own results are out: from the pipeline's
+    sequencer for pipelined chunks (in chunk order), straight away otherwise.
+    """
+    after_send = getattr(websocket, "after_send", None)
+    if after_send is not None:
+        after_send(callback)
+    else:
+        await callback(None)
+
+
+def _release_results(websocket) -> None:
+    """Lets the pipeline send a chunk's results now rather than when the worker finishes."""
+    release = getattr(websocket, "release", None)
+    if release is not None:
+        release()
+
+
+def _release_stitch_ticket(
+    audio_data: bytes | PcmAudio,
+    source_lang: str,
+    target_lang: str,
+    user_id: str,
+    conversation_id: str,
+    stitch_ticket: StitchTicket,
+    language_tracker: LanguageTracker,
+) -> None:
+    """Called for chunks the pipeline drops, so later chunks don't wait on them."""
+    stitch_ticket.resolve(None)
+
+
 @router.websocket("")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
@@ -27,13 +114,21 @@ async def websocket_endpoint(websocket: WebSocket):
 
     # Store userId for this connection
     user_id = None
+    pipeline = None
+    session = None
+    listening_to = None
+    speaking_in = None
+    # Cheap energy-based gate so silence never reaches STT or translation.
+    gate = VoiceActivityGate()
+    # Removes words transcribed twice because clients overlap consecutive chunks.
+    stitcher = TranscriptStitcher()
+    # Once the spoken language is stable, Whisper can skip language detection.
+    language_tracker = LanguageTracker()
 
     try:
         # First message should contain authentication
         first_data = await websocket.receive_bytes()
-        metadata_length = int.from_bytes(first_data[:4], byteorder="little")
-        metadata_json = first_data[4 : 4 + metadata_length].decode("utf-8")
-        metadata = json.loads(metadata_json)
+        metadata, audio_data = _unpack_frame(first_data)
 
         # Authenticate the connection
         jwt_token = metadata.get("jwt_token")
@@ -41,6 +136,8 @@ async def websocket_endpoint(websocket: WebSocket):
             user_id = await verify_jwt_token(jwt_token)
             if user_id:
                 logger.info(f"WebSocket authenticated for user: {user_id}")
+                # Lets the backend push this user's changed settings to the connection.
+                user_connections.register(user_id, websocket)
             else:
                 logger.warning("JWT verification failed")
                 await websocket.close(code=4001, reason="Authentication failed")
@@ -49,28 +146,92 @@ async def websocket_endpoint(websocket: WebSocket):
             logger.warning("No JWT token provided in initial message")
 
         # Process first audio chunk
-        audio_data = first_data[4 + metadata_length :]
         source_lang = metadata.get("source_lang", "en")
         target_lang = metadata.get("target_lang", "es")
         conversation_id = metadata.get("conversation_id")
 
-        # Process sequentially - await this before accepting next message
-        await process_audio_chunk(
-            websocket, audio_data, source_lang, target_lang, user_id, conversation_id
+        if metadata.get("mode") == "listen":
+            # Listen mode: no audio; receive every speaker's results for the conversation,
+            # translated to this connection's target language.
+            if not conversation_id:
+                raise ValueError("Listen mode requires a conversation_id")
+            if not user_id:
+                await websocket.close(code=4001, reason="Listen mode requires authentication")
+                return
+            if not await _may_listen(websocket, user_id, conversation_id):
+                logger.warning(
+                    "User %s may not listen to conversation %s.", user_id, conversation_id
+                )
+                await websocket.close(code=4003, reason="Not a member of this conversation")
+                return
+            conversation_hub.subscribe(conversation_id, websocket, target_lang)
+            listening_to = conversation_id
+            while True:
+                metadata, _ = _unpack_frame(await websocket.receive_bytes())
+                if metadata.get("target_lang"):
+                    conversation_hub.subscribe(conversation_id, websocket, metadata["target_lang"])
+
+        if user_id and conversation_id:
+            conversation_hub.add_speaker(conversation_id, websocket, user_id)
+            speaking_in = conversation_id
+
+        if metadata.get("mode") == "stream":
+            # Streaming mode: small raw PCM frames, interim hypotheses, then a final segment.
+            session = StreamingSession(
+                websocket,
+                lambda sink, audio, is_final: process_stream_segment(
+                    sink,
+                    audio,
+                    is_final,
+                    source_lang,
+                    target_lang,
+                    user_id,
+                    conversation_id,
+                    language_tracker,
+                ),
+                sample_rate=int(metadata.get("sample_rate", 16000)),
+                encoding=metadata.get("encoding", "pcm_s16le"),
+                gate=gate,
+            )
+            session.start()
+            session.feed(audio_data, bool(metadata.get("end_of_segment")))
+            while True:
+                metadata, audio_data = _unpack_frame(await websocket.receive_bytes())
+                session.feed(audio_data, bool(metadata.get("end_of_segment")))
+
+        # Chunks go through a bounded pipeline so the next frame can be received while
+        # earlier chunks are still being transcribed. Results are still sent in order.
+        pipeline = ChunkPipeline(websocket, process_audio_chunk, on_drop=_release_stitch_ticket)
+        pipeline.start()
+        audio_data = audio_from_frame(metadata, audio_data)
+        await _submit_chunk(
+            pipeline,
+            gate,
+            stitcher,
+            language_tracker,
+            metadata,
+            audio_data,
+            source_lang,
+            target_lang,
+            user_id,
+            conversation_id,
         )
 
         # Continue receiving subsequent messages
         while True:
             data = await websocket.receive_bytes()
-            metadata_length = int.from_bytes(data[:4], byteorder="little")
-            metadata_json = data[4 : 4 + metadata_length].decode("utf-8")
-            audio_data = data[4 + metadata_length :]
-            metadata = json.loads(metadata_json)
+            metadata, audio_data = _unpack_frame(data)
+            audio_data = audio_from_frame(metadata, audio_data)
 
             source_lang = metadata.get("source_lang", "en")
             target_lang = metadata.get("target_lang", "es")
-            
             conversation_id = metadata.get("conversation_id", conversation_id)
+            if user_id and conversation_id != speaking_in:
+                if speaking_in is not None:
+                    conversation_hub.remove_speaker(speaking_in, websocket)
+                if conversation_id:
+                    conversation_hub.add_speaker(conversation_id, websocket, user_id)
+                speaking_in = conversation_id
 
             logger.info(
                 "Received audio chunk from user %s: %d bytes, lang: %s -> %s",
@@ -80,124 +241,298 @@ async def websocket_endpoint(websocket: WebSocket):
                 target_lang,
             )
 
-            # This ensures we don't start the next chunk until this one is done.
-            # It prevents the server from getting stuck/overloaded and ensures order.
-            await process_audio_chunk(
-                websocket, audio_data, source_lang, target_lang, user_id, conversation_id
+            await _submit_chunk(
+                pipeline,
+                gate,
+                stitcher,
+                language_tracker,
+                metadata,
+                audio_data,
+                source_lang,
+                target_lang,
+                user_id,
+                conversation_id,
             )
 
     except WebSocketDisconnect:
         logger.info("WebSocket client %s disconnected.", client_host)
+    except ValueError as e:
+        # Raised for frames with an audio encoding we don't support.
+        logger.warning("Rejecting WebSocket client %s: %s", client_host, e)
+        await websocket.close(code=1003, reason=str(e))
     except Exception as e:
         logger.error("WebSocket error with client %s: %s", client_host, e, exc_info=True)
         await websocket.close()
     finally:
+        if user_id:
+            user_connections.unregister(user_id, websocket)
+        if listening_to is not None:
+            conversation_hub.unsubscribe(listening_to, websocket)
+        if speaking_in is not None:
+            conversation_hub.remove_speaker(speaking_in, websocket)
+        if session is not None:
+            await session.close()
+        if pipeline is not None:
+            await pipeline.close()
+            if pipeline.dropped_chunks:
+                logger.info(
+                    "Dropped %d chunk(s) for %s because STT fell behind.",
+                    pipeline.dropped_chunks,
+                    client_host,
+                )
+        if gate.chunks_total:
+            logger.info("Voice activity stats for %s: %s", client_host, gate.stats())
+        if language_tracker.detections_skipped:
+            logger.info(
+                "Skipped language detection for %d chunk(s) from %s.",
+                language_tracker.detections_skipped,
+                client_host,
+            )
+        if stitcher.words_deduplicated:
+            logger.info(
+                "Removed %d overlapping word(s) for %s.", stitcher.words_deduplicated, client_host
+            )
         logger.info("Closing WebSocket connection handler for %s.", client_host)
 
 
+async def transcribe_audio(
+    audio_data: bytes | PcmAudio,
+    language: str | None = None,
+    session_id: str | None = None,
+    detect_language: bool = False,
+) -> dict:
+    """
+    Sends audio to the STT service and returns its JSON response. Raw PCM goes to the
+    decode-free `/transcribe/pcm` endpoint; anything else is uploaded as a WAV file.
+    A known `language` lets Whisper skip language detection, and a `session_id` lets STT
+    use the connection's previous text as context. `detect_language` asks for a real
+    detection even when the STT session has a language of its own.
+    """
+    hints = {
+        "language": language,
+        "session_id": session_id,
+        "detect_language": "true" if detect_language else None,
+    }
+    hints = {key: value for key, value in hints.items() if value}
+    if isinstance(audio_data, PcmAudio):
+        params = {"sample_rate": audio_data.sample_rate, "encoding": audio_data.encoding}
+        params.update(hints)
+        stt_response = await get_service_client("stt").post(
+            f"{STT_SERVICE_URL}/transcribe/pcm",
+            params=params,
+            content=audio_data.data,
+            headers={"Content-Type": "application/octet-stream"},
+        )
+    else:
+        files = {"audio_file": ("chunk.wav", audio_data, "audio/wav")}
+        data = hints or None
+        stt_response = await get_service_client("stt").post(
+            f"{STT_SERVICE_URL}/transcribe", files=files, data=data
+        )
+    stt_response.raise_for_status()
+    return stt_response.json()
+
+
+async def translate_text(text: str, source_lang: str, target_lang: str) -> str:
+    """Sends text to the translation service and returns the translated text."""
+    if source_lang == target_lang:
+        return text
+
+    translation_payload = {
+        "text": text,
+        "source_lang": source_lang,
+        "target_lang": target_lang,
+    }
+    translation_response = await get_service_client("translation").post(
+        f"{TRANSLATION_SERVICE_URL}/translate", json=translation_payload
+    )
+    translation_response.raise_for_status()
+    return translation_response.json().get("translated_text", "")
+
+
+async def translate_text_to_targets(
+    text: str, source_lang: str, target_langs: set[str]
+) -> dict[str, str]:
+    """
+    Translates text into several languages at once through the translation service's
+    batch endpoint. Returns a mapping of target language to translated text.
+    """
+    # Nothing to translate for listeners who already speak the source language.
+    translations = {source_lang: text} if source_lang in target_langs else {}
+    ordered_targets = sorted(target_langs - {source_lang})
+    if len(ordered_targets) <= 1:
+        for target_lang in ordered_targets:
+            translations[target_lang] = await translate_text(text, source_lang, target_lang)
+        return translations
+
+    batch_payload = {
+        "segments": [
+            {"text": text, "source_lang": source_lang, "target_lang": target_lang}
+            for target_lang in ordered_targets
+        ]
+    }
+    translation_response = await get_service_client("translation").post(
+        f"{TRANSLATION_SERVICE_URL}/translate/batch", json=batch_payload
+    )
+    translation_response.raise_for_status()
+    batch_translations = translation_response.json().get("translations", [])
+    translations.update(zip(ordered_targets, batch_translations, strict=True))
+    return translations
+
+
+def _effective_source_lang(
+    source_lang: str, detected_language: str, language_probability: float
+) -> str:
+    # Use detected language if confidence is reasonable (>0.3 instead of 0.5)
+    return detected_language if language_probability > 0.3 else source_lang
+
+
 async def process_audio_chunk(
     websocket: WebSocket,
-    audio_data: bytes,
+    audio_data: bytes | PcmAudio,
     source_lang: str,
     target_lang: str,
     user_id: str,
     conversation_id: str,
+    stitch_ticket: StitchTicket | None = None,
+    language_tracker: LanguageTracker | None = None,
 ):
     """
-    Process audio chunk: transcribe, detect language, translate, and save to database
+    Process audio chunk: transcribe, detect language, translate, and save to database.
+    With a `stitch_ticket`, only the text not already covered by the previous (overlapping)
+    chunk is translated, saved and sent. With a `language_tracker`, a confirmed language is
+    passed to STT so it can skip language detection.
     """
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Step 1: Send to STT service
-            files = {"audio_file": ("chunk.wav", audio_data, "audio/wav")}
-
-            stt_response = await client.post(f"{STT_SERVICE_URL}/transcribe", files=files)
-            stt_response.raise_for_status()
-            stt_data = stt_response.json()
-            
-            original_text = stt_data.get("transcription", "")
-            detected_language = stt_data.get("detected_language", source_lang)
-            language_probability = stt_data.get("language_probability", 0.0)
-
-            if not original_text or not original_text.strip():
-                logger.info("No transcription detected in chunk.")
-                await websocket.send_json({
-                    "original_text": "",
-                    "translated_text": "",
-                    "detected_language": detected_language,
-                    "language_probability": language_probability,
-                })
-                return
+        # Step 1: Send to STT service
+        language_hint = None
+        session_id = None
+        detect_language = False
+        if language_tracker is not None:
+            language_hint = language_tracker.language_hint()
+            session_id = language_tracker.session_id
+            # Without a hint the tracker wants a detection, not the STT session's language.
+            detect_language = language_hint is None
+        stt_data = await transcribe_audio(audio_data, language_hint, session_id, detect_language)
 
-            logger.info(
-                "STT result: '%s' (detected language: %s, probability: %.2f)",
-                original_text,
-                detected_language,
-                language_probability,
-            )
+        original_text = stt_data.get("transcription", "")
+        if stitch_ticket is not None:
+            original_text = await stitch_ticket.stitch(original_text, stt_data.get("words"))
+        detected_language = stt_data.get("detected_language", source_lang)
+        language_probability = stt_data.get("language_probability", 0.0)
+        if language_tracker is not None and stt_data.get("language_detected", not language_hint):
+            language_tracker.observe(detected_language, language_probability)
 
-            # Use detected language if confidence is reasonable (>0.3 instead of 0.5)
-            effective_source_lang = detected_language if language_probability > 0.3 else source_lang
+        if not original_text or not original_text.strip():
+            logger.info("No transcription detected in chunk.")
+            await websocket.send_json({
+                "original_text": "",
+                "translated_text": "",
+                "detected_language": detected_language,
+                "language_probability": language_probability,
+            })
+            return
 
-            logger.info(
-                "Language decision: using '%s' (detected: '%s' with %.2f confidence, provided: '%s')",
-                effective_source_lang,
-                detected_language,
-                language_probability,
-                source_lang,
-            )
+        logger.info(
+            "STT result: '%s' (detected language: %s, probability: %.2f)",
+            original_text,
+            detected_language,
+            language_probability,
+        )
 
-            # Step 2: Translate the text
-            translation_payload = {
-                "text": original_text,
-                "source_lang": effective_source_lang,
-                "target_lang": target_lang,
-            }
+        effective_source_lang = _effective_source_lang(
+            source_lang, detected_language, language_probability
+        )
 
-            translation_response = await client.post(
-                f"{TRANSLATION_SERVICE_URL}/translate", json=translation_payload
-            )
-            translation_response.raise_for_status()
-            translated_text = translation_response.json().get("translated_text", "")
-            logger.info("Translation result: '%s'", translated_text)
-
-            # Step 3: Save to database
-            try:
-                # Ensure db is available
-                if hasattr(websocket.app.state, "db"):
+        logger.info(
+            "Language decision: using '%s' (detected: '%s' with %.2f confidence, provided: '%s')",
+            effective_source_lang,
+            detected_language,
+            language_probability,
+            source_lang,
+        )
+
+        # Step 2: Translate the text, also into the languages of anyone listening in
+        listener_langs = conversation_hub.target_languages(conversation_id)
+        translations = await translate_text_to_targets(
+            original_text, effective_source_lang, {target_lang} | listener_langs
+        )
+        translated_text = translations[target_lang]
+        logger.info("Translation result: '%s'", translated_text)
+
+        # Step 3: Send the result back before anything else
+        response = {
+            "original_text": original_text,
+            "translated_text": translated_text,
+            "detected_language": detected_language,
+            "language_probability": language_probability,
+        }
+
+        await websocket.send_json(response)
+
+        # Step 4: Push the result to the conversation's listeners, after the speaker's own
+        # result so listeners get the speaker's chunks in order
+        if listener_langs:
+            timestamp = datetime.now(UTC).isoformat()
+
+            async def broadcast(sequence: int | None) -> None:
+                await conversation_hub.broadcast(
+                    conversation_id,
+                    {
+                        lang: {
+                            "type": "broadcast",
+                            "conversation_id": conversation_id,
+                            "speaker_id": user_id,
+                            "original_text": original_text,
+                            "translated_text": translations[lang],
+                            "target_lang": lang,
+                            "detected_language": detected_language,
+                            "timestamp": timestamp,
+                            "sequence": sequence,
+                        }
+                        for lang in listener_langs
+                    },
+                )
+
+            await _after_results_sent(websocket, broadcast)
+
+        # The result is complete; don't hold it back while the log is written.
+        _release_results(websocket)
+
+        # Step 5: Log the translation. The write-behind buffer batches inserts off the
+        # request path; without it (e.g. outside the app lifespan) the log is written directly.
+        try:
+            # Ensure db is available
+            if hasattr(websocket.app.state, "db"):
+                translation_log = {
+                    "original_text": original_text,
+                    "translated_text": translated_text,
+                    "source_lang": effective_source_lang,
+                    "target_lang": target_lang,
+                    "detected_language": detected_language,
+                    "language_probability": language_probability,
+                    "userId": user_id,
+                    # Fallback to generating a new ID if one wasn't provided
+                    "conversationId": conversation_id or str(uuid4()),
+                    "timestamp": datetime.now(UTC),
+                }
+                log_writer = getattr(websocket.app.state, "translation_log_writer", None)
+                if log_writer is not None and log_writer.running:
+                    await log_writer.enqueue(translation_log)
+                    outcome = "Queued translation for the database"
+                else:
                     db = websocket.app.state.db
                     translations_collection = db.get_collection("translations")
-                    translation_log = {
-                        "original_text": original_text,
-                        "translated_text": translated_text,
-                        "source_lang": effective_source_lang,
-                        "target_lang": target_lang,
-                        "detected_language": detected_language,
-                        "language_probability": language_probability,
-                        "userId": user_id,
-                        # Fallback to generating a new ID if one wasn't provided
-                        "conversationId": conversation_id or str(uuid4()),
-                        "timestamp": datetime.now(UTC),
-                    }
                     await translations_collection.insert_one(translation_log)
-                    logger.info(
-                        f"Saved translation to database (userId: {user_id}, "
-                        f"detected_lang: {detected_language}, confidence: {language_probability:.2f})"
-                    )
-            except Exception as e:
-                logger.warning(
-                    "Failed to save WebSocket translation to database: %s", e, exc_info=True
+                    outcome = "Saved translation to database"
+                logger.info(
+                    f"{outcome} (userId: {user_id}, "
+                    f"detected_lang: {detected_language}, confidence: {language_probability:.2f})"
                 )
-
-            # Step 4: Send result back
-            response = {
-                "original_text": original_text,
-                "translated_text": translated_text,
-                "detected_language": detected_language,
-                "language_probability": language_probability,
-            }
-
-            await websocket.send_json(response)
+        except Exception as e:
+            logger.warning(
+                "Failed to save WebSocket translation to database: %s", e, exc_info=True
+            )
 
     except httpx.HTTPError as e:
         logger.error("HTTP error during audio chunk processing: %s", e, exc_info=True)
@@ -211,3 +546,74 @@ async def process_audio_chunk(
             await websocket.send_json(error_response)
         except WebSocketDisconnect:
             logger.warning("Could not send error to client as they disconnected.")
+    finally:
+        if stitch_ticket is not None:
+            stitch_ticket.resolve(None)
+
+
+async def process_interim_chunk(
+    websocket: WebSocket,
+    audio_data: bytes | PcmAudio,
+    source_lang: str,
+    target_lang: str,
+    language_tracker: LanguageTracker | None = None,
+):
+    """
+    Transcribe and translate a partial segment for an interim hypothesis. Interim results
+    are best-effort: nothing is saved and errors are only logged.
+    """
+    try:
+        # Interims only reuse a confirmed language; they are too short to confirm one.
+        language_hint = language_tracker.confirmed if language_tracker else None
+        stt_data = await transcribe_audio(audio_data, language_hint)
+        original_text = stt_data.get("transcription", "")
+        if not original_text or not original_text.strip():
+            return
+
+        detected_language = stt_data.get("detected_language", source_lang)
+        language_probability = stt_data.get("language_probability", 0.0)
+        effective_source_lang = _effective_source_lang(
+            source_lang, detected_language, language_probability
+        )
+        translated_text = await translate_text(original_text, effective_source_lang, target_lang)
+
+        await websocket.send_json(
+            {
+                "original_text": original_text,
+                "translated_text": translated_text,
+                "detected_language": detected_language,
+                "language_probability": language_probability,
+            }
+        )
+    except Exception as e:
+        logger.warning("Error processing interim segment: %s", e, exc_info=True)
+
+
+async def process_stream_segment(
+    websocket: WebSocket,
+    audio_data: bytes | PcmAudio,
+    is_final: bool,
+    source_lang: str,
+    target_lang: str,
+    user_id: str,
+    conversation_id: str,
+    language_tracker: LanguageTracker | None = None,
+):
+    """
+    Process one streaming segment. Final segments go through the full chunk path (and are
+    saved); interim ones only produce a hypothesis for the client.
+    """
+    if is_final:
+        await process_audio_chunk(
+            websocket,
+            audio_data,
+            source_lang,
+            target_lang,
+            user_id,
+            conversation_id,
+            language_tracker=language_tracker,
+        )
+    else:
+        await process_interim_chunk(
+            websocket, audio_data, source_lang, target_lang, language_tracker
+        )
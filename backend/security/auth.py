@@ -1,5 +1,7 @@
+import hashlib
 import logging
 import os
+import time
 from datetime import UTC, datetime, timedelta
 from typing import Optional
 
@@ -8,6 +10,8 @@ from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 
+from services.ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 # --- Configuration ---
@@ -15,6 +19,16 @@ JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 USERS_COLLECTION = os.getenv("USERS_COLLECTION", "users")
+AUTH_USER_CACHE_TTL_SECONDS = float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+# --- Caches ---
+# User documents by user id, so authenticated requests don't each cost a database lookup.
+# Anything that changes a user document must call `invalidate_cached_user`.
+_user_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_USER_CACHE_TTL_SECONDS)
+# Token subjects by token hash, kept until the token expires, to skip verifying the
+# signature of a token already seen. Failed verifications are not cached.
+_token_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, ACCESS_TOKEN_EXPIRE_MINUTES * 60)
 
 # --- FastAPI Dependency ---
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/google/login")
@@ -37,6 +51,39 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 
+def invalidate_cached_user(user_id: str) -> None:
+    """Drops a user's cached document; call after creating or updating the user."""
+    _user_cache.invalidate(str(user_id))
+
+
+def _decode_token_subject(token: str) -> str | None:
+    """Returns the token's 'sub' claim. Raises JWTError if the token isn't valid."""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    cached = _token_cache.get(key)
+    if cached is not None:
+        return cached
+
+    payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
+    user_id: str | None = payload.get("sub")
+    if user_id is not None:
+        expires_in = payload["exp"] - time.time() if "exp" in payload else None
+        _token_cache.set(key, user_id, expires_in)
+    return user_id
+
+
+async def _load_user(request: Request, user_id: str) -> dict | None:
+    user = _user_cache.get(user_id)
+    if user is None:
+        db = request.app.state.db
+        logger.info("Fetching user from database with user_id: %s", user_id)
+        user = await db[USERS_COLLECTION].find_one({"_id": ObjectId(user_id)})
+        if user is None:
+            return None
+        _user_cache.set(user_id, user)
+    # Callers get their own copy, so a route changing it can't affect the cached document.
+    return dict(user)
+
+
 # --- The Main Dependency for Protecting Routes ---
 async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)) -> dict:
     credentials_exception = HTTPException(
@@ -50,8 +97,7 @@ async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)
 
     try:
         logger.info("Attempting to decode access token.")
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str | None = payload.get("sub")
+        user_id = _decode_token_subject(token)
         if user_id is None:
             logger.warning("Token decoding failed: 'sub' claim missing from payload.")
             raise credentials_exception
@@ -61,9 +107,7 @@ async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)
         logger.warning("JWT Error during token decoding: %s", e)
         raise credentials_exception from e
 
-    db = request.app.state.db
-    logger.info("Fetching user from database with user_id: %s", user_id)
-    user = await db[USERS_COLLECTION].find_one({"_id": ObjectId(user_id)})
+    user = await _load_user(request, user_id)
 
     if user is None:
         # A valid token for a non-existent user could be a security concern or a data issue.
@@ -88,9 +132,7 @@ async def verify_jwt_token(token: str) -> Optional[str]:
         return None
     
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str | None = payload.get("sub")
-        return user_id
+        return _decode_token_subject(token)
     except JWTError:
         return None
     except Exception:
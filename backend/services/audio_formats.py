@@ -0,0 +1,51 @@
+import io
+import wave
+
+PCM_SAMPLE_WIDTHS = {"pcm_s16le": 2, "pcm_f32le": 4}
+
+
+class PcmAudio:
+    """
+    Raw mono little-endian PCM plus the metadata the STT service needs to interpret it.
+    Sent to STT's `/transcribe/pcm` endpoint as-is, without wrapping it in a WAV container.
+    """
+
+    def __init__(self, data: bytes, encoding: str, sample_rate: int):
+        if encoding not in PCM_SAMPLE_WIDTHS:
+            raise ValueError(f"Unsupported PCM encoding: {encoding}")
+        self.data = data
+        self.encoding = encoding
+        self.sample_rate = sample_rate
+
+    @property
+    def sample_width(self) -> int:
+        return PCM_SAMPLE_WIDTHS[self.encoding]
+
+    @property
+    def duration_seconds(self) -> float:
+        return len(self.data) / (self.sample_width * self.sample_rate)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+def audio_from_frame(metadata: dict, audio_data: bytes) -> bytes | PcmAudio:
+    """
+    Interprets a WebSocket frame's payload. Frames whose metadata names an `encoding` carry
+    raw PCM at `sample_rate`; anything else is a WAV file, as sent by existing clients.
+    """
+    encoding = metadata.get("encoding")
+    if not encoding:
+        return audio_data
+    return PcmAudio(audio_data, encoding, int(metadata.get("sample_rate", 16000)))
+
+
+def audio_duration_seconds(audio: bytes | PcmAudio) -> float | None:
+    """Length of a chunk in seconds, or None if it is not a WAV file we can read."""
+    if isinstance(audio, PcmAudio):
+        return audio.duration_seconds
+    try:
+        with wave.open(io.BytesIO(audio)) as wav_file:
+            return wav_file.getnframes() / wav_file.getframerate()
+    except (wave.Error, EOFError):
+        return None
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+PIPELINE_WORKERS = int(os.getenv("WS_PIPELINE_WORKERS", "2"))
+PIPELINE_MAX_QUEUED = int(os.getenv("WS_PIPELINE_MAX_QUEUED", "4"))
+
+
+class _ChunkSlot:
+    """Holds the messages produced for one chunk until the sequencer sends them."""
+
+    def __init__(self, sequence: int, args: tuple):
+        self.sequence = sequence
+        self.args = args
+        self.messages: list[dict] = []
+        self.after_send: list[Callable[[int], Awaitable[Any]]] = []
+        self.dropped = False
+        self.done = asyncio.Event()
+
+
+class _ChunkSink:
+    """
+    Stands in for the WebSocket while one chunk is processed. Messages are buffered on the
+    chunk's slot instead of being sent straight away, so they can be emitted in order.
+    """
+
+    def __init__(self, websocket, slot: _ChunkSlot):
+        self.app = websocket.app
+        self._slot = slot
+
+    async def send_json(self, data: dict) -> None:
+        if self._slot.done.is_set():
+            logger.warning(
+                "Dropped a result sent after chunk %d was released.", self._slot.sequence
+            )
+            return
+        self._slot.messages.append(data)
+
+    def release(self) -> None:
+        """
+        Marks the chunk's results as complete so the sequencer can send them while the
+        worker carries on with follow-up work (e.g. logging). Anything sent after this is
+        dropped.
+        """
+        self._slot.done.set()
+
+    def after_send(self, callback: Callable[[int], Awaitable[Any]]) -> None:
+        """
+        Has the sequencer await `callback(sequence)` right after this chunk's messages are
+        sent, so follow-up deliveries (e.g. to conversation listeners) keep chunk order too.
+        """
+        self._slot.after_send.append(callback)
+
+
+class ChunkPipeline:
+    """
+    Bounded per-connection pipeline for audio chunks.
+
+    The receive loop submits chunks and immediately goes back to reading frames. A small
+    pool of workers runs `process_chunk` concurrently, and a sequencer sends each chunk's
+    results in arrival order, tagged with a `sequence` number. When the queue of chunks
+    waiting for a worker is full, the oldest waiting chunk is dropped so subtitle latency
+    stays bounded when STT falls behind; `on_drop` is then called with the chunk's
+    arguments so callers can release anything reserved for it.
+    """
+
+    def __init__(
+        self,
+        websocket,
+        process_chunk: Callable[..., Awaitable[Any]],
+        workers: int = PIPELINE_WORKERS,
+        max_queued: int = PIPELINE_MAX_QUEUED,
+        on_drop: Callable[..., Any] | None = None,
+    ):
+        self._websocket = websocket
+        self._process_chunk = process_chunk
+        self._on_drop = on_drop
+        self._worker_count = max(1, workers)
+        self._pending: asyncio.Queue[_ChunkSlot | None] = asyncio.Queue(maxsize=max(1, max_queued))
+        self._ordered: asyncio.Queue[_ChunkSlot | None] = asyncio.Queue()
+        self._next_sequence = 0
+        self._workers: list[asyncio.Task] = []
+        self._sequencer: asyncio.Task | None = None
+        self.dropped_chunks = 0
+
+    def start(self) -> None:
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self._worker_count)]
+        self._sequencer = asyncio.create_task(self._sequence())
+
+    async def submit(self, *args) -> int:
+        """Queues a chunk for processing and returns its sequence number."""
+        slot = _ChunkSlot(self._next_sequence, args)
+        self._next_sequence += 1
+
+        if self._pending.full():
+            oldest = self._pending.get_nowait()
+            if oldest is not None:
+                oldest.dropped = True
+                oldest.done.set()
+                self.dropped_chunks += 1
+                logger.warning(
+                    "Pipeline backlog full; dropped chunk %d waiting for a worker.",
+                    oldest.sequence,
+                )
+                if self._on_drop is not None:
+                    self._on_drop(*oldest.args)
+
+        await self._ordered.put(slot)
+        self._pending.put_nowait(slot)
+        return slot.sequence
+
+    async def submit_result(self, message: dict) -> int:
+        """
+        Queues a chunk that needs no processing (e.g. silence) so its result is still sent in
+        order with the others. Returns its sequence number.
+        """
+        slot = _ChunkSlot(self._next_sequence, ())
+        self._next_sequence += 1
+        slot.messages.append(message)
+        slot.done.set()
+        await self._ordered.put(slot)
+        return slot.sequence
+
+    async def _work(self) -> None:
+        while True:
+            slot = await self._pending.get()
+            if slot is None:
+                return
+            try:
+                await self._process_chunk(_ChunkSink(self._websocket, slot), *slot.args)
+            except Exception as e:
+                logger.error("Error processing chunk %d: %s", slot.sequence, e, exc_info=True)
+            finally:
+                slot.done.set()
+
+    async def _sequence(self) -> None:
+        while True:
+            slot = await self._ordered.get()
+            if slot is None:
+                return
+            await slot.done.wait()
+            messages = slot.messages
+            if slot.dropped:
+                messages = [{"original_text": "", "translated_text": "", "dropped": True}]
+            for message in messages:
+                try:
+                    await self._websocket.send_json({**message, "sequence": slot.sequence})
+                except Exception as e:
+                    logger.info("Could not send result for chunk %d: %s", slot.sequence, e)
+            for callback in slot.after_send:
+                try:
+                    await callback(slot.sequence)
+                except Exception as e:
+                    logger.warning("Follow-up for chunk %d failed: %s", slot.sequence, e)
+
+    async def close(self) -> None:
+        """
+        Stops the pipeline. Chunks already queued still finish (so they are saved to the
+        database); results that can no longer be delivered are discarded.
+        """
+        for _ in self._workers:
+            await self._pending.put(None)
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        if self._sequencer is not None:
+            await self._ordered.put(None)
+            await self._sequencer
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationHub:
+    """
+    Tracks which WebSocket connections listen to which conversation, and in which language.
+
+    A speaker's chunk is transcribed once; the result is then translated to every
+    subscribed target language and pushed to all listeners of the conversation, so STT cost
+    grows with speakers rather than with listeners. Subscriptions live in this process
+    only, so speakers and their listeners must be connected to the same backend instance.
+
+    The hub also knows which users are speaking in each conversation, so listen mode can
+    check that a listener belongs to the conversation.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, dict[object, str]] = {}
+        self._speakers: dict[str, dict[object, str]] = {}
+
+    def add_speaker(self, conversation_id: str, websocket, user_id: str) -> None:
+        self._speakers.setdefault(conversation_id, {})[websocket] = user_id
+
+    def remove_speaker(self, conversation_id: str, websocket) -> None:
+        speakers = self._speakers.get(conversation_id)
+        if speakers is None:
+            return
+        speakers.pop(websocket, None)
+        if not speakers:
+            del self._speakers[conversation_id]
+
+    def is_speaker(self, conversation_id: str, user_id: str) -> bool:
+        return user_id in self._speakers.get(conversation_id, {}).values()
+
+    def subscribe(self, conversation_id: str, websocket, target_lang: str) -> None:
+        """Adds (or moves to a new language) a listener of `conversation_id`."""
+        self._subscribers.setdefault(conversation_id, {})[websocket] = target_lang
+        logger.info(
+            "Listener subscribed to conversation %s in '%s' (%d listener(s)).",
+            conversation_id,
+            target_lang,
+            len(self._subscribers[conversation_id]),
+        )
+
+    def unsubscribe(self, conversation_id: str, websocket) -> None:
+        listeners = self._subscribers.get(conversation_id)
+        if listeners is None:
+            return
+        listeners.pop(websocket, None)
+        if not listeners:
+            del self._subscribers[conversation_id]
+
+    def listener_count(self, conversation_id: str | None) -> int:
+        return len(self._subscribers.get(conversation_id, {})) if conversation_id else 0
+
+    def target_languages(self, conversation_id: str | None) -> set[str]:
+        """The languages the listeners of a conversation want subtitles in."""
+        if not conversation_id:
+            return set()
+        return set(self._subscribers.get(conversation_id, {}).values())
+
+    async def broadcast(self, conversation_id: str, messages: dict[str, dict]) -> int:
+        """
+        Sends each listener the message for its language (`messages` maps target language
+        to message). Listeners that can no longer be reached are unsubscribed. Returns the
+        number of listeners the message was delivered to.
+        """
+        listeners = [
+            (websocket, messages[target_lang])
+            for websocket, target_lang in self._subscribers.get(conversation_id, {}).items()
+            if target_lang in messages
+        ]
+        if not listeners:
+            return 0
+
+        results = await asyncio.gather(
+            *(websocket.send_json(message) for websocket, message in listeners),
+            return_exceptions=True,
+        )
+        delivered = 0
+        for (websocket, _), result in zip(listeners, results, strict=True):
+            if isinstance(result, Exception):
+                logger.info("Dropping unreachable listener of %s: %s", conversation_id, result)
+                self.unsubscribe(conversation_id, websocket)
+            else:
+                delivered += 1
+        return delivered
+
+
+conversation_hub = ConversationHub()
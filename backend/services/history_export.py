@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+# Columns of an export, in CSV order.
+EXPORT_FIELDS = [
+    "_id",
+    "timestamp",
+    "conversationId",
+    "source_lang",
+    "target_lang",
+    "detected_language",
+    "language_probability",
+    "original_text",
+    "translated_text",
+]
+# Spreadsheets treat cells starting with these as formulas.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _export_value(value: Any, for_csv: bool = False) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str) and for_csv and value.startswith(_FORMULA_PREFIXES):
+        # Transcribed speech is user content; make sure it opens as text.
+        return "'" + value
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+    return str(value)  # e.g. ObjectId
+
+
+def _export_row(doc: dict, for_csv: bool = False) -> dict:
+    return {field: _export_value(doc.get(field), for_csv) for field in EXPORT_FIELDS}
+
+
+async def iter_ndjson(documents: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """Yields one JSON line per document as the cursor produces them."""
+    async for doc in documents:
+        yield json.dumps(_export_row(doc), ensure_ascii=False) + "\n"
+
+
+async def iter_csv(documents: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """Yields a header line, then one CSV line per document as the cursor produces them."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+
+    def take() -> str:
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writeheader()
+    yield take()
+    async for doc in documents:
+        writer.writerow(_export_row(doc, for_csv=True))
+        yield take()
@@ -0,0 +1,78 @@
+import logging
+import os
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+LANGUAGE_CONFIRM_CHUNKS = int(os.getenv("LANGUAGE_CONFIRM_CHUNKS", "3"))
+LANGUAGE_CONFIRM_PROBABILITY = float(os.getenv("LANGUAGE_CONFIRM_PROBABILITY", "0.7"))
+# Every this many chunks, a confirmed language is detected again to notice a switch.
+LANGUAGE_RECHECK_CHUNKS = int(os.getenv("LANGUAGE_RECHECK_CHUNKS", "10"))
+
+
+class LanguageTracker:
+    """
+    Per-connection record of the language being spoken.
+
+    Once the STT service has detected the same language with high confidence for
+    `confirm_chunks` chunks in a row, the language counts as confirmed and is passed to
+    Whisper, which then skips its language detection pass. Every `recheck_chunks` chunks
+    detection runs again, and a confident different result clears the confirmation.
+
+    `session_id` names the connection's session in the STT service, which keeps the
+    previous chunk's text as decoding context (and its own sticky language for clients
+    that don't track one). Chunks sent without a hint ask STT to detect the language, so
+    the session's language never stands in for a detection this tracker is waiting on.
+    """
+
+    def __init__(
+        self,
+        confirm_chunks: int = LANGUAGE_CONFIRM_CHUNKS,
+        min_probability: float = LANGUAGE_CONFIRM_PROBABILITY,
+        recheck_chunks: int = LANGUAGE_RECHECK_CHUNKS,
+    ):
+        self._confirm_chunks = max(1, confirm_chunks)
+        self._min_probability = min_probability
+        self._recheck_chunks = max(1, recheck_chunks)
+        self.confirmed: str | None = None
+        self._candidate: str | None = None
+        self._streak = 0
+        self._hints_since_check = 0
+        self.detections_skipped = 0
+        self.session_id = uuid4().hex
+
+    def language_hint(self) -> str | None:
+        """The language to send with the next chunk, or None to let Whisper detect it."""
+        if self.confirmed is None:
+            return None
+        self._hints_since_check += 1
+        if self._hints_since_check >= self._recheck_chunks:
+            self._hints_since_check = 0
+            return None
+        self.detections_skipped += 1
+        return self.confirmed
+
+    def observe(self, detected_language: str | None, language_probability: float) -> None:
+        """Records the language the STT service detected for a chunk (not a forced one)."""
+        if not detected_language or language_probability < self._min_probability:
+            return
+
+        if self.confirmed is not None and detected_language != self.confirmed:
+            logger.info(
+                "Speaker switched from '%s' to '%s'; detecting language again.",
+                self.confirmed,
+                detected_language,
+            )
+            self.confirmed = None
+
+        if detected_language == self._candidate:
+            self._streak += 1
+        else:
+            self._candidate = detected_language
+            self._streak = 1
+
+        if self.confirmed is None and self._streak >= self._confirm_chunks:
+            self.confirmed = detected_language
+            self._hints_since_check = 0
+            logger.info("Confirmed spoken language '%s'.", detected_language)
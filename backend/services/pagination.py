@@ -0,0 +1,72 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor can't be decoded."""
+
+
+def encode_cursor(sort_value: datetime, doc_id: Any) -> str:
+    """Builds the opaque cursor pointing just past the document with these keys."""
+    payload = {"v": sort_value.isoformat(), "id": str(doc_id)}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, Any]:
+    """Returns the (sort value, _id) a cursor points past."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_value = datetime.fromisoformat(payload["v"])
+        doc_id = payload["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Invalid pagination cursor.") from e
+    try:
+        return sort_value, ObjectId(doc_id)
+    except (InvalidId, TypeError):
+        return sort_value, doc_id
+
+
+async def fetch_page(
+    collection,
+    query: dict,
+    sort_field: str,
+    limit: int,
+    cursor: str | None = None,
+    projection: dict | None = None,
+) -> tuple[list[dict], str | None]:
+    """
+    Returns one page of documents, newest first, and the cursor for the next page (None on
+    the last page).
+
+    Pages are keyed on (`sort_field`, `_id`) rather than skipped over, so fetching page
+    N costs the same as fetching the first one and documents inserted meanwhile don't
+    shift later pages. `_id` breaks ties between documents with the same sort value.
+    """
+    if cursor:
+        sort_value, doc_id = decode_cursor(cursor)
+        query = {
+            **query,
+            "$or": [
+                {sort_field: {"$lt": sort_value}},
+                {sort_field: sort_value, "_id": {"$lt": doc_id}},
+            ],
+        }
+
+    # One extra document tells whether there is a next page.
+    documents = (
+        collection.find(query, projection).sort([(sort_field, -1), ("_id", -1)]).limit(limit + 1)
+    )
+    page = []
+    async for doc in documents:
+        if len(page) == limit:
+            last = page[-1]
+            return page, encode_cursor(last[sort_field], last["_id"])
+        page.append(doc)
+    return page, None
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import os
+import weakref
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+from services.translation_log_writer import LOG_WRITER_FLUSH_INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+# New transcript segments folded into a running summary per call to the summarizer.
+ROLLING_SUMMARY_BATCH_SEGMENTS = int(os.getenv("ROLLING_SUMMARY_BATCH_SEGMENTS", "200"))
+# Only segments logged at least this long ago are folded in. Logs are written in batches
+# that the server may apply out of order, so a newer segment can become visible before an
+# older one; once the high-water mark has passed a segment it is never read again.
+ROLLING_SUMMARY_SETTLE_SECONDS = float(
+    os.getenv("ROLLING_SUMMARY_SETTLE_SECONDS", str(LOG_WRITER_FLUSH_INTERVAL_SECONDS + 5))
+)
+ROLLING_SUMMARIES_COLLECTION = "rolling_summaries"
+
+
+class RollingSummarizer:
+    """
+    Keeps a running summary per user and conversation.
+
+    The stored state remembers the last transcript segment (by timestamp and `_id`) that
+    went into the summary. A refresh reads only the segments logged since then and asks the
+    summarizer to fold them into the existing summary, so keeping a live "so far" summary
+    costs as much as the new speech rather than the whole transcript. Refreshes of the same
+    conversation are serialized in this process so segments are never folded in twice.
+    Segments younger than `settle_seconds` wait for a later refresh, so ones whose write
+    lands late are not skipped.
+    """
+
+    def __init__(
+        self,
+        batch_segments: int = ROLLING_SUMMARY_BATCH_SEGMENTS,
+        settle_seconds: float = ROLLING_SUMMARY_SETTLE_SECONDS,
+    ):
+        self._batch_segments = max(1, batch_segments)
+        self._settle = timedelta(seconds=max(0.0, settle_seconds))
+        self._locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
+
+    async def refresh(
+        self,
+        db,
+        user_id: str,
+        conversation_id: str,
+        fold: Callable[[str, str], Awaitable[str]],
+    ) -> dict:
+        """
+        Brings the conversation's summary up to date and returns its state. `fold(summary,
+        new_text)` returns the summary with `new_text` folded in.
+        """
+        key = f"{user_id}:{conversation_id}"
+        async with self._lock(key):
+            states = db.get_collection(ROLLING_SUMMARIES_COLLECTION)
+            state = await states.find_one({"_id": key}) or {
+                "_id": key,
+                "userId": user_id,
+                "conversationId": conversation_id,
+                "summary": "",
+                "segments": 0,
+                "last_timestamp": None,
+                "last_id": None,
+                "updated_at": None,
+            }
+
+            while True:
+                segments = await self._new_segments(db, user_id, conversation_id, state)
+                if not segments:
+                    return state
+
+                new_text = "\n".join(
+                    doc["original_text"] for doc in segments if doc.get("original_text")
+                )
+                summary = state["summary"]
+                if new_text.strip():
+                    summary = await fold(summary, new_text)
+                logger.info(
+                    "Folded %d new segment(s) into the summary of conversation %s.",
+                    len(segments),
+                    conversation_id,
+                )
+                state = {
+                    **state,
+                    "summary": summary,
+                    "segments": state["segments"] + len(segments),
+                    "last_timestamp": segments[-1]["timestamp"],
+                    "last_id": segments[-1]["_id"],
+                    "updated_at": datetime.now(UTC),
+                }
+                await states.replace_one({"_id": key}, state, upsert=True)
+                if len(segments) < self._batch_segments:
+                    return state
+
+    async def _new_segments(self, db, user_id: str, conversation_id: str, state: dict) -> list:
+        query: dict = {
+            "userId": user_id,
+            "conversationId": conversation_id,
+            "timestamp": {"$lte": datetime.now(UTC) - self._settle},
+        }
+        if state["last_timestamp"] is not None:
+            query["$or"] = [
+                {"timestamp": {"$gt": state["last_timestamp"]}},
+                {"timestamp": state["last_timestamp"], "_id": {"$gt": state["last_id"]}},
+            ]
+        cursor = (
+            db.get_collection("translations")
+            .find(query, {"original_text": 1, "timestamp": 1})
+            .sort([("timestamp", 1), ("_id", 1)])
+            .limit(self._batch_segments)
+        )
+        return [doc async for doc in cursor]
+
+
+rolling_summarizer = RollingSummarizer()
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from services.audio_formats import PCM_SAMPLE_WIDTHS, PcmAudio
+from services.voice_activity import VoiceActivityGate
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+STREAM_INTERIM_INTERVAL_SECONDS = float(os.getenv("STREAM_INTERIM_INTERVAL_SECONDS", "1.0"))
+STREAM_MAX_SEGMENT_SECONDS = float(os.getenv("STREAM_MAX_SEGMENT_SECONDS", "8.0"))
+STREAM_MIN_FINAL_SECONDS = float(os.getenv("STREAM_MIN_FINAL_SECONDS", "0.3"))
+STREAM_ENDPOINT_SILENCE_SECONDS = float(os.getenv("STREAM_ENDPOINT_SILENCE_SECONDS", "0.6"))
+
+
+class _SegmentSink:
+    """Forwards one segment's results to the WebSocket, tagged with the segment and its type."""
+
+    def __init__(self, websocket, segment_id: int, is_final: bool):
+        self.app = websocket.app
+        self._websocket = websocket
+        self._tags = {"type": "final" if is_final else "interim", "segment_id": segment_id}
+
+    async def send_json(self, data: dict) -> None:
+        await self._websocket.send_json({**data, **self._tags})
+
+
+class StreamingSession:
+    """
+    Rolling PCM buffer for one streaming connection.
+
+    The client sends small raw PCM frames (16-bit int or 32-bit float, see `PcmAudio`).
+    Once enough new audio has arrived, the whole segment buffered so far is transcribed
+    again and pushed as an `interim` hypothesis.
+    When the segment reaches `max_segment_seconds` (or the client marks the end of an
+    utterance), it is transcribed one last time as a `final` result and the buffer starts
+    over. All STT work for a connection runs on a single worker, so results arrive in order
+    and at most one interim hypothesis is ever waiting behind the one being transcribed.
+
+    With a `gate`, silence never reaches STT: interims are skipped until the segment contains
+    speech, a segment ends early after `STREAM_ENDPOINT_SILENCE_SECONDS` of silence following
+    speech, and silent segments are dropped instead of being finalized.
+    """
+
+    def __init__(
+        self,
+        websocket,
+        process_segment: Callable[[Any, PcmAudio, bool], Awaitable[Any]],
+        sample_rate: int,
+        encoding: str = "pcm_s16le",
+        interim_interval_seconds: float = STREAM_INTERIM_INTERVAL_SECONDS,
+        max_segment_seconds: float = STREAM_MAX_SEGMENT_SECONDS,
+        gate: VoiceActivityGate | None = None,
+    ):
+        self._websocket = websocket
+        self._process_segment = process_segment
+        if encoding not in PCM_SAMPLE_WIDTHS:
+            raise ValueError(f"Unsupported PCM encoding: {encoding}")
+        self.sample_rate = sample_rate
+        self.encoding = encoding
+        self._sample_width = PCM_SAMPLE_WIDTHS[encoding]
+        self._bytes_per_second = sample_rate * self._sample_width
+        self._interim_interval_bytes = int(interim_interval_seconds * self._bytes_per_second)
+        self._max_segment_bytes = int(max_segment_seconds * self._bytes_per_second)
+        self._min_final_bytes = int(STREAM_MIN_FINAL_SECONDS * self._bytes_per_second)
+        self._endpoint_silence_bytes = int(STREAM_ENDPOINT_SILENCE_SECONDS * self._bytes_per_second)
+        self._gate = gate
+
+        self._buffer = bytearray()
+        self._bytes_at_last_interim = 0
+        self._segment_id = 0
+        self._silent_bytes = 0
+        self._segment_has_speech = False
+        self._interim_queued = False
+        self._jobs: asyncio.Queue[tuple[int, PcmAudio, bool] | None] = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def buffered_seconds(self) -> float:
+        return len(self._buffer) / self._bytes_per_second
+
+    def start(self) -> None:
+        self._worker = asyncio.create_task(self._work())
+
+    def feed(self, pcm: bytes, end_of_segment: bool = False) -> None:
+        """Appends a PCM frame and schedules interim or final transcription as needed."""
+        self._buffer.extend(pcm)
+        if self._gate is not None:
+            if self._gate.has_speech(PcmAudio(pcm, self.encoding, self.sample_rate)):
+                self._segment_has_speech = True
+                self._silent_bytes = 0
+            else:
+                self._silent_bytes += len(pcm)
+
+        if (
+            end_of_segment
+            or len(self._buffer) >= self._max_segment_bytes
+            or (self._segment_has_speech and self._silent_bytes >= self._endpoint_silence_bytes)
+        ):
+            self._finalize_segment()
+        elif (self._gate is None or self._segment_has_speech) and (
+            not self._interim_queued
+            and len(self._buffer) - self._bytes_at_last_interim >= self._interim_interval_bytes
+        ):
+            self._interim_queued = True
+            self._bytes_at_last_interim = len(self._buffer)
+            self._jobs.put_nowait((self._segment_id, self._snapshot(), False))
+
+    def _snapshot(self) -> PcmAudio:
+        usable = len(self._buffer) - len(self._buffer) % self._sample_width
+        return PcmAudio(bytes(self._buffer[:usable]), self.encoding, self.sample_rate)
+
+    def _finalize_segment(self) -> None:
+        if len(self._buffer) >= self._min_final_bytes:
+            audio = self._snapshot()
+            if self._gate is not None:
+                audio, _ = self._gate.apply(audio)
+            if audio is not None:
+                self._jobs.put_nowait((self._segment_id, audio, True))
+            # Bump the id even for dropped segments so interims queued for them go stale.
+            self._segment_id += 1
+        self._buffer.clear()
+        self._bytes_at_last_interim = 0
+        self._silent_bytes = 0
+        self._segment_has_speech = False
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._jobs.get()
+            if job is None:
+                return
+            segment_id, audio, is_final = job
+            if not is_final:
+                self._interim_queued = False
+                if segment_id != self._segment_id:
+                    # The segment was finalized while this hypothesis waited; skip it.
+                    continue
+            try:
+                sink = _SegmentSink(self._websocket, segment_id, is_final)
+                await self._process_segment(sink, audio, is_final)
+            except Exception as e:
+                logger.error(
+                    "Error processing streaming segment %d: %s", segment_id, e, exc_info=True
+                )
+
+    async def close(self) -> None:
+        """Finalizes whatever audio is still buffered and waits for pending work."""
+        self._finalize_segment()
+        if self._worker is not None:
+            await self._jobs.put(None)
+            await self._worker
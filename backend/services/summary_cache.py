@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import UTC, datetime
+
+from services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+# Must name the model the summarization service runs (its OLLAMA_MODEL), so that
+# switching models doesn't serve summaries written by the old one.
+SUMMARIZATION_MODEL = os.getenv("SUMMARIZATION_MODEL", "phi3:mini")
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "1000"))
+SUMMARY_CACHE_TTL_SECONDS = float(os.getenv("SUMMARY_CACHE_TTL_SECONDS", "3600"))
+# Entries in the shared MongoDB tier expire through a TTL index (see config/indexes.py).
+SUMMARY_CACHE_COLLECTION = "summary_cache"
+
+
+def summary_cache_key(text: str, length: str, model: str = SUMMARIZATION_MODEL) -> str:
+    """Content address of a summary: a hash of the normalized text, length and model."""
+    normalized = " ".join(text.split())
+    material = json.dumps([normalized, length, model], ensure_ascii=False)
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class SummaryCache:
+    """
+    Two-tier cache of generated summaries keyed by `summary_cache_key`.
+
+    The in-memory tier answers repeated requests in this process; the MongoDB tier (once
+    `start` has attached a collection) is shared by all backend instances and outlives
+    restarts. Cache failures are logged and treated as misses, never as request errors.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = SUMMARY_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = SUMMARY_CACHE_TTL_SECONDS,
+    ):
+        self._memory = TTLCache(max_entries, ttl_seconds)
+        self._collection = None
+        self.shared_hits = 0
+
+    def start(self, collection) -> None:
+        self._collection = collection
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+    async def get(self, key: str) -> str | None:
+        summary = self._memory.get(key)
+        if summary is not None or self._collection is None:
+            return summary
+        try:
+            doc = await self._collection.find_one({"_id": key}, {"summary": 1})
+        except Exception as e:
+            logger.warning("Summary cache lookup failed: %s", e)
+            return None
+        if doc is None:
+            return None
+        self.shared_hits += 1
+        self._memory.set(key, doc["summary"])
+        return doc["summary"]
+
+    async def put(self, key: str, summary: str, length: str) -> None:
+        self._memory.set(key, summary)
+        if self._collection is None:
+            return
+        try:
+            await self._collection.update_one(
+                {"_id": key},
+                {
+                    "$set": {
+                        "summary": summary,
+                        "length": length,
+                        "model": SUMMARIZATION_MODEL,
+                        "created_at": datetime.now(UTC),
+                    }
+                },
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning("Could not store summary in the shared cache: %s", e)
+
+    def stats(self) -> dict:
+        return {**self._memory.stats(), "shared_hits": self.shared_hits}
+
+
+summary_cache = SummaryCache()
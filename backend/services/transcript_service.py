@@ -28,4 +28,42 @@ async def fetch_transcripts(
     async for doc in cursor:
         doc["_id"] = str(doc["_id"])
         results.append(doc)
-    return results
\ No newline at end of file
+    return results
+
+
+async def fetch_conversation_text(
+    db: AsyncIOMotorDatabase,
+    *,
+    user_id: str,
+    conversation_id: str,
+    max_chars: int,
+) -> tuple[str, int]:
+    """
+    Joins the original text of a conversation's segments in spoken order, keeping only the
+    most recent ones that fit in `max_chars`. Reads newest first and fetches nothing but the
+    text, so long conversations cost no more than the budget. Returns the text and the number
+    of segments it covers.
+    """
+    cursor = (
+        db.get_collection("translations")
+        .find(
+            {"userId": user_id, "conversationId": conversation_id},
+            {"original_text": 1, "_id": 0},
+        )
+        .sort("timestamp", -1)
+    )
+
+    segments: list[str] = []
+    used = 0
+    async for doc in cursor:
+        text = (doc.get("original_text") or "").strip()
+        if not text:
+            continue
+        if used + len(text) + 1 > max_chars:
+            if not segments:
+                # Even the latest segment is over budget; keep its end.
+                segments.append(text[-max_chars:])
+            break
+        segments.append(text)
+        used += len(text) + 1
+    return "\n".join(reversed(segments)), len(segments)
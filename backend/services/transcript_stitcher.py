@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+# Clients repeat the end of each chunk at the start of the next (`chunk_overlap_seconds` in
+# user settings). Frames may override this per chunk with the same metadata key.
+WS_CHUNK_OVERLAP_SECONDS = float(os.getenv("WS_CHUNK_OVERLAP_SECONDS", "0.5"))
+STITCH_TOLERANCE_SECONDS = float(os.getenv("STITCH_TOLERANCE_SECONDS", "0.3"))
+
+
+def _normalize(word: str) -> str:
+    return "".join(ch for ch in word.lower() if ch.isalnum())
+
+
+def _words_match(previous: str, new: str, index: int, length: int) -> bool:
+    """
+    Compares two normalized words. The first word of the overlap may have been cut at the
+    start of the new chunk and the last one at the end of the previous chunk, so those
+    only need to match partially.
+    """
+    if previous == new:
+        return True
+    if not previous or not new:
+        return False
+    if index == 0 and previous.endswith(new):
+        return True
+    return index == length - 1 and new.startswith(previous)
+
+
+def overlap_length(previous_tail: list[str], head: list[str]) -> int:
+    """Longest k such that the last k words of `previous_tail` match the first k of `head`."""
+    for length in range(min(len(previous_tail), len(head)), 0, -1):
+        pairs = zip(previous_tail[-length:], head[:length], strict=True)
+        if all(
+            _words_match(previous, new, index, length)
+            for index, (previous, new) in enumerate(pairs)
+        ):
+            return length
+    return 0
+
+
+class StitchTicket:
+    """
+    One chunk's place in a connection's stitching order.
+
+    Chunks are transcribed concurrently, but each one can only be deduplicated once the
+    chunk before it is known, so `stitch` waits for the previous ticket to be resolved.
+    Every ticket must be resolved exactly once, also when its chunk is skipped, dropped or
+    fails; `resolve` is a no-op after the first call.
+    """
+
+    def __init__(
+        self,
+        stitcher: "TranscriptStitcher",
+        previous: "StitchTicket | None",
+        duration: float | None,
+        leading_offset: float,
+        overlap_seconds: float,
+    ):
+        self._stitcher = stitcher
+        self._previous = previous
+        self._duration = duration
+        self._leading_offset = leading_offset
+        self._overlap_seconds = overlap_seconds
+        self._tail: list[str] = []
+        self._resolved = asyncio.Event()
+
+    def resolve(self, words: list[dict] | None) -> None:
+        """Records the chunk's words (None if unknown) for the next chunk to compare against."""
+        if self._resolved.is_set():
+            return
+        if words and self._duration is not None:
+            tail_start = self._duration - self._overlap_seconds - STITCH_TOLERANCE_SECONDS
+            self._tail = [
+                normalized
+                for word in words
+                if word["end"] + self._leading_offset > tail_start
+                and (normalized := _normalize(word["word"]))
+            ]
+        self._previous = None
+        self._resolved.set()
+
+    async def stitch(self, text: str, words: list[dict] | None) -> str:
+        """
+        Returns the part of this chunk's transcription not already covered by the previous
+        chunk. Only words that start inside the overlap window are candidates for removal.
+        """
+        try:
+            previous = self._previous
+            if previous is not None:
+                await previous._resolved.wait()
+            if not words or previous is None or not previous._tail:
+                return text
+
+            head_end = self._overlap_seconds + STITCH_TOLERANCE_SECONDS - self._leading_offset
+            head = [word for word in words if word["start"] < head_end]
+            normalized_head = [_normalize(word["word"]) for word in head]
+            duplicated = overlap_length(previous._tail, normalized_head)
+            if not duplicated:
+                return text
+
+            self._stitcher.words_deduplicated += duplicated
+            logger.debug("Dropped %d overlapping word(s) from chunk.", duplicated)
+            return "".join(word["word"] for word in words[duplicated:]).strip()
+        finally:
+            self.resolve(words)
+
+
+class TranscriptStitcher:
+    """
+    Removes text transcribed twice because of the audio overlap between consecutive chunks
+    of one connection, using the word timestamps returned by the STT service.
+    """
+
+    def __init__(self, overlap_seconds: float = WS_CHUNK_OVERLAP_SECONDS):
+        self.overlap_seconds = overlap_seconds
+        self._last_ticket: StitchTicket | None = None
+        self.words_deduplicated = 0
+
+    def ticket(
+        self,
+        duration: float | None,
+        leading_offset: float = 0.0,
+        overlap_seconds: float | None = None,
+    ) -> StitchTicket:
+        """
+        Reserves the next place in the stitching order. Call this in arrival order.
+        `duration` is the chunk's length and `leading_offset` how much silence the voice
+        activity gate trimmed from its start (word timestamps are relative to the trimmed
+        audio).
+        """
+        ticket = StitchTicket(
+            self,
+            self._last_ticket,
+            duration,
+            leading_offset,
+            self.overlap_seconds if overlap_seconds is None else overlap_seconds,
+        )
+        self._last_ticket = ticket
+        return ticket
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+LOG_WRITER_BATCH_SIZE = int(os.getenv("TRANSLATION_LOG_BATCH_SIZE", "100"))
+LOG_WRITER_FLUSH_INTERVAL_SECONDS = float(
+    os.getenv("TRANSLATION_LOG_FLUSH_INTERVAL_SECONDS", "0.5")
+)
+LOG_WRITER_MAX_BUFFERED = int(os.getenv("TRANSLATION_LOG_MAX_BUFFERED", "10000"))
+
+
+class TranslationLogWriter:
+    """
+    Write-behind buffer for translation log documents.
+
+    Callers `enqueue` a document and carry on; a background task writes the buffer with
+    unordered `insert_many` calls of up to `batch_size` documents, at least every
+    `flush_interval_seconds` while there is anything to write. The buffer is bounded: when
+    `max_buffered` documents are waiting, `enqueue` waits for room (backpressure) instead
+    of growing without limit. `close` writes whatever is still buffered.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = LOG_WRITER_BATCH_SIZE,
+        flush_interval_seconds: float = LOG_WRITER_FLUSH_INTERVAL_SECONDS,
+        max_buffered: int = LOG_WRITER_MAX_BUFFERED,
+    ):
+        self._batch_size = max(1, batch_size)
+        self._flush_interval_seconds = flush_interval_seconds
+        self._max_buffered = max(1, max_buffered)
+        self._queue: asyncio.Queue[dict | None] | None = None
+        self._collection = None
+        self._task: asyncio.Task | None = None
+        self.written = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def buffered(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self, collection) -> None:
+        # The queue is created here so it belongs to the event loop the writer runs in.
+        self._collection = collection
+        self._queue = asyncio.Queue(maxsize=self._max_buffered)
+        self._task = asyncio.create_task(self._run())
+
+    async def enqueue(self, document: dict) -> None:
+        """Buffers a document for writing; waits only if the buffer is full."""
+        await self._queue.put(document)
+
+    async def _collect_batch(self) -> tuple[list[dict], bool]:
+        """Waits for a document, then gathers more until the batch is full or time is up."""
+        first = await self._queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._flush_interval_seconds
+        while len(batch) < self._batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                document = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+            except TimeoutError:
+                break
+            if document is None:
+                return batch, True
+            batch.append(document)
+        return batch, False
+
+    async def _run(self) -> None:
+        while True:
+            batch, stopping = await self._collect_batch()
+            if batch:
+                await self._write(batch)
+            if stopping:
+                return
+
+    async def _write(self, batch: list[dict]) -> None:
+        try:
+            await self._collection.insert_many(batch, ordered=False)
+            self.written += len(batch)
+        except Exception as e:
+            # With ordered=False the rest of the batch is still inserted; a bulk write error
+            # lists just the documents that failed.
+            details = getattr(e, "details", None) or {}
+            failed = len(details.get("writeErrors", [])) or len(batch)
+            self.failed += failed
+            self.written += len(batch) - failed
+            logger.error("Failed to write %d translation log(s): %s", failed, e)
+
+    async def close(self) -> None:
+        """Writes everything still buffered and stops the background task."""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        logger.info(
+            "Translation log writer stopped (%d written, %d failed).", self.written, self.failed
+        )
+
+
+translation_log_writer = TranslationLogWriter()
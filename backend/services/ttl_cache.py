@@ -0,0 +1,56 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class TTLCache:
+    """
+    Small in-process LRU cache whose entries expire after `ttl_seconds`.
+
+    Used for data that is read on most requests but rarely changes; whoever changes the
+    data must call `invalidate`, and the TTL bounds how stale an entry can get otherwise
+    (e.g. when another backend instance made the change).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._max_entries = max(1, max_entries)
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Any, value: Any, ttl_seconds: float | None = None) -> None:
+        """Stores `value`; `ttl_seconds` overrides the default lifetime for this entry."""
+        ttl = self._ttl_seconds if ttl_seconds is None else min(ttl_seconds, self._ttl_seconds)
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Any) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
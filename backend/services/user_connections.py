@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+# A push waits at most this long for a connection, so one stalled headset can't hold up
+# the request that triggered it (e.g. saving settings).
+USER_PUSH_TIMEOUT_SECONDS = float(os.getenv("USER_PUSH_TIMEOUT_SECONDS", "2"))
+
+
+class UserConnections:
+    """
+    Tracks the open WebSocket connections of each authenticated user, so the backend can
+    push a user's headsets a message (e.g. changed settings) instead of having them poll.
+    Like the conversation hub, this only knows connections to this process.
+    """
+
+    def __init__(self, push_timeout_seconds: float = USER_PUSH_TIMEOUT_SECONDS):
+        self._connections: dict[str, set] = {}
+        self._push_timeout = push_timeout_seconds
+
+    def register(self, user_id: str, websocket) -> None:
+        self._connections.setdefault(user_id, set()).add(websocket)
+
+    def unregister(self, user_id: str, websocket) -> None:
+        connections = self._connections.get(user_id)
+        if connections is None:
+            return
+        connections.discard(websocket)
+        if not connections:
+            del self._connections[user_id]
+
+    def connection_count(self, user_id: str) -> int:
+        return len(self._connections.get(user_id, ()))
+
+    async def send_to_user(self, user_id: str, message: dict) -> int:
+        """
+        Sends `message` to every open connection of the user and returns how many it
+        reached. Connections that can no longer be reached, or don't take the message
+        within the push timeout, are unregistered.
+        """
+        connections = list(self._connections.get(user_id, ()))
+        if not connections:
+            return 0
+
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(websocket.send_json(message), self._push_timeout)
+                for websocket in connections
+            ),
+            return_exceptions=True,
+        )
+        delivered = 0
+        for websocket, result in zip(connections, results, strict=True):
+            if isinstance(result, Exception):
+                logger.info("Dropping unreachable connection of user %s: %s", user_id, result)
+                self.unregister(user_id, websocket)
+            else:
+                delivered += 1
+        return delivered
+
+
+user_connections = UserConnections()
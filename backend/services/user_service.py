@@ -2,6 +2,9 @@ import logging
 from datetime import UTC, datetime
 
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import DuplicateKeyError
+
+from security.auth import invalidate_cached_user
 
 logger = logging.getLogger(__name__)
 
@@ -10,7 +13,8 @@ async def get_or_create_user_by_google_id(
     users_collection: AsyncIOMotorCollection, google_id: str, email: str
 ) -> dict | None:
     """
-    Finds a user by their Google ID. If they don't exist, a new user is created.
+    Finds a user by their Google ID. If they don't exist, a new user is created. An
+    existing user's email is brought in line with the one Google now reports.
 
     Args:
         users_collection: The Motor collection for users.
@@ -24,6 +28,14 @@ async def get_or_create_user_by_google_id(
     user = await users_collection.find_one({"googleId": google_id})
     if user:
         logger.info("Found existing user for email: %s", email)
+        if user.get("email") != email:
+            now = datetime.now(UTC)
+            await users_collection.update_one(
+                {"_id": user["_id"]}, {"$set": {"email": email, "updatedAt": now}}
+            )
+            invalidate_cached_user(user["_id"])
+            logger.info("Updated the email of user %s.", user["_id"])
+            user = {**user, "email": email, "updatedAt": now}
         return user
 
     # If not, create a new user document
@@ -43,6 +55,11 @@ async def get_or_create_user_by_google_id(
         # Retrieve the newly created user to get the _id and confirm creation
         created_user = await users_collection.find_one({"googleId": google_id})
         return created_user
+    except DuplicateKeyError:
+        # A concurrent first sign-in created the user between our lookup and insert
+        # (the unique googleId index rejects the second document).
+        logger.info("User for email %s was created concurrently; using it.", email)
+        return await users_collection.find_one({"googleId": google_id})
     except Exception as e:
         logger.error("Database error while creating user for email %s: %s", email, e, exc_info=True)
         return None
@@ -0,0 +1,145 @@
+import io
+import logging
+import os
+import wave
+
+import numpy as np
+
+from services.audio_formats import PcmAudio
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() == "true"
+VAD_THRESHOLD_DBFS = float(os.getenv("VAD_THRESHOLD_DBFS", "-45"))
+VAD_MIN_SPEECH_SECONDS = float(os.getenv("VAD_MIN_SPEECH_SECONDS", "0.1"))
+VAD_PADDING_SECONDS = float(os.getenv("VAD_PADDING_SECONDS", "0.3"))
+VAD_FRAME_SECONDS = 0.03
+
+
+def _decode_samples(audio: bytes | PcmAudio) -> tuple[np.ndarray, int] | None:
+    """
+    Returns mono samples scaled to [-1, 1] and the sample rate, or None if the audio is not
+    in a format we can inspect (in which case it is passed through untouched).
+    """
+    if isinstance(audio, PcmAudio):
+        usable = len(audio.data) - len(audio.data) % audio.sample_width
+        if audio.encoding == "pcm_s16le":
+            return np.frombuffer(audio.data[:usable], dtype="<i2") / 32768.0, audio.sample_rate
+        return np.frombuffer(audio.data[:usable], dtype="<f4"), audio.sample_rate
+
+    try:
+        with wave.open(io.BytesIO(audio)) as wav_file:
+            if wav_file.getsampwidth() != 2:
+                return None
+            channels = wav_file.getnchannels()
+            sample_rate = wav_file.getframerate()
+            frames = wav_file.readframes(wav_file.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    samples = np.frombuffer(frames, dtype="<i2")[::channels]
+    return samples / 32768.0, sample_rate
+
+
+def _trim(audio: bytes | PcmAudio, start: int, end: int) -> bytes | PcmAudio:
+    """Cuts audio down to samples [start, end)."""
+    if isinstance(audio, PcmAudio):
+        width = audio.sample_width
+        return PcmAudio(audio.data[start * width : end * width], audio.encoding, audio.sample_rate)
+
+    with wave.open(io.BytesIO(audio)) as wav_file:
+        params = wav_file.getparams()
+        wav_file.setpos(start)
+        frames = wav_file.readframes(end - start)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setparams(params)
+        out.writeframes(frames)
+    return buffer.getvalue()
+
+
+class VoiceActivityGate:
+    """
+    Fast energy-based voice activity gate for one connection.
+
+    Audio is split into 30 ms frames and each frame's RMS level is compared against
+    `threshold_dbfs`. Chunks with less than `min_speech_seconds` of speech never reach STT;
+    the rest have leading and trailing silence trimmed (keeping `padding_seconds` around the
+    speech). The gate also keeps statistics of how much audio it skipped.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = VAD_ENABLED,
+        threshold_dbfs: float = VAD_THRESHOLD_DBFS,
+        min_speech_seconds: float = VAD_MIN_SPEECH_SECONDS,
+        padding_seconds: float = VAD_PADDING_SECONDS,
+    ):
+        self.enabled = enabled
+        self._threshold_rms = 10 ** (threshold_dbfs / 20)
+        self._min_speech_seconds = min_speech_seconds
+        self._padding_seconds = padding_seconds
+
+        self.chunks_total = 0
+        self.chunks_skipped = 0
+        self.seconds_total = 0.0
+        self.seconds_skipped = 0.0
+        self.seconds_trimmed = 0.0
+
+    def _speech_frames(self, samples: np.ndarray, sample_rate: int) -> tuple[np.ndarray, int]:
+        frame_length = max(1, int(sample_rate * VAD_FRAME_SECONDS))
+        frame_count = samples.shape[0] // frame_length
+        frames = samples[: frame_count * frame_length].reshape(frame_count, frame_length)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+        return rms > self._threshold_rms, frame_length
+
+    def has_speech(self, audio: bytes | PcmAudio) -> bool:
+        """True if the audio contains any frame above the threshold (or can't be inspected)."""
+        if not self.enabled:
+            return True
+        decoded = _decode_samples(audio)
+        if decoded is None:
+            return True
+        speech, _ = self._speech_frames(*decoded)
+        return bool(speech.any())
+
+    def apply(self, audio: bytes | PcmAudio) -> tuple[bytes | PcmAudio | None, float]:
+        """
+        Gates one chunk. Returns the (possibly trimmed) audio, or None if the chunk is
+        silent, together with the number of seconds trimmed from its start.
+        """
+        if not self.enabled:
+            return audio, 0.0
+        decoded = _decode_samples(audio)
+        if decoded is None:
+            return audio, 0.0
+
+        samples, sample_rate = decoded
+        duration = samples.shape[0] / sample_rate
+        self.chunks_total += 1
+        self.seconds_total += duration
+
+        speech, frame_length = self._speech_frames(samples, sample_rate)
+        if speech.sum() * frame_length / sample_rate < self._min_speech_seconds:
+            self.chunks_skipped += 1
+            self.seconds_skipped += duration
+            return None, 0.0
+
+        speech_indices = np.flatnonzero(speech)
+        padding = int(self._padding_seconds * sample_rate)
+        start = max(0, speech_indices[0] * frame_length - padding)
+        end = min(samples.shape[0], (speech_indices[-1] + 1) * frame_length + padding)
+        if start == 0 and end == samples.shape[0]:
+            return audio, 0.0
+
+        self.seconds_trimmed += (samples.shape[0] - (end - start)) / sample_rate
+        return _trim(audio, int(start), int(end)), start / sample_rate
+
+    def stats(self) -> dict:
+        return {
+            "chunks_total": self.chunks_total,
+            "chunks_skipped": self.chunks_skipped,
+            "seconds_total": round(self.seconds_total, 2),
+            "seconds_skipped": round(self.seconds_skipped, 2),
+            "seconds_trimmed": round(self.seconds_trimmed, 2),
+        }
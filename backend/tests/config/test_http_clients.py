@@ -0,0 +1,48 @@
+import httpx
+import pytest
+
+from config.http_clients import ServiceClients
+
+SETTINGS = {
+    "stt": {
+        "timeout": 30.0,
+        "max_connections": 10,
+        "max_keepalive_connections": 5,
+        "keepalive_expiry": 30.0,
+    },
+}
+
+
+@pytest.mark.asyncio
+async def test_get_reuses_the_same_pooled_client():
+    registry = ServiceClients(SETTINGS)
+    try:
+        first = registry.get("stt")
+        second = registry.get("stt")
+
+        assert isinstance(first, httpx.AsyncClient)
+        assert first is second
+        assert first.timeout.read == 30.0
+    finally:
+        await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_clients_and_get_reopens():
+    registry = ServiceClients(SETTINGS)
+    registry.start()
+    client = registry.get("stt")
+
+    await registry.aclose()
+    assert client.is_closed
+
+    reopened = registry.get("stt")
+    assert reopened is not client
+    assert not reopened.is_closed
+    await registry.aclose()
+
+
+def test_get_unknown_service_raises():
+    registry = ServiceClients(SETTINGS)
+    with pytest.raises(KeyError):
+        registry.get("unknown")
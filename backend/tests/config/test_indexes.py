@@ -0,0 +1,74 @@
+import pytest
+
+from config.indexes import INDEXES, ensure_indexes, find_missing_indexes
+
+
+class FakeCollection:
+    def __init__(self, existing=(), fail=False):
+        self.indexes = {"_id_": {"key": [("_id", 1)]}, **{name: {} for name in existing}}
+        self.fail = fail
+        self.create_calls = []
+
+    async def index_information(self):
+        return dict(self.indexes)
+
+    async def create_indexes(self, models):
+        if self.fail:
+            raise RuntimeError("E11000 duplicate key error")
+        names = [model.document["name"] for model in models]
+        self.create_calls.append(names)
+        self.indexes.update({name: {} for name in names})
+        return names
+
+
+class FakeDb:
+    def __init__(self, collections=None):
+        self.collections = collections or {}
+
+    def get_collection(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+
+def _names(collection_name):
+    return [model.document["name"] for model in INDEXES[collection_name]]
+
+
+@pytest.mark.asyncio
+async def test_creates_missing_indexes_once():
+    db = FakeDb({"users": FakeCollection(existing=_names("users"))})
+
+    assert await ensure_indexes(db, create=True) == {}
+    assert db.collections["users"].create_calls == []
+    assert db.collections["translations"].create_calls == [_names("translations")]
+    assert db.collections["settings"].indexes.keys() >= {"userId_unique"}
+
+    # Running again finds nothing to do.
+    assert await ensure_indexes(db, create=True) == {}
+    assert all(len(c.create_calls) <= 1 for c in db.collections.values())
+
+
+@pytest.mark.asyncio
+async def test_only_reports_missing_indexes_when_creation_is_disabled():
+    db = FakeDb()
+
+    missing = await ensure_indexes(db, create=False)
+
+    assert missing == {name: _names(name) for name in INDEXES}
+    assert all(c.create_calls == [] for c in db.collections.values())
+
+
+@pytest.mark.asyncio
+async def test_failed_collection_is_reported_and_others_still_created():
+    db = FakeDb({"users": FakeCollection(fail=True)})
+
+    missing = await ensure_indexes(db, create=True)
+
+    assert missing == {"users": ["googleId_unique"]}
+    assert await find_missing_indexes(db) == {"users": ["googleId_unique"]}
+
+
+def test_unique_indexes_for_one_document_per_user():
+    (google_id,) = INDEXES["users"]
+    (settings_user,) = INDEXES["settings"]
+    assert google_id.document["unique"] and google_id.document["key"] == {"googleId": 1}
+    assert settings_user.document["unique"] and settings_user.document["key"] == {"userId": 1}
@@ -4,4 +4,16 @@ import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-os.environ["JWT_SECRET_KEY"] = "test-secret-key-for-unit-tests"
\ No newline at end of file
+os.environ["JWT_SECRET_KEY"] = "test-secret-key-for-unit-tests"
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """Users, tokens and summaries are cached per process; start every test without them."""
+    from security import auth
+    from services.summary_cache import summary_cache
+
+    auth._user_cache.clear()
+    auth._token_cache.clear()
+    summary_cache.clear()
+    yield
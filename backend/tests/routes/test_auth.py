@@ -73,6 +73,7 @@ def test_google_login_success_existing_user(client, mocker, monkeypatch, fake_us
     fake_users_collection._docs[existing_google_id] = {
         "_id": "existing_mongo_id",
         "googleId": existing_google_id,
+        "email": "existing@test.com",
     }
 
     # Setup mocks
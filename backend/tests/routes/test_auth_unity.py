@@ -178,7 +178,11 @@ def test_poll_success_existing_user(client, mocker, monkeypatch, fake_users_coll
     monkeypatch.setattr(auth_unity, "GOOGLE_CLIENT_ID_UNITY", "fake-id")
     monkeypatch.setattr(auth_unity, "GOOGLE_CLIENT_SECRET_UNITY", "fake-secret")
 
-    fake_users_collection._docs["gid_456"] = {"_id": "mid_abc", "googleId": "gid_456"}
+    fake_users_collection._docs["gid_456"] = {
+        "_id": "mid_abc",
+        "googleId": "gid_456",
+        "email": "c@d.com",
+    }
 
     mocker.patch(
         "google.oauth2.id_token.verify_oauth2_token",
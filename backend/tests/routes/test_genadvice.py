@@ -0,0 +1,86 @@
+from fastapi.testclient import TestClient
+
+from main import app
+from routes import genadvice as genadvice_route
+
+
+class MockResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"advice": "Slow down a little."}
+
+
+class MockClient:
+    def __init__(self):
+        self.calls = []
+
+    async def post(self, url, json=None, **kwargs):
+        self.calls.append((url, json))
+        return MockResponse()
+
+
+def test_get_advice_forwards_text(monkeypatch):
+    mock_client = MockClient()
+    monkeypatch.setattr(genadvice_route, "get_service_client", lambda name: mock_client)
+
+    response = TestClient(app).post("/api/advice", json={"text": "Hello there."})
+
+    assert response.status_code == 200
+    assert response.json() == {"advice": "Slow down a little."}
+    assert mock_client.calls[0][1] == {"text": "Hello there."}
+
+
+def test_get_conversation_advice_assembles_transcript_server_side(monkeypatch):
+    mock_client = MockClient()
+    fetched = {}
+
+    async def mock_user_dependency():
+        return {"_id": "u1"}
+
+    async def fake_fetch(db, *, user_id, conversation_id, max_chars):
+        fetched.update(user_id=user_id, conversation_id=conversation_id, max_chars=max_chars)
+        return "Hi.\nHow are you?", 2
+
+    app.dependency_overrides[genadvice_route.get_current_user] = mock_user_dependency
+    monkeypatch.setattr(genadvice_route, "get_service_client", lambda name: mock_client)
+    monkeypatch.setattr(genadvice_route, "fetch_conversation_text", fake_fetch)
+    try:
+        response = TestClient(app).post("/api/advice/conversation/conv-1")
+    finally:
+        app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "advice": "Slow down a little.",
+        "conversationId": "conv-1",
+        "segments": 2,
+    }
+    assert fetched == {
+        "user_id": "u1",
+        "conversation_id": "conv-1",
+        "max_chars": genadvice_route.ADVICE_TRANSCRIPT_MAX_TOKENS * genadvice_route.CHARS_PER_TOKEN,
+    }
+    assert mock_client.calls[0][1] == {"text": "Hi.\nHow are you?"}
+
+
+def test_get_conversation_advice_unknown_conversation_returns_404(monkeypatch):
+    mock_client = MockClient()
+
+    async def mock_user_dependency():
+        return {"_id": "u1"}
+
+    async def fake_fetch(db, **kwargs):
+        return "", 0
+
+    app.dependency_overrides[genadvice_route.get_current_user] = mock_user_dependency
+    monkeypatch.setattr(genadvice_route, "get_service_client", lambda name: mock_client)
+    monkeypatch.setattr(genadvice_route, "fetch_conversation_text", fake_fetch)
+    try:
+        response = TestClient(app).post("/api/advice/conversation/missing")
+    finally:
+        app.dependency_overrides = {}
+
+    assert response.status_code == 404
+    assert mock_client.calls == []
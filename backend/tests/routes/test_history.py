@@ -40,17 +40,25 @@ def fake_translations_collection():
         def __init__(self):
             self._docs = []
 
-        def find(self, query: dict):
+        def find(self, query: dict, projection: dict | None = None):
             # Return self to allow chaining
             self._query = query
+            self.projection = projection
             return self
 
-        def sort(self, field: str, direction: int):
+        def sort(self, *keys):
             # Return self to allow chaining
+            self.sort_keys = keys[0] if len(keys) == 1 else keys
+            return self
+
+        def batch_size(self, size: int):
+            # Return self to allow chaining
+            self.batch = size
             return self
 
         def limit(self, count: int):
             # Return self to allow chaining
+            self._limit = count
             return self
 
         async def __aiter__(self):
@@ -259,9 +267,9 @@ def test_get_history_limit_enforced(
 
     assert response.status_code == 200
     data = response.json()
-    # The endpoint limits to 50 records, though our mock doesn't enforce this
-    # In reality, MongoDB's limit(50) would enforce this
-    assert "history" in data
+    assert len(data["history"]) == 50
+    # The records past the first page are reachable through the cursor.
+    assert data["next_cursor"]
 
 
 @pytest.mark.asyncio
@@ -383,4 +391,170 @@ def test_get_history_with_all_languages(
     assert data["history"][0]["source_lang"] == "en"
     assert data["history"][0]["target_lang"] == "zh"
     assert data["history"][1]["source_lang"] == "fr"
-    assert data["history"][1]["target_lang"] == "ko"
\ No newline at end of file
+    assert data["history"][1]["target_lang"] == "ko"
+
+
+def test_get_history_next_page_continues_after_cursor(
+    client, authenticated_client, mock_user, fake_translations_collection
+):
+    """
+    Test that a cursor from one page filters the next query to records after it, sorted on
+    timestamp with _id as tie-breaker, and that list fields are projected.
+    """
+    user_id = str(mock_user["_id"])
+    now = datetime.now(UTC)
+    fake_translations_collection._docs = [
+        {"_id": ObjectId(), "original_text": f"Text {i}", "userId": user_id, "timestamp": now}
+        for i in range(3)
+    ]
+
+    first = client.get("/api/history", params={"limit": 2}).json()
+    assert [doc["original_text"] for doc in first["history"]] == ["Text 0", "Text 1"]
+
+    client.get("/api/history", params={"limit": 2, "cursor": first["next_cursor"]})
+
+    query = fake_translations_collection._query
+    assert query["userId"] == user_id
+    last_id = ObjectId(first["history"][-1]["_id"])
+    assert query["$or"][1]["_id"] == {"$lt": last_id}
+    assert fake_translations_collection.sort_keys == [("timestamp", -1), ("_id", -1)]
+    assert fake_translations_collection.projection["original_text"] == 1
+
+
+def test_get_history_rejects_invalid_cursor_and_page_size(client, authenticated_client):
+    """
+    Test that a malformed cursor returns 400 and an out-of-range page size 422.
+    """
+    assert client.get("/api/history", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/history", params={"limit": 1000}).status_code == 422
+
+
+# --- Tests for GET /api/history/export ---
+
+
+def _export_docs(user_id):
+    return [
+        {
+            "_id": ObjectId(),
+            "original_text": "Hello, world",
+            "translated_text": "Hola, mundo",
+            "source_lang": "en",
+            "target_lang": "es",
+            "userId": user_id,
+            "conversationId": "conv-1",
+            "timestamp": datetime(2025, 1, 1, 12, 0, tzinfo=UTC),
+        },
+        {
+            "_id": ObjectId(),
+            "original_text": "Bye",
+            "translated_text": "Adiós",
+            "source_lang": "en",
+            "target_lang": "es",
+            "userId": user_id,
+            "conversationId": "conv-1",
+            "timestamp": datetime(2025, 1, 1, 12, 1, tzinfo=UTC),
+        },
+    ]
+
+
+def test_export_history_streams_ndjson(
+    client, authenticated_client, mock_user, fake_translations_collection
+):
+    """
+    Test that the export streams one JSON object per line from a batched cursor.
+    """
+    import json
+
+    user_id = str(mock_user["_id"])
+    fake_translations_collection._docs = _export_docs(user_id)
+
+    response = client.get("/api/history/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "attachment" in response.headers["content-disposition"]
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["translated_text"] for line in lines] == ["Hola, mundo", "Adiós"]
+    assert lines[0]["_id"] == str(fake_translations_collection._docs[0]["_id"])
+    assert lines[0]["timestamp"] == "2025-01-01T12:00:00+00:00"
+    assert fake_translations_collection.batch > 0
+    assert fake_translations_collection.sort_keys == ("timestamp", 1)
+
+
+def test_export_history_streams_csv_with_filters(
+    client, authenticated_client, mock_user, fake_translations_collection
+):
+    """
+    Test the CSV export and that the date range and conversation filter reach the query.
+    """
+    import csv
+    import io
+
+    user_id = str(mock_user["_id"])
+    fake_translations_collection._docs = _export_docs(user_id)
+
+    response = client.get(
+        "/api/history/export",
+        params={
+            "format": "csv",
+            "conversationId": "conv-1",
+            "start": "2025-01-01T00:00:00Z",
+            "end": "2025-01-02T00:00:00Z",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["original_text"] for row in rows] == ["Hello, world", "Bye"]
+
+    query = fake_translations_collection._query
+    assert query["userId"] == user_id
+    assert query["conversationId"] == "conv-1"
+    assert set(query["timestamp"]) == {"$gte", "$lt"}
+
+
+def test_export_history_csv_neutralizes_formulas(
+    client, authenticated_client, mock_user, fake_translations_collection
+):
+    """
+    Test that CSV cells which a spreadsheet would run as formulas are exported as text,
+    while the NDJSON export keeps the text as spoken.
+    """
+    import csv
+    import io
+    import json
+
+    user_id = str(mock_user["_id"])
+    docs = _export_docs(user_id)
+    docs[0]["original_text"] = "=SUM(A1:A9)"
+    docs[1]["translated_text"] = "-5 grados"
+    fake_translations_collection._docs = docs
+
+    response = client.get("/api/history/export", params={"format": "csv"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows[0]["original_text"] == "'=SUM(A1:A9)"
+    assert rows[1]["translated_text"] == "'-5 grados"
+    assert rows[1]["original_text"] == "Bye"
+
+    response = client.get("/api/history/export")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["original_text"] == "=SUM(A1:A9)"
+
+
+def test_export_history_rejects_empty_range(client, authenticated_client):
+    """
+    Test that a start that isn't before the end returns 400.
+    """
+    response = client.get(
+        "/api/history/export",
+        params={"start": "2025-01-02T00:00:00Z", "end": "2025-01-01T00:00:00Z"},
+    )
+    assert response.status_code == 400
+
+
+def test_export_history_unauthorized(client):
+    """
+    Test that the export requires authentication.
+    """
+    assert client.get("/api/history/export").status_code == 401
@@ -6,6 +6,7 @@ import pytest
 from bson import ObjectId
 from fastapi.testclient import TestClient
 
+from config.http_clients import SERVICE_CLIENT_SETTINGS
 from main import app
 from routes import process_audio as process_audio_route
 from security.auth import get_current_user
@@ -94,7 +95,7 @@ def test_process_audio_success(
     monkeypatch.setattr(process_audio_route, "STT_SERVICE_URL", "http://stt:9000")
     monkeypatch.setattr(process_audio_route, "TRANSLATION_SERVICE_URL", "http://translation:9001")
 
-    # Mock httpx.AsyncClient
+    # Mock the shared service client
     class MockSTTResponse:
         status_code = 200
 
@@ -129,7 +130,7 @@ def test_process_audio_success(
                 assert json["target_lang"] == "es"
                 return MockTranslationResponse()
 
-    monkeypatch.setattr("routes.process_audio.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(process_audio_route, "get_service_client", lambda name: MockClient())
 
     # Make request
     audio_file = create_mock_audio_file()
@@ -152,6 +153,42 @@ def test_process_audio_success(
     assert saved_doc["userId"] == str(mock_user["_id"])
 
 
+def test_process_audio_skips_translation_for_same_language(
+    client, authenticated_client, monkeypatch, fake_translations_collection
+):
+    """
+    Test that audio already in the target language is not sent for translation.
+    """
+
+    class MockSTTResponse:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {
+                "transcription": "Hola mundo",
+                "detected_language": "es",
+                "language_probability": 0.95,
+            }
+
+    class MockClient:
+        async def post(self, url, **kwargs):
+            assert "transcribe" in url, "translation service should not be called"
+            return MockSTTResponse()
+
+    monkeypatch.setattr(process_audio_route, "get_service_client", lambda name: MockClient())
+
+    response = client.post(
+        "/api/process-audio",
+        files={"audio_file": create_mock_audio_file()},
+        data={"source_lang": "en", "target_lang": "es"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["translated_text"] == "Hola mundo"
+    assert fake_translations_collection._docs[0]["source_lang"] == "es"
+
+
 def test_process_audio_default_languages(
     client, authenticated_client, monkeypatch, mock_user, fake_translations_collection
 ):
@@ -195,7 +232,7 @@ def test_process_audio_default_languages(
                 assert json["target_lang"] == "es"
                 return MockTranslationResponse()
 
-    monkeypatch.setattr("routes.process_audio.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(process_audio_route, "get_service_client", lambda name: MockClient())
 
     audio_file = create_mock_audio_file()
     # Don't specify languages - should default to en->es
@@ -251,7 +288,7 @@ def test_process_audio_various_language_pairs(
                 captured_langs["target"] = json["target_lang"]
                 return MockTranslationResponse()
 
-    monkeypatch.setattr("routes.process_audio.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(process_audio_route, "get_service_client", lambda name: MockClient())
 
     # Test Korean to Chinese
     audio_file = create_mock_audio_file()
@@ -303,7 +340,7 @@ def test_process_audio_stt_service_error(
         async def post(self, url, files=None, **kwargs):
             raise httpx.HTTPError("STT service unavailable")
 
-    monkeypatch.setattr("routes.process_audio.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(process_audio_route, "get_service_client", lambda name: MockClient())
 
     audio_file = create_mock_audio_file()
     response = client.post("/api/process-audio", files={"audio_file": audio_file})
@@ -339,7 +376,7 @@ def test_process_audio_stt_returns_no_transcription(
         async def post(self, url, files=None, **kwargs):
             return MockSTTResponse()
 
-    monkeypatch.setattr("routes.process_audio.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(process_audio_route, "get_service_client", lambda name: MockClient())
 
     audio_file = create_mock_audio_file()
     response = client.post("/api/process-audio", files={"audio_file": audio_file})
@@ -379,7 +416,7 @@ def test_process_audio_translation_service_error(
             elif "translate" in url:
                 raise httpx.HTTPError("Translation service unavailable")
 
-    monkeypatch.setattr("routes.process_audio.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(process_audio_route, "get_service_client", lambda name: MockClient())
 
     audio_file = create_mock_audio_file()
     response = client.post("/api/process-audio", files={"audio_file": audio_file})
@@ -428,7 +465,7 @@ def test_process_audio_translation_returns_none(
             elif "translate" in url:
                 return MockTranslationResponse()
 
-    monkeypatch.setattr("routes.process_audio.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(process_audio_route, "get_service_client", lambda name: MockClient())
 
     audio_file = create_mock_audio_file()
     response = client.post("/api/process-audio", files={"audio_file": audio_file})
@@ -485,7 +522,7 @@ def test_process_audio_database_save_failure(
             elif "translate" in url:
                 return MockTranslationResponse()
 
-    monkeypatch.setattr("routes.process_audio.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(process_audio_route, "get_service_client", lambda name: MockClient())
 
     audio_file = create_mock_audio_file()
     response = client.post("/api/process-audio", files={"audio_file": audio_file})
@@ -541,7 +578,7 @@ def test_process_audio_preserves_filename(
             elif "translate" in url:
                 return MockTranslationResponse()
 
-    monkeypatch.setattr("routes.process_audio.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(process_audio_route, "get_service_client", lambda name: MockClient())
 
     # Create audio file with specific filename
     audio_data = b"fake_audio"
@@ -558,12 +595,13 @@ def test_process_audio_timeout_60_seconds(
     client, authenticated_client, monkeypatch, mock_user, fake_translations_collection
 ):
     """
-    Test that the AsyncClient uses a 60-second timeout.
+    Test that STT and translation calls rely on their pools' 60-second timeout instead of
+    passing their own.
     """
     monkeypatch.setattr(process_audio_route, "STT_SERVICE_URL", "http://stt:9000")
     monkeypatch.setattr(process_audio_route, "TRANSLATION_SERVICE_URL", "http://translation:9001")
 
-    timeout_used = None
+    timeouts_used = []
 
     class MockSTTResponse:
         status_code = 200
@@ -584,29 +622,22 @@ def test_process_audio_timeout_60_seconds(
             return {"translated_text": "Prueba"}
 
     class MockClient:
-        def __init__(self, timeout=None):
-            nonlocal timeout_used
-            timeout_used = timeout
-
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, *args):
-            pass
-
-        async def post(self, url, files=None, json=None, **kwargs):
+        async def post(self, url, files=None, json=None, timeout=None, **kwargs):
+            timeouts_used.append(timeout)
             if "transcribe" in url:
                 return MockSTTResponse()
             elif "translate" in url:
                 return MockTranslationResponse()
 
-    monkeypatch.setattr("routes.process_audio.httpx.AsyncClient", MockClient)
+    monkeypatch.setattr(process_audio_route, "get_service_client", lambda name: MockClient())
 
     audio_file = create_mock_audio_file()
     response = client.post("/api/process-audio", files={"audio_file": audio_file})
 
     assert response.status_code == 200
-    assert timeout_used == 60.0
+    assert timeouts_used == [None, None]
+    assert SERVICE_CLIENT_SETTINGS["stt"]["timeout"] == 60.0
+    assert SERVICE_CLIENT_SETTINGS["translation"]["timeout"] == 60.0
 
 
 def test_process_audio_timestamp_saved(
@@ -649,7 +680,7 @@ def test_process_audio_timestamp_saved(
             elif "translate" in url:
                 return MockTranslationResponse()
 
-    monkeypatch.setattr("routes.process_audio.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(process_audio_route, "get_service_client", lambda name: MockClient())
 
     audio_file = create_mock_audio_file()
     before_time = datetime.now(UTC)
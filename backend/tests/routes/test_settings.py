@@ -126,3 +126,75 @@ async def test_post_settings_db_error_returns_500(monkeypatch, fake_settings_col
         resp = client.post("/api/settings", json=SettingsModel().model_dump())
         assert resp.status_code == 500
         assert "Failed to save settings" in resp.json()["detail"]
+
+
+def test_get_settings_is_served_from_cache_after_first_read(monkeypatch, fake_settings_collection):
+    reads = []
+    original_find_one = fake_settings_collection.find_one
+
+    async def counting_find_one(filter):
+        reads.append(filter)
+        return await original_find_one(filter)
+
+    monkeypatch.setattr(fake_settings_collection, "find_one", counting_find_one)
+
+    with TestClient(app) as client:
+        for _ in range(3):
+            assert client.get("/api/settings").status_code == 200
+        assert len(reads) == 1
+
+        # Saving replaces the cached entry, so the next read needs no database call either.
+        payload = SettingsModel(target_language="fr").model_dump()
+        assert client.post("/api/settings", json=payload).status_code == 200
+        assert client.get("/api/settings").json()["settings"] == payload
+        assert len(reads) == 1
+
+
+async def test_read_racing_a_save_caches_unless_the_same_user_saved(fake_settings_collection):
+    from routes import settings as settings_route
+
+    reader, other = {"_id": ObjectId()}, {"_id": ObjectId()}
+    request = SimpleNamespace(app=app)
+    original_find_one = fake_settings_collection.find_one
+    saver = [other]
+
+    async def find_one_during_save(filter):
+        doc = await original_find_one(filter)
+        await settings_route.save_settings(request, SettingsModel(), saver[0])
+        return doc
+
+    fake_settings_collection.find_one = find_one_during_save
+
+    # Another user's save doesn't stop this user's settings from being cached...
+    await settings_route.get_settings(request, reader)
+    assert settings_route._settings_cache.get(str(reader["_id"])) is not None
+
+    # ...but a save of the same user's settings does, since the read may be older.
+    settings_route._settings_cache.invalidate(str(reader["_id"]))
+    saver[0] = reader
+    fake_settings_collection._docs[str(reader["_id"])] = {"target_language": "fr"}
+    await settings_route.get_settings(request, reader)
+    assert settings_route._settings_cache.get(str(reader["_id"])) == SettingsModel()
+
+
+def test_post_settings_pushes_to_users_open_connections(mock_user):
+    from services.user_connections import user_connections
+
+    class Connection:
+        def __init__(self):
+            self.sent = []
+
+        async def send_json(self, message):
+            self.sent.append(message)
+
+    user_id = str(mock_user["_id"])
+    headset = Connection()
+    user_connections.register(user_id, headset)
+    try:
+        with TestClient(app) as client:
+            payload = SettingsModel(subtitle_font_size=24).model_dump()
+            assert client.post("/api/settings", json=payload).status_code == 200
+    finally:
+        user_connections.unregister(user_id, headset)
+
+    assert headset.sent == [{"type": "settings_updated", "settings": payload}]
@@ -5,6 +5,7 @@ import httpx
 import pytest
 from fastapi.testclient import TestClient
 
+from config.http_clients import SERVICE_CLIENT_SETTINGS
 from main import app
 from routes import summarization as summarization_route
 
@@ -18,6 +19,9 @@ class MockCursor:
         self.docs.sort(key=lambda x: x.get("created_at", datetime.min), reverse=True)
         return self
 
+    def limit(self, count):
+        return self
+
     def __aiter__(self):
         self._iter = iter(self.docs)
         return self
@@ -49,7 +53,7 @@ def test_summarize_success_default_length(client, monkeypatch):
         summarization_route, "SUMMARIZATION_SERVICE_URL", "http://summarization:9002"
     )
 
-    # Mock the httpx.AsyncClient
+    # Mock the shared service client
     class MockResponse:
         status_code = 200
 
@@ -72,7 +76,7 @@ def test_summarize_success_default_length(client, monkeypatch):
             assert json["length"] == "medium"  # default
             return MockResponse()
 
-    monkeypatch.setattr("routes.summarization.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
 
     response = client.post(
         "/api/summarize",
@@ -113,7 +117,7 @@ def test_summarize_success_short_length(client, monkeypatch):
             assert json["length"] == "short"
             return MockResponse()
 
-    monkeypatch.setattr("routes.summarization.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
 
     response = client.post(
         "/api/summarize",
@@ -153,7 +157,7 @@ def test_summarize_success_long_length(client, monkeypatch):
             assert json["length"] == "long"
             return MockResponse()
 
-    monkeypatch.setattr("routes.summarization.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
 
     response = client.post(
         "/api/summarize",
@@ -201,7 +205,7 @@ def test_summarize_empty_text(client, monkeypatch):
             assert json["text"] == ""
             return MockResponse()
 
-    monkeypatch.setattr("routes.summarization.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
 
     response = client.post("/api/summarize", json={"text": ""})
 
@@ -237,7 +241,7 @@ def test_summarize_service_returns_none(client, monkeypatch):
         async def post(self, url, json=None, **kwargs):
             return MockResponse()
 
-    monkeypatch.setattr("routes.summarization.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
 
     response = client.post("/api/summarize", json={"text": "Test text"})
 
@@ -264,7 +268,7 @@ def test_summarize_service_http_error(client, monkeypatch):
         async def post(self, url, json=None, **kwargs):
             raise httpx.HTTPError("Service unavailable")
 
-    monkeypatch.setattr("routes.summarization.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
 
     response = client.post("/api/summarize", json={"text": "Test text"})
 
@@ -290,7 +294,7 @@ def test_summarize_service_timeout(client, monkeypatch):
         async def post(self, url, json=None, **kwargs):
             raise httpx.TimeoutException("Request timed out")
 
-    monkeypatch.setattr("routes.summarization.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
 
     response = client.post("/api/summarize", json={"text": "Test text"})
 
@@ -330,7 +334,7 @@ def test_summarize_service_500_response(client, monkeypatch):
         async def post(self, url, json=None, **kwargs):
             return MockResponse()
 
-    monkeypatch.setattr("routes.summarization.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
 
     response = client.post("/api/summarize", json={"text": "Test text"})
 
@@ -367,7 +371,7 @@ def test_summarize_special_characters(client, monkeypatch):
             assert special_text in json["text"]
             return MockResponse()
 
-    monkeypatch.setattr("routes.summarization.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
 
     response = client.post("/api/summarize", json={"text": special_text})
 
@@ -404,7 +408,7 @@ def test_summarize_invalid_length_value(client, monkeypatch):
             assert json["length"] == "invalid_value"
             return MockResponse()
 
-    monkeypatch.setattr("routes.summarization.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
 
     response = client.post(
         "/api/summarize",
@@ -417,7 +421,8 @@ def test_summarize_invalid_length_value(client, monkeypatch):
 
 def test_summarize_timeout_configuration(client, monkeypatch):
     """
-    Test that the summarization request uses the correct timeout (120 seconds).
+    Test that the summarization request relies on the summarization pool's timeout
+    (120 seconds) instead of passing its own.
     """
     monkeypatch.setattr(
         summarization_route, "SUMMARIZATION_SERVICE_URL", "http://summarization:9002"
@@ -435,26 +440,19 @@ def test_summarize_timeout_configuration(client, monkeypatch):
             return {"summary": "Summary"}
 
     class MockClient:
-        def __init__(self, timeout=None):
+        async def post(self, url, json=None, timeout=None, **kwargs):
             nonlocal timeout_used
             timeout_used = timeout
-
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, *args):
-            pass
-
-        async def post(self, url, json=None, **kwargs):
             return MockResponse()
 
-    monkeypatch.setattr("routes.summarization.httpx.AsyncClient", MockClient)
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
 
     response = client.post("/api/summarize", json={"text": "Test"})
 
     assert response.status_code == 200
-    # Verify the AsyncClient was created with timeout=120.0
-    assert timeout_used == 120.0
+    # No per-call override; the pooled client's default applies.
+    assert timeout_used is None
+    assert SERVICE_CLIENT_SETTINGS["summarization"]["timeout"] == 120.0
 
 
 def test_summarize_multiline_text(client, monkeypatch):
@@ -491,7 +489,7 @@ Paragraph 2"""
             assert "\n" in json["text"]
             return MockResponse()
 
-    monkeypatch.setattr("routes.summarization.httpx.AsyncClient", lambda timeout: MockClient())
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
 
     response = client.post("/api/summarize", json={"text": multiline_text})
 
@@ -579,7 +577,7 @@ def test_get_history_success(client):
     }
 
     client.app.state.summaries = type("obj", (), {})()
-    client.app.state.summaries.find = lambda query: MockCursor([mock_doc])
+    client.app.state.summaries.find = lambda query, projection=None: MockCursor([mock_doc])
 
     response = client.get("/api/summarize/history")
     assert response.status_code == 200
@@ -615,9 +613,220 @@ def test_get_history_empty(client):
     client.app.dependency_overrides[summarization_route.get_current_user] = mock_user_dependency
 
     client.app.state.summaries = type("obj", (), {})()
-    client.app.state.summaries.find = lambda query: MockCursor([])
+    client.app.state.summaries.find = lambda query, projection=None: MockCursor([])
     response = client.get("/api/summarize/history")
     assert response.status_code == 200
     assert response.json()["history"] == []
 
     client.app.dependency_overrides = {}
+
+
+def test_get_history_leaves_out_original_text_by_default(client):
+    """Test summary history projects away the full transcripts unless asked for them."""
+
+    async def mock_user_dependency():
+        return {"_id": "u1"}
+
+    client.app.dependency_overrides[summarization_route.get_current_user] = mock_user_dependency
+
+    projections = []
+
+    def find(query, projection=None):
+        projections.append(projection)
+        return MockCursor([])
+
+    client.app.state.summaries = type("obj", (), {})()
+    client.app.state.summaries.find = find
+
+    client.get("/api/summarize/history")
+    client.get("/api/summarize/history", params={"include_original_text": True})
+    assert projections == [{"original_text": 0}, None]
+
+    response = client.get("/api/summarize/history", params={"cursor": "%%%"})
+    assert response.status_code == 400
+
+    client.app.dependency_overrides = {}
+
+
+def test_summarize_stream_relays_service_stream(client, monkeypatch):
+    """Test the streaming endpoint passes the service's NDJSON lines through."""
+    import json
+
+    import httpx
+
+    lines = [{"token": "Short"}, {"token": " gist"}, {"done": True, "summary": "Short gist"}]
+    sent = []
+
+    def handler(request):
+        sent.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, content="".join(json.dumps(line) + "\n" for line in lines))
+
+    service_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: service_client)
+
+    response = client.post("/api/summarize/stream", json={"text": "Some text", "length": "short"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in response.text.splitlines()] == lines
+    assert sent == [("/summarize/stream", {"text": "Some text", "length": "short"})]
+
+    # The streamed summary was cached, so asking again needs no service call.
+    response = client.post("/api/summarize", json={"text": "Some text", "length": "short"})
+    assert response.json() == {"summary": "Short gist"}
+    assert len(sent) == 1
+
+
+def test_summarize_stream_service_error_and_unavailable(client, monkeypatch):
+    """Test errors before the stream starts map to HTTP errors like /summarize."""
+    import httpx
+
+    def failing(request):
+        return httpx.Response(500, text="Ollama failed")
+
+    service_client = httpx.AsyncClient(transport=httpx.MockTransport(failing))
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: service_client)
+    response = client.post("/api/summarize/stream", json={"text": "Some text"})
+    assert response.status_code == 500
+    assert "Ollama failed" in response.json()["detail"]
+
+    def unreachable(request):
+        raise httpx.ConnectError("connection refused")
+
+    service_client = httpx.AsyncClient(transport=httpx.MockTransport(unreachable))
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: service_client)
+    response = client.post("/api/summarize/stream", json={"text": "Some text"})
+    assert response.status_code == 503
+
+
+async def test_summarize_stream_closes_upstream_when_client_disconnects_early(monkeypatch):
+    """Test the service stream is closed even if the client is gone before the body starts."""
+    import json
+
+    import httpx
+
+    class UpstreamBody(httpx.AsyncByteStream):
+        closed = False
+
+        async def __aiter__(self):
+            yield b'{"done": true, "summary": "x"}\n'
+
+        async def aclose(self):
+            self.closed = True
+
+    upstream = UpstreamBody()
+    service_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, stream=upstream))
+    )
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: service_client)
+
+    body = json.dumps({"text": "Some text"}).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/summarize/stream",
+        "raw_path": b"/api/summarize/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            raise OSError("client went away")
+
+    with pytest.raises(Exception):  # noqa: B017
+        await app(scope, receive, send)
+
+    assert upstream.closed
+
+
+def test_summarize_repeated_request_is_served_from_cache(client, monkeypatch):
+    """Test the same text and length reach the summarization service only once."""
+    calls = []
+
+    class MockResponse:
+        status_code = 200
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"summary": f"Summary {len(calls)}"}
+
+    class MockClient:
+        async def post(self, url, json=None, **kwargs):
+            calls.append(json)
+            return MockResponse()
+
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
+
+    first = client.post("/api/summarize", json={"text": "Cached text.", "length": "short"})
+    again = client.post("/api/summarize", json={"text": " Cached  text. ", "length": "short"})
+    longer = client.post("/api/summarize", json={"text": "Cached text.", "length": "long"})
+
+    assert first.json() == again.json() == {"summary": "Summary 1"}
+    assert longer.json() == {"summary": "Summary 2"}
+    assert len(calls) == 2
+
+    # The streaming endpoint answers from the same cache without calling the service.
+    streamed = client.post(
+        "/api/summarize/stream", json={"text": "Cached text.", "length": "short"}
+    )
+    assert streamed.json() == {"done": True, "summary": "Summary 1"}
+    assert len(calls) == 2
+
+
+def test_get_conversation_summary_returns_running_summary(client, monkeypatch):
+    """Test the running summary endpoint folds new text through /summarize/update."""
+    calls = []
+
+    async def mock_user_dependency():
+        return {"_id": "u1"}
+
+    client.app.dependency_overrides[summarization_route.get_current_user] = mock_user_dependency
+
+    class MockResponse:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"summary": "Updated."}
+
+    class MockClient:
+        async def post(self, url, json=None, **kwargs):
+            calls.append((url, json))
+            return MockResponse()
+
+    async def fake_refresh(db, user_id, conversation_id, fold):
+        assert (user_id, conversation_id) == ("u1", "conv-9")
+        summary = await fold("Before.", "New words.")
+        return {"summary": summary, "segments": 4, "updated_at": None}
+
+    monkeypatch.setattr(summarization_route, "get_service_client", lambda name: MockClient())
+    monkeypatch.setattr(summarization_route.rolling_summarizer, "refresh", fake_refresh)
+
+    response = client.get("/api/summarize/conversation/conv-9")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "conversationId": "conv-9",
+        "summary": "Updated.",
+        "segments": 4,
+        "updated_at": None,
+    }
+    assert calls[0][0].endswith("/summarize/update")
+    assert calls[0][1] == {"summary": "Before.", "text": "New words."}
+
+    client.app.dependency_overrides = {}
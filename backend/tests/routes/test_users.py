@@ -233,3 +233,36 @@ def test_get_current_user_nonexistent_objectid(client, monkeypatch):
     
     # The endpoint should return 401 when user not found
     assert response.status_code == 401
+
+
+def test_get_current_user_is_cached_until_invalidated(client, monkeypatch, mock_user):
+    """
+    Test that repeated requests with the same token reuse the cached user document, and
+    that invalidating the user makes the next request read it again.
+    """
+    monkeypatch.setattr(security_auth, "JWT_SECRET_KEY", "test-secret-key")
+    lookups = []
+
+    class FakeCollection:
+        async def find_one(self, query):
+            lookups.append(query)
+            return mock_user
+
+    class FakeDB:
+        def __getitem__(self, name):
+            return FakeCollection()
+
+    monkeypatch.setattr(app.state, "db", FakeDB())
+
+    from security.auth import create_access_token, invalidate_cached_user
+
+    token = create_access_token(data={"sub": str(mock_user["_id"])})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for _ in range(3):
+        assert client.get("/api/users/me", headers=headers).status_code == 200
+    assert len(lookups) == 1
+
+    invalidate_cached_user(str(mock_user["_id"]))
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+    assert len(lookups) == 2
@@ -2,6 +2,7 @@ import pytest
 from types import SimpleNamespace
 from main import app
 from routes import websocket as ws_mod
+from services.audio_formats import PcmAudio
 
 # --- Mock Database Setup ---
 
@@ -31,18 +32,31 @@ class StubWS:
         self.sent.append(obj)
 
 
-@pytest.mark.asyncio
-async def test_process_audio_chunk_success(monkeypatch):
-    class Resp:
-        def __init__(self, d):
-            self._d = d
+class Resp:
+    def __init__(self, d):
+        self._d = d
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._d
 
-        def raise_for_status(self):
-            pass
 
-        def json(self):
-            return self._d
+def stt_response(transcription="hello", detected_language="en", language_probability=0.9, **kw):
+    """What the fake STT service answers for one chunk."""
+    return Resp(
+        {
+            "transcription": transcription,
+            "detected_language": detected_language,
+            "language_probability": language_probability,
+            **kw,
+        }
+    )
 
+
+@pytest.mark.asyncio
+async def test_process_audio_chunk_success(monkeypatch):
     class Client:
         async def __aenter__(self):
             return self
@@ -53,12 +67,12 @@ async def test_process_audio_chunk_success(monkeypatch):
         async def post(self, url, **kw):
             if url.endswith("/transcribe"):
                 # Simulate STT service response with language detection
-                return Resp({"transcription": "hello", "detected_language": "en", "language_probability": 0.9})
+                return stt_response()
             if url.endswith("/translate"):
                 return Resp({"translated_text": "hola"})
             raise AssertionError(url)
 
-    monkeypatch.setattr(ws_mod.httpx, "AsyncClient", lambda timeout=30.0: Client())
+    monkeypatch.setattr(ws_mod, "get_service_client", lambda name: Client())
     ws = StubWS()
     await ws_mod.process_audio_chunk(ws, b"wav", "en", "es", None, "dummy_convo_id")
 
@@ -91,10 +105,176 @@ async def test_process_audio_chunk_stt_error(monkeypatch):
         async def post(self, url, **kw):
             raise ws_mod.httpx.HTTPError("boom")
 
-    monkeypatch.setattr(ws_mod.httpx, "AsyncClient", lambda timeout=30.0: BadClient())
+    monkeypatch.setattr(ws_mod, "get_service_client", lambda name: BadClient())
     ws = StubWS()
     await ws_mod.process_audio_chunk(ws, b"x", "en", "es", None, "dummy_convo_id")
     assert ws.sent and "Error:" in ws.sent[0]["translated_text"]
 
     # Assert that nothing was saved to the DB on error
     assert ws.mock_collection.inserted_doc is None
+
+
+@pytest.mark.asyncio
+async def test_process_audio_chunk_sends_raw_pcm_to_pcm_endpoint(monkeypatch):
+    calls = []
+
+    class Client:
+        async def post(self, url, **kw):
+            calls.append((url, kw))
+            if url.endswith("/transcribe/pcm"):
+                return stt_response()
+            if url.endswith("/translate"):
+                return Resp({"translated_text": "hola"})
+            raise AssertionError(url)
+
+    monkeypatch.setattr(ws_mod, "get_service_client", lambda name: Client())
+    ws = StubWS()
+    audio = PcmAudio(b"\x00\x00" * 4800, "pcm_s16le", 48000)
+    await ws_mod.process_audio_chunk(ws, audio, "en", "es", None, "dummy_convo_id")
+
+    stt_url, stt_kwargs = calls[0]
+    assert stt_url.endswith("/transcribe/pcm")
+    assert stt_kwargs["params"] == {"sample_rate": 48000, "encoding": "pcm_s16le"}
+    assert stt_kwargs["content"] == audio.data
+    assert ws.sent[0]["translated_text"] == "hola"
+
+
+@pytest.mark.asyncio
+async def test_process_audio_chunk_translates_only_text_after_the_overlap(monkeypatch):
+    from services.transcript_stitcher import TranscriptStitcher
+
+    stt_results = [
+        {
+            "transcription": "good morning",
+            "words": [
+                {"word": " good", "start": 0.6, "end": 0.9},
+                {"word": " morning", "start": 0.9, "end": 1.4},
+            ],
+        },
+        {
+            "transcription": "morning everyone",
+            "words": [
+                {"word": " morning", "start": 0.0, "end": 0.4},
+                {"word": " everyone", "start": 0.5, "end": 1.0},
+            ],
+        },
+    ]
+    translated = []
+
+    class Client:
+        async def post(self, url, **kw):
+            if url.endswith("/transcribe"):
+                return stt_response(**stt_results.pop(0))
+            if url.endswith("/translate"):
+                translated.append(kw["json"]["text"])
+                return Resp({"translated_text": "x"})
+            raise AssertionError(url)
+
+    monkeypatch.setattr(ws_mod, "get_service_client", lambda name: Client())
+    stitcher = TranscriptStitcher(overlap_seconds=0.5)
+    first, second = stitcher.ticket(1.5), stitcher.ticket(1.5)
+    ws = StubWS()
+    await ws_mod.process_audio_chunk(ws, b"wav", "en", "es", None, "c", first)
+    await ws_mod.process_audio_chunk(ws, b"wav", "en", "es", None, "c", second)
+
+    assert translated == ["good morning", "everyone"]
+    assert ws.sent[1]["original_text"] == "everyone"
+    assert ws.mock_collection.inserted_doc["original_text"] == "everyone"
+
+
+@pytest.mark.asyncio
+async def test_process_audio_chunk_fans_out_to_conversation_listeners(monkeypatch):
+    from services.conversation_hub import ConversationHub
+
+    posted = []
+
+    class Client:
+        async def post(self, url, **kw):
+            posted.append(url.split("/", 3)[-1])
+            if url.endswith("/transcribe"):
+                return stt_response()
+            if url.endswith("/translate/batch"):
+                segments = kw["json"]["segments"]
+                translations = [f"{s['target_lang']}:{s['text']}" for s in segments]
+                return Resp({"translations": translations})
+            raise AssertionError(url)
+
+    hub = ConversationHub()
+    japanese, german = StubWS(), StubWS()
+    hub.subscribe("room", japanese, "ja")
+    hub.subscribe("room", german, "de")
+    monkeypatch.setattr(ws_mod, "conversation_hub", hub)
+    monkeypatch.setattr(ws_mod, "get_service_client", lambda name: Client())
+
+    speaker = StubWS()
+    await ws_mod.process_audio_chunk(speaker, b"wav", "en", "es", "u1", "room")
+
+    # One transcription and one batched translation for all three languages.
+    assert posted == ["transcribe", "translate/batch"]
+    assert speaker.sent[0]["translated_text"] == "es:hello"
+    assert japanese.sent[0]["translated_text"] == "ja:hello"
+    assert german.sent[0]["translated_text"] == "de:hello"
+    assert german.sent[0]["type"] == "broadcast" and german.sent[0]["speaker_id"] == "u1"
+
+
+@pytest.mark.asyncio
+async def test_process_audio_chunk_sends_confirmed_language_and_skips_same_language(
+    monkeypatch,
+):
+    from services.language_tracker import LanguageTracker
+
+    stt_requests = []
+
+    class Client:
+        async def post(self, url, **kw):
+            if url.endswith("/transcribe"):
+                stt_requests.append(kw.get("data"))
+                return stt_response("hola", "es", 0.95)
+            raise AssertionError(f"unexpected call to {url}")
+
+    monkeypatch.setattr(ws_mod, "get_service_client", lambda name: Client())
+    tracker = LanguageTracker(confirm_chunks=2, min_probability=0.7, recheck_chunks=10)
+    ws = StubWS()
+    for _ in range(3):
+        await ws_mod.process_audio_chunk(ws, b"wav", "en", "es", None, "c", None, tracker)
+
+    # Detection ran for the first two chunks; the third named the confirmed language.
+    assert [data.get("language") for data in stt_requests] == [None, None, "es"]
+    # Detection chunks opt out of the STT session's own sticky language.
+    assert [data.get("detect_language") for data in stt_requests] == ["true", "true", None]
+    # Every chunk names the connection's STT session, so STT can reuse earlier context.
+    assert {data["session_id"] for data in stt_requests} == {tracker.session_id}
+    # Spanish speech with a Spanish target never reaches the translation service.
+    assert [m["translated_text"] for m in ws.sent] == ["hola", "hola", "hola"]
+
+
+@pytest.mark.asyncio
+async def test_process_audio_chunk_sends_result_before_buffering_the_log(monkeypatch):
+    class Client:
+        async def post(self, url, **kw):
+            if url.endswith("/transcribe"):
+                return stt_response()
+            if url.endswith("/translate"):
+                return Resp({"translated_text": "hola"})
+            raise AssertionError(url)
+
+    events = []
+
+    class LogWriter:
+        running = True
+
+        async def enqueue(self, doc):
+            events.append(("log", doc["translated_text"]))
+
+    class OrderedWS(StubWS):
+        async def send_json(self, obj):
+            events.append(("send", obj["translated_text"]))
+
+    monkeypatch.setattr(ws_mod, "get_service_client", lambda name: Client())
+    ws = OrderedWS()
+    ws.app.state.translation_log_writer = LogWriter()
+    await ws_mod.process_audio_chunk(ws, b"wav", "en", "es", "u1", "c")
+
+    assert events == [("send", "hola"), ("log", "hola")]
+    # The buffered writer replaces the direct insert.
+    assert ws.mock_collection.inserted_doc is None
@@ -14,7 +14,7 @@ def _pack(meta: dict, audio: bytes) -> bytes:
 def test_ws_route_parses_and_calls_processor(monkeypatch):
     called = {}
 
-    async def fake_proc(ws, audio, src, tgt, userId, conversation_id):
+    async def fake_proc(ws, audio, src, tgt, userId, conversation_id, *per_connection_state):
         called["audio"] = audio
         await ws.send_json({"original_text": "a", "translated_text": "b"})
 
@@ -25,4 +25,121 @@ def test_ws_route_parses_and_calls_processor(monkeypatch):
         msg = ws.receive_json()
 
     assert called["audio"] == b"123"
-    assert msg == {"original_text": "a", "translated_text": "b"}
+    assert msg == {"original_text": "a", "translated_text": "b", "sequence": 0}
+
+
+def test_ws_stream_mode_sends_interim_and_final(monkeypatch):
+    segments = []
+
+    async def fake_segment(ws, wav_audio, is_final, src, tgt, userId, conversation_id, tracker):
+        segments.append(is_final)
+        await ws.send_json({"original_text": "hi", "translated_text": "hola"})
+
+    monkeypatch.setattr(ws_mod, "process_stream_segment", fake_segment)
+
+    # Alternating +/-8000 samples: loud enough to pass the voice activity gate.
+    one_second_pcm = (
+        (8000).to_bytes(2, "little", signed=True) + (-8000).to_bytes(2, "little", signed=True)
+    ) * 8000
+    with TestClient(app).websocket_connect("/ws") as ws:
+        ws.send_bytes(_pack({"mode": "stream", "sample_rate": 16000}, one_second_pcm))
+        interim = ws.receive_json()
+        ws.send_bytes(_pack({"end_of_segment": True}, one_second_pcm))
+        final = ws.receive_json()
+
+    assert segments == [False, True]
+    assert interim["type"] == "interim" and interim["segment_id"] == 0
+    assert final["type"] == "final" and final["segment_id"] == 0
+    assert final["translated_text"] == "hola"
+
+
+def test_ws_silent_pcm_chunk_skips_processing(monkeypatch):
+    async def fake_proc(ws, audio, src, tgt, userId, conversation_id, *per_connection_state):
+        raise AssertionError("silent chunks should not be processed")
+
+    monkeypatch.setattr(ws_mod, "process_audio_chunk", fake_proc)
+
+    silence = b"\x00\x00" * 16000
+    with TestClient(app).websocket_connect("/ws") as ws:
+        ws.send_bytes(_pack({"encoding": "pcm_s16le", "sample_rate": 16000}, silence))
+        msg = ws.receive_json()
+
+    assert msg == {"original_text": "", "translated_text": "", "silent": True, "sequence": 0}
+
+
+def _listen_frame(conversation_id: str, **meta) -> bytes:
+    return _pack({"mode": "listen", "conversation_id": conversation_id, **meta}, b"")
+
+
+def test_ws_listen_mode_subscribes_until_disconnect(monkeypatch):
+    from services.conversation_hub import ConversationHub
+
+    hub = ConversationHub()
+    hub.add_speaker("room", object(), "u1")
+    subscriptions = []
+    original_subscribe = hub.subscribe
+
+    def recording_subscribe(conversation_id, websocket, target_lang):
+        subscriptions.append((conversation_id, target_lang))
+        original_subscribe(conversation_id, websocket, target_lang)
+
+    async def fake_verify(token):
+        return "u1"
+
+    monkeypatch.setattr(hub, "subscribe", recording_subscribe)
+    monkeypatch.setattr(ws_mod, "conversation_hub", hub)
+    monkeypatch.setattr(ws_mod, "verify_jwt_token", fake_verify)
+
+    with TestClient(app).websocket_connect("/ws") as ws:
+        ws.send_bytes(_listen_frame("room", target_lang="ja", jwt_token="t"))
+        ws.send_bytes(_pack({"target_lang": "de"}, b""))
+
+    assert subscriptions == [("room", "ja"), ("room", "de")]
+    assert hub.listener_count("room") == 0
+
+
+def test_ws_listen_mode_requires_authentication(monkeypatch):
+    import pytest
+    from fastapi import WebSocketDisconnect
+
+    from services.conversation_hub import ConversationHub
+
+    hub = ConversationHub()
+    monkeypatch.setattr(ws_mod, "conversation_hub", hub)
+
+    with TestClient(app).websocket_connect("/ws") as ws:
+        ws.send_bytes(_listen_frame("room", target_lang="ja"))
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_bytes()
+
+    assert closed.value.code == 4001
+    assert hub.listener_count("room") == 0
+
+
+def test_ws_listen_mode_rejects_users_outside_the_conversation(monkeypatch):
+    import pytest
+    from fastapi import WebSocketDisconnect
+
+    from services.conversation_hub import ConversationHub
+
+    class Translations:
+        async def find_one(self, query, projection=None):
+            assert query == {"userId": "stranger", "conversationId": "room"}
+            return None
+
+    async def fake_verify(token):
+        return "stranger"
+
+    hub = ConversationHub()
+    hub.add_speaker("room", object(), "u1")
+    monkeypatch.setattr(ws_mod, "conversation_hub", hub)
+    monkeypatch.setattr(ws_mod, "verify_jwt_token", fake_verify)
+    monkeypatch.setattr(app.state.db, "get_collection", lambda name: Translations())
+
+    with TestClient(app).websocket_connect("/ws") as ws:
+        ws.send_bytes(_listen_frame("room", target_lang="ja", jwt_token="t"))
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_bytes()
+
+    assert closed.value.code == 4003
+    assert hub.listener_count("room") == 0
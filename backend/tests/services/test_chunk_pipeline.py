@@ -0,0 +1,157 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services.chunk_pipeline import ChunkPipeline
+
+
+class StubWS:
+    def __init__(self):
+        self.sent = []
+        self.app = SimpleNamespace(state=SimpleNamespace())
+
+    async def send_json(self, obj):
+        self.sent.append(obj)
+
+
+@pytest.mark.asyncio
+async def test_results_are_sent_in_order_when_chunks_finish_out_of_order():
+    ws = StubWS()
+    delays = {"first": 0.05, "second": 0.0, "third": 0.01}
+
+    async def process(sink, name):
+        await asyncio.sleep(delays[name])
+        await sink.send_json({"original_text": name})
+
+    pipeline = ChunkPipeline(ws, process, workers=3, max_queued=4)
+    pipeline.start()
+    for name in ("first", "second", "third"):
+        await pipeline.submit(name)
+    await pipeline.close()
+
+    assert ws.sent == [
+        {"original_text": "first", "sequence": 0},
+        {"original_text": "second", "sequence": 1},
+        {"original_text": "third", "sequence": 2},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_after_send_callbacks_run_in_chunk_order_after_each_result():
+    ws = StubWS()
+    delays = {"slow": 0.05, "fast": 0.0}
+
+    async def process(sink, name):
+        await asyncio.sleep(delays[name])
+        await sink.send_json({"original_text": name})
+
+        async def follow_up(sequence):
+            ws.sent.append({"follow_up": name, "sequence": sequence})
+
+        sink.after_send(follow_up)
+
+    pipeline = ChunkPipeline(ws, process, workers=2, max_queued=4)
+    pipeline.start()
+    for name in ("slow", "fast"):
+        await pipeline.submit(name)
+    await pipeline.close()
+
+    assert ws.sent == [
+        {"original_text": "slow", "sequence": 0},
+        {"follow_up": "slow", "sequence": 0},
+        {"original_text": "fast", "sequence": 1},
+        {"follow_up": "fast", "sequence": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_released_result_is_sent_before_the_worker_finishes():
+    ws = StubWS()
+    logged = asyncio.Event()
+
+    async def process(sink, name):
+        await sink.send_json({"original_text": name})
+        sink.release()
+        # Follow-up work (e.g. a slow database write) must not hold the result back.
+        await asyncio.sleep(0.05)
+        ws.sent.append({"logged": name})
+        logged.set()
+
+    pipeline = ChunkPipeline(ws, process, workers=1, max_queued=4)
+    pipeline.start()
+    await pipeline.submit("hello")
+    await asyncio.sleep(0.01)
+
+    assert ws.sent == [{"original_text": "hello", "sequence": 0}]
+    await logged.wait()
+    await pipeline.close()
+    assert ws.sent[-1] == {"logged": "hello"}
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_processed_concurrently():
+    ws = StubWS()
+    running = 0
+    peak = 0
+
+    async def process(sink, name):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        await sink.send_json({"original_text": name})
+
+    pipeline = ChunkPipeline(ws, process, workers=2, max_queued=4)
+    pipeline.start()
+    for name in ("a", "b", "c", "d"):
+        await pipeline.submit(name)
+    await pipeline.close()
+
+    assert peak == 2
+    assert [m["sequence"] for m in ws.sent] == [0, 1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_oldest_waiting_chunk_is_dropped_when_backlog_is_full():
+    ws = StubWS()
+    release = asyncio.Event()
+
+    async def process(sink, name):
+        await release.wait()
+        await sink.send_json({"original_text": name})
+
+    dropped = []
+    pipeline = ChunkPipeline(ws, process, workers=1, max_queued=1, on_drop=dropped.append)
+    pipeline.start()
+    await pipeline.submit("busy")
+    await asyncio.sleep(0)  # let the worker pick up the first chunk
+    await pipeline.submit("stale")
+    await pipeline.submit("fresh")
+    release.set()
+    await pipeline.close()
+
+    assert pipeline.dropped_chunks == 1
+    assert dropped == ["stale"]
+    assert ws.sent[0] == {"original_text": "busy", "sequence": 0}
+    assert ws.sent[1]["sequence"] == 1 and ws.sent[1]["dropped"] is True
+    assert ws.sent[2] == {"original_text": "fresh", "sequence": 2}
+
+
+@pytest.mark.asyncio
+async def test_failing_chunk_does_not_block_later_results():
+    ws = StubWS()
+
+    async def process(sink, name):
+        if name == "bad":
+            raise RuntimeError("boom")
+        await sink.send_json({"original_text": name})
+
+    pipeline = ChunkPipeline(ws, process, workers=1, max_queued=4)
+    pipeline.start()
+    await pipeline.submit("bad")
+    await pipeline.submit("good")
+    await pipeline.close()
+
+    assert ws.sent == [{"original_text": "good", "sequence": 1}]
@@ -0,0 +1,54 @@
+import pytest
+
+from services.conversation_hub import ConversationHub
+
+
+class StubWS:
+    def __init__(self, fail: bool = False):
+        self.sent = []
+        self.fail = fail
+
+    async def send_json(self, obj):
+        if self.fail:
+            raise RuntimeError("gone")
+        self.sent.append(obj)
+
+
+def test_target_languages_are_collected_per_conversation():
+    hub = ConversationHub()
+    hub.subscribe("c1", StubWS(), "es")
+    hub.subscribe("c1", StubWS(), "ja")
+    hub.subscribe("c1", StubWS(), "es")
+    hub.subscribe("c2", StubWS(), "de")
+
+    assert hub.target_languages("c1") == {"es", "ja"}
+    assert hub.listener_count("c1") == 3
+    assert hub.target_languages(None) == set()
+
+
+def test_unsubscribe_removes_empty_conversations():
+    hub = ConversationHub()
+    ws = StubWS()
+    hub.subscribe("c1", ws, "es")
+    hub.subscribe("c1", ws, "fr")  # changing language replaces the subscription
+    assert hub.target_languages("c1") == {"fr"}
+
+    hub.unsubscribe("c1", ws)
+    assert hub.listener_count("c1") == 0
+    hub.unsubscribe("c1", ws)  # no-op
+
+
+@pytest.mark.asyncio
+async def test_broadcast_sends_each_listener_its_language_and_drops_dead_ones():
+    hub = ConversationHub()
+    spanish, japanese, dead = StubWS(), StubWS(), StubWS(fail=True)
+    hub.subscribe("c1", spanish, "es")
+    hub.subscribe("c1", japanese, "ja")
+    hub.subscribe("c1", dead, "es")
+
+    delivered = await hub.broadcast("c1", {"es": {"t": "hola"}, "ja": {"t": "konnichiwa"}})
+
+    assert delivered == 2
+    assert spanish.sent == [{"t": "hola"}]
+    assert japanese.sent == [{"t": "konnichiwa"}]
+    assert hub.listener_count("c1") == 2
@@ -0,0 +1,49 @@
+from services.language_tracker import LanguageTracker
+
+
+def test_language_is_confirmed_after_consecutive_confident_detections():
+    tracker = LanguageTracker(confirm_chunks=3, min_probability=0.7, recheck_chunks=10)
+
+    for _ in range(2):
+        assert tracker.language_hint() is None
+        tracker.observe("es", 0.9)
+    tracker.observe("es", 0.5)  # low confidence neither confirms nor resets
+    assert tracker.language_hint() is None
+
+    tracker.observe("es", 0.9)
+    assert tracker.confirmed == "es"
+    assert tracker.language_hint() == "es"
+
+
+def test_different_language_restarts_the_streak():
+    tracker = LanguageTracker(confirm_chunks=2, min_probability=0.7)
+    tracker.observe("es", 0.9)
+    tracker.observe("pt", 0.9)
+    assert tracker.confirmed is None
+
+    tracker.observe("pt", 0.9)
+    assert tracker.confirmed == "pt"
+
+
+def test_confirmed_language_is_rechecked_periodically():
+    tracker = LanguageTracker(confirm_chunks=1, min_probability=0.7, recheck_chunks=3)
+    tracker.observe("en", 0.9)
+
+    hints = [tracker.language_hint() for _ in range(3)]
+    assert hints == ["en", "en", None]
+    assert tracker.detections_skipped == 2
+
+    # The recheck hears a different language: detection is used again until it settles.
+    tracker.observe("fr", 0.95)
+    assert tracker.confirmed == "fr"
+
+
+def test_switch_clears_confirmation_until_new_language_is_stable():
+    tracker = LanguageTracker(confirm_chunks=2, min_probability=0.7, recheck_chunks=1)
+    tracker.observe("en", 0.9)
+    tracker.observe("en", 0.9)
+    assert tracker.confirmed == "en"
+
+    tracker.observe("de", 0.9)
+    assert tracker.confirmed is None
+    assert tracker.language_hint() is None
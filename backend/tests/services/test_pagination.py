@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from services.pagination import InvalidCursorError, decode_cursor, encode_cursor, fetch_page
+
+
+class FakeCollection:
+    """Applies the keyset filter, sort and limit that fetch_page sends, in memory."""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        self.query = query
+        return self
+
+    def sort(self, keys):
+        return self
+
+    def limit(self, count):
+        self.count = count
+        return self
+
+    def _matches(self, doc):
+        if "$or" not in self.query:
+            return True
+        older, same_time = self.query["$or"]
+        return doc["timestamp"] < older["timestamp"]["$lt"] or (
+            doc["timestamp"] == same_time["timestamp"] and doc["_id"] < same_time["_id"]["$lt"]
+        )
+
+    async def __aiter__(self):
+        docs = sorted(
+            (doc for doc in self.docs if self._matches(doc)),
+            key=lambda doc: (doc["timestamp"], doc["_id"]),
+            reverse=True,
+        )
+        for doc in docs[: self.count]:
+            yield doc
+
+
+def test_cursor_round_trip():
+    timestamp = datetime(2025, 1, 2, 3, 4, 5, 678000)
+    doc_id = ObjectId()
+
+    assert decode_cursor(encode_cursor(timestamp, doc_id)) == (timestamp, doc_id)
+    assert decode_cursor(encode_cursor(timestamp, "plain-id")) == (timestamp, "plain-id")
+
+
+@pytest.mark.parametrize("cursor", ["", "abc", "e30", "not base64!"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_every_document_once_including_timestamp_ties():
+    start = datetime(2025, 1, 1)
+    # Pairs of documents share a timestamp, so page boundaries fall inside ties.
+    docs = [{"_id": ObjectId(), "timestamp": start + timedelta(seconds=i // 2)} for i in range(7)]
+    collection = FakeCollection(docs)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page, cursor = await fetch_page(collection, {}, "timestamp", 3, cursor)
+        seen.extend(page)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert [doc["_id"] for doc in seen] == [
+        doc["_id"]
+        for doc in sorted(docs, key=lambda doc: (doc["timestamp"], doc["_id"]), reverse=True)
+    ]
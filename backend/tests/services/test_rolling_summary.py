@@ -0,0 +1,174 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from services.rolling_summary import RollingSummarizer
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, keys):
+        self._docs.sort(key=lambda doc: (doc["timestamp"], doc["_id"]))
+        return self
+
+    def limit(self, count):
+        self._docs = self._docs[:count]
+        return self
+
+    async def __aiter__(self):
+        for doc in self._docs:
+            yield doc
+
+
+class FakeTranslations:
+    def __init__(self):
+        self.docs = []
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+
+        def matches(doc):
+            if doc["userId"] != query["userId"]:
+                return False
+            if doc["conversationId"] != query["conversationId"]:
+                return False
+            if doc["timestamp"] > query["timestamp"]["$lte"]:
+                return False
+            if "$or" not in query:
+                return True
+            later, same_time = query["$or"]
+            return doc["timestamp"] > later["timestamp"]["$gt"] or (
+                doc["timestamp"] == same_time["timestamp"] and doc["_id"] > same_time["_id"]["$gt"]
+            )
+
+        return FakeCursor([doc for doc in self.docs if matches(doc)])
+
+
+class FakeStates:
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query):
+        doc = self.docs.get(query["_id"])
+        return dict(doc) if doc else None
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = dict(doc)
+
+
+class FakeDb:
+    def __init__(self):
+        self.translations = FakeTranslations()
+        self.states = FakeStates()
+
+    def get_collection(self, name):
+        return self.translations if name == "translations" else self.states
+
+
+def _log(db, text, when, user="u1", conversation="c1"):
+    db.translations.docs.append(
+        {
+            "_id": ObjectId(),
+            "userId": user,
+            "conversationId": conversation,
+            "original_text": text,
+            "timestamp": when,
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_only_new_segments_are_folded_into_the_summary():
+    db = FakeDb()
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    folds = []
+
+    async def fold(summary, new_text):
+        folds.append((summary, new_text))
+        return f"{summary}|{new_text}" if summary else new_text
+
+    summarizer = RollingSummarizer()
+    _log(db, "Hello.", start)
+    _log(db, "Agenda.", start + timedelta(seconds=1))
+    _log(db, "Someone else's.", start, conversation="other")
+
+    state = await summarizer.refresh(db, "u1", "c1", fold)
+    assert state["summary"] == "Hello.\nAgenda."
+    assert state["segments"] == 2
+
+    # Nothing new: no model call.
+    await summarizer.refresh(db, "u1", "c1", fold)
+    assert len(folds) == 1
+
+    # Same timestamp as the last folded segment still counts as new (the _id breaks ties).
+    _log(db, "Budget.", start + timedelta(seconds=1))
+    state = await summarizer.refresh(db, "u1", "c1", fold)
+    assert folds[-1] == ("Hello.\nAgenda.", "Budget.")
+    assert state["summary"] == "Hello.\nAgenda.|Budget."
+    assert state["segments"] == 3
+
+
+@pytest.mark.asyncio
+async def test_large_backlog_is_folded_in_batches():
+    db = FakeDb()
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    for i in range(5):
+        _log(db, f"Line {i}.", start + timedelta(seconds=i))
+
+    batches = []
+
+    async def fold(summary, new_text):
+        batches.append(new_text.count("\n") + 1)
+        return "summary"
+
+    state = await RollingSummarizer(batch_segments=2).refresh(db, "u1", "c1", fold)
+
+    assert batches == [2, 2, 1]
+    assert state["segments"] == 5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_fold_each_segment_once():
+    db = FakeDb()
+    _log(db, "Hello.", datetime(2025, 1, 1, tzinfo=UTC))
+    folds = []
+
+    async def fold(summary, new_text):
+        folds.append(new_text)
+        await asyncio.sleep(0.01)
+        return "summary"
+
+    summarizer = RollingSummarizer()
+    await asyncio.gather(*(summarizer.refresh(db, "u1", "c1", fold) for _ in range(3)))
+
+    assert folds == ["Hello."]
+
+
+@pytest.mark.asyncio
+async def test_recent_segments_wait_until_they_have_settled():
+    db = FakeDb()
+    now = datetime.now(UTC)
+    folds = []
+
+    async def fold(summary, new_text):
+        folds.append(new_text)
+        return new_text
+
+    summarizer = RollingSummarizer(settle_seconds=60)
+    _log(db, "Settled.", now - timedelta(minutes=5))
+    _log(db, "Just said.", now)
+
+    state = await summarizer.refresh(db, "u1", "c1", fold)
+    assert folds == ["Settled."]
+    assert state["segments"] == 1
+
+    # An older segment whose write landed late is still picked up.
+    _log(db, "Landed late.", now - timedelta(minutes=2))
+    state = await RollingSummarizer(settle_seconds=0).refresh(db, "u1", "c1", fold)
+    assert folds[-1] == "Landed late.\nJust said."
+    assert state["segments"] == 3
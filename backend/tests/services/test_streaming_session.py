@@ -0,0 +1,171 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services.audio_formats import PcmAudio
+from services.streaming_session import StreamingSession
+from services.voice_activity import VoiceActivityGate
+
+SAMPLE_RATE = 16000
+
+
+def _silence(seconds: float) -> bytes:
+    return b"\x00\x00" * int(SAMPLE_RATE * seconds)
+
+
+class StubWS:
+    def __init__(self):
+        self.sent = []
+        self.app = SimpleNamespace(state=SimpleNamespace())
+
+    async def send_json(self, obj):
+        self.sent.append(obj)
+
+
+def _recording_processor(calls):
+    async def process(sink, audio, is_final):
+        assert isinstance(audio, PcmAudio)
+        seconds = audio.duration_seconds
+        calls.append((round(seconds, 2), is_final))
+        await sink.send_json({"original_text": f"{seconds:.2f}s"})
+
+    return process
+
+
+@pytest.mark.asyncio
+async def test_interim_hypotheses_then_final_on_max_segment():
+    ws = StubWS()
+    calls = []
+    session = StreamingSession(
+        ws,
+        _recording_processor(calls),
+        sample_rate=SAMPLE_RATE,
+        interim_interval_seconds=1.0,
+        max_segment_seconds=2.0,
+    )
+    session.start()
+    for _ in range(5):  # 5 x 0.5 s frames, letting the worker run between frames
+        session.feed(_silence(0.5))
+        await asyncio.sleep(0)
+    await session.close()
+
+    assert calls == [(1.0, False), (2.0, True), (0.5, True)]
+    assert [(m["type"], m["segment_id"]) for m in ws.sent] == [
+        ("interim", 0),
+        ("final", 0),
+        ("final", 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_end_of_segment_finalizes_early():
+    ws = StubWS()
+    calls = []
+    session = StreamingSession(ws, _recording_processor(calls), sample_rate=SAMPLE_RATE)
+    session.start()
+    session.feed(_silence(0.4))
+    session.feed(_silence(0.4), end_of_segment=True)
+    await session.close()
+
+    assert calls == [(0.8, True)]
+    assert ws.sent[0]["type"] == "final"
+
+
+@pytest.mark.asyncio
+async def test_stale_interim_is_skipped_after_segment_is_finalized():
+    ws = StubWS()
+    calls = []
+    session = StreamingSession(
+        ws,
+        _recording_processor(calls),
+        sample_rate=SAMPLE_RATE,
+        interim_interval_seconds=0.5,
+        max_segment_seconds=10.0,
+    )
+    # Queue an interim and then finalize before the worker gets to run.
+    session.feed(_silence(0.5))
+    session.feed(_silence(0.5), end_of_segment=True)
+    session.start()
+    await session.close()
+
+    assert calls == [(1.0, True)]
+
+
+@pytest.mark.asyncio
+async def test_close_drops_tiny_trailing_audio():
+    ws = StubWS()
+    calls = []
+    session = StreamingSession(ws, _recording_processor(calls), sample_rate=SAMPLE_RATE)
+    session.start()
+    session.feed(_silence(0.1))
+    await session.close()
+
+    assert calls == []
+    assert ws.sent == []
+
+
+@pytest.mark.asyncio
+async def test_float32_frames_are_measured_by_their_sample_width():
+    ws = StubWS()
+    calls = []
+    session = StreamingSession(
+        ws, _recording_processor(calls), sample_rate=SAMPLE_RATE, encoding="pcm_f32le"
+    )
+    session.start()
+    session.feed(b"\x00" * 4 * SAMPLE_RATE, end_of_segment=True)  # 1 s of float32
+    await session.close()
+
+    assert calls == [(1.0, True)]
+
+
+def test_unsupported_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        StreamingSession(StubWS(), _recording_processor([]), SAMPLE_RATE, encoding="mp3")
+
+
+def _tone(seconds: float) -> bytes:
+    return (b"\x40\x1f" + b"\xc0\xe0") * int(SAMPLE_RATE * seconds / 2)  # +/-8000
+
+
+@pytest.mark.asyncio
+async def test_gate_drops_silent_segments_and_skips_their_interims():
+    ws = StubWS()
+    calls = []
+    session = StreamingSession(
+        ws,
+        _recording_processor(calls),
+        sample_rate=SAMPLE_RATE,
+        interim_interval_seconds=0.5,
+        gate=VoiceActivityGate(enabled=True),
+    )
+    session.start()
+    for _ in range(3):
+        session.feed(_silence(0.5))
+        await asyncio.sleep(0)
+    await session.close()
+
+    assert calls == []
+    assert ws.sent == []
+
+
+@pytest.mark.asyncio
+async def test_gate_ends_segment_after_trailing_silence():
+    ws = StubWS()
+    calls = []
+    session = StreamingSession(
+        ws,
+        _recording_processor(calls),
+        sample_rate=SAMPLE_RATE,
+        interim_interval_seconds=10.0,
+        gate=VoiceActivityGate(enabled=True, padding_seconds=0.0),
+    )
+    session.start()
+    session.feed(_tone(1.0))
+    session.feed(_silence(0.6))  # endpoint: silence after speech closes the segment
+    await asyncio.sleep(0)
+    assert session.buffered_seconds == 0
+    await session.close()
+
+    [(seconds, is_final)] = calls
+    assert is_final and seconds == pytest.approx(1.0, abs=0.03)
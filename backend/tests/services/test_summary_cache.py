@@ -0,0 +1,57 @@
+import pytest
+
+from services.summary_cache import SummaryCache, summary_cache_key
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = {}
+        self.finds = 0
+
+    async def find_one(self, query, projection=None):
+        self.finds += 1
+        return self.docs.get(query["_id"])
+
+    async def update_one(self, query, update, upsert=False):
+        self.docs[query["_id"]] = {"_id": query["_id"], **update["$set"]}
+
+
+def test_key_ignores_whitespace_but_not_length_or_model():
+    key = summary_cache_key("Hello  world\n", "short", "phi3:mini")
+
+    assert key == summary_cache_key(" Hello world", "short", "phi3:mini")
+    assert key != summary_cache_key("Hello world", "long", "phi3:mini")
+    assert key != summary_cache_key("Hello world", "short", "llama3")
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_serves_other_instances_and_fills_memory():
+    collection = FakeCollection()
+    writer, reader = SummaryCache(), SummaryCache()
+    writer.start(collection)
+    reader.start(collection)
+
+    await writer.put("k", "A summary.", "short")
+
+    assert await reader.get("k") == "A summary."
+    assert await reader.get("k") == "A summary."
+    assert collection.finds == 1
+    assert reader.stats()["shared_hits"] == 1
+    assert collection.docs["k"]["length"] == "short"
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_failures_are_misses():
+    class BrokenCollection:
+        async def find_one(self, *args, **kwargs):
+            raise RuntimeError("down")
+
+        async def update_one(self, *args, **kwargs):
+            raise RuntimeError("down")
+
+    cache = SummaryCache()
+    cache.start(BrokenCollection())
+
+    assert await cache.get("k") is None
+    await cache.put("k", "A summary.", "short")
+    assert await cache.get("k") == "A summary."
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 import pytest
 
-from services.transcript_service import fetch_transcripts
+from services.transcript_service import fetch_conversation_text, fetch_transcripts
 
 
 class FakeDB:
@@ -17,7 +17,7 @@ class FakeCollection:
     def __init__(self, documents):
         self._documents = documents
 
-    def find(self, query):
+    def find(self, query, projection=None):
         docs = list(self._documents)
 
         if "timestamp" in query:
@@ -28,6 +28,9 @@ class FakeCollection:
         if "userId" in query:
             docs = [doc for doc in docs if doc.get("userId") == query["userId"]]
 
+        if "conversationId" in query:
+            docs = [doc for doc in docs if doc.get("conversationId") == query["conversationId"]]
+
         return AsyncCursor(docs)
 
 
@@ -86,4 +89,41 @@ async def test_fetch_transcripts_applies_filters():
     )
 
     assert len(result) == 1
-    assert result[0]["userId"] == "alice"
\ No newline at end of file
+    assert result[0]["userId"] == "alice"
+
+
+@pytest.mark.asyncio
+async def test_fetch_conversation_text_keeps_latest_segments_within_budget():
+    now = datetime.utcnow()
+    docs = [
+        {"timestamp": now - timedelta(seconds=3), "userId": "u1", "conversationId": "c1",
+         "original_text": "first"},
+        {"timestamp": now - timedelta(seconds=2), "userId": "u1", "conversationId": "c1",
+         "original_text": "second"},
+        {"timestamp": now - timedelta(seconds=1), "userId": "u1", "conversationId": "c1",
+         "original_text": "third"},
+        {"timestamp": now, "userId": "u1", "conversationId": "other",
+         "original_text": "elsewhere"},
+    ]
+    db = FakeDB(docs)
+
+    text, segments = await fetch_conversation_text(
+        db, user_id="u1", conversation_id="c1", max_chars=13
+    )
+
+    assert (text, segments) == ("second\nthird", 2)
+
+
+@pytest.mark.asyncio
+async def test_fetch_conversation_text_cuts_an_overlong_latest_segment():
+    docs = [
+        {"timestamp": datetime.utcnow(), "userId": "u1", "conversationId": "c1",
+         "original_text": "a very long sentence"},
+    ]
+    db = FakeDB(docs)
+
+    text, segments = await fetch_conversation_text(
+        db, user_id="u1", conversation_id="c1", max_chars=8
+    )
+
+    assert (text, segments) == ("sentence", 1)
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from services.transcript_stitcher import TranscriptStitcher, overlap_length
+
+
+def _words(*spec):
+    return [{"word": f" {word}", "start": start, "end": end} for word, start, end in spec]
+
+
+def test_overlap_length_finds_longest_suffix_prefix_match():
+    assert overlap_length(["the", "quick", "brown"], ["quick", "brown", "fox"]) == 2
+    assert overlap_length(["the", "quick"], ["lazy", "dog"]) == 0
+
+
+def test_overlap_length_tolerates_words_cut_at_the_chunk_boundary():
+    # "bro" was cut at the end of the previous chunk, "ick" at the start of the new one.
+    assert overlap_length(["the", "quick", "bro"], ["ick", "brown", "fox"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_repeated_words_in_the_overlap_are_removed():
+    stitcher = TranscriptStitcher(overlap_seconds=0.5)
+    first, second = stitcher.ticket(2.0), stitcher.ticket(2.0)
+
+    text = await first.stitch(
+        "I am here.", _words(("I", 0.5, 0.7), ("am", 1.2, 1.5), ("here.", 1.6, 1.9))
+    )
+    assert text == "I am here."
+
+    text = await second.stitch(
+        "Here we go.", _words(("Here", 0.0, 0.3), ("we", 0.6, 0.8), ("go.", 0.9, 1.2))
+    )
+    assert text == "we go."
+    assert stitcher.words_deduplicated == 1
+
+
+@pytest.mark.asyncio
+async def test_matching_words_outside_the_overlap_window_are_kept():
+    stitcher = TranscriptStitcher(overlap_seconds=0.5)
+    first, second = stitcher.ticket(2.0), stitcher.ticket(2.0)
+    await first.stitch("go", _words(("go", 1.7, 1.9)))
+
+    text = await second.stitch("wait go", _words(("wait", 0.0, 0.4), ("go", 1.0, 1.2)))
+    assert text == "wait go"
+
+
+@pytest.mark.asyncio
+async def test_leading_trim_offset_is_applied_to_word_timestamps():
+    stitcher = TranscriptStitcher(overlap_seconds=0.5)
+    first = stitcher.ticket(2.0, leading_offset=1.0)  # words relative to audio after 1.0 s
+    second = stitcher.ticket(2.0)
+    await first.stitch("hello", _words(("hello", 0.6, 0.9)))
+
+    assert (
+        await second.stitch("hello there", _words(("hello", 0.0, 0.3), ("there", 0.5, 0.8)))
+        == "there"
+    )
+
+
+@pytest.mark.asyncio
+async def test_stitching_waits_for_the_previous_chunk():
+    stitcher = TranscriptStitcher(overlap_seconds=0.5)
+    first, second = stitcher.ticket(1.0), stitcher.ticket(1.0)
+
+    later = asyncio.ensure_future(
+        second.stitch("yes sir", _words(("yes", 0.0, 0.3), ("sir", 0.4, 0.6)))
+    )
+    await asyncio.sleep(0)
+    assert not later.done()
+
+    await first.stitch("yes", _words(("yes", 0.7, 0.95)))
+    assert await later == "sir"
+
+
+@pytest.mark.asyncio
+async def test_unresolved_previous_chunk_disables_deduplication():
+    stitcher = TranscriptStitcher(overlap_seconds=0.5)
+    dropped, current = stitcher.ticket(1.0), stitcher.ticket(1.0)
+    dropped.resolve(None)
+
+    assert await current.stitch("yes", _words(("yes", 0.0, 0.3))) == "yes"
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from services.translation_log_writer import TranslationLogWriter
+
+
+class FakeCollection:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    async def insert_many(self, documents, ordered=True):
+        assert ordered is False
+        if self.fail:
+            raise RuntimeError("mongo unavailable")
+        self.batches.append(list(documents))
+
+
+@pytest.mark.asyncio
+async def test_writes_full_batches_without_waiting_for_the_interval():
+    collection = FakeCollection()
+    writer = TranslationLogWriter(batch_size=3, flush_interval_seconds=60, max_buffered=100)
+    writer.start(collection)
+
+    for i in range(6):
+        await writer.enqueue({"n": i})
+    for _ in range(20):
+        if len(collection.batches) == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    assert [[d["n"] for d in batch] for batch in collection.batches] == [[0, 1, 2], [3, 4, 5]]
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_writes_partial_batch_after_flush_interval():
+    collection = FakeCollection()
+    writer = TranslationLogWriter(batch_size=100, flush_interval_seconds=0.05, max_buffered=100)
+    writer.start(collection)
+
+    await writer.enqueue({"n": 1})
+    await asyncio.sleep(0.2)
+
+    assert collection.batches == [[{"n": 1}]]
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_close_drains_the_buffer():
+    collection = FakeCollection()
+    writer = TranslationLogWriter(batch_size=2, flush_interval_seconds=60, max_buffered=100)
+    writer.start(collection)
+
+    for i in range(5):
+        await writer.enqueue({"n": i})
+    await writer.close()
+
+    assert sum(len(batch) for batch in collection.batches) == 5
+    assert writer.written == 5
+    assert not writer.running
+
+
+@pytest.mark.asyncio
+async def test_enqueue_waits_when_buffer_is_full():
+    release = asyncio.Event()
+
+    class SlowCollection(FakeCollection):
+        async def insert_many(self, documents, ordered=True):
+            await release.wait()
+            await super().insert_many(documents, ordered)
+
+    collection = SlowCollection()
+    writer = TranslationLogWriter(batch_size=1, flush_interval_seconds=0, max_buffered=1)
+    writer.start(collection)
+
+    await writer.enqueue({"n": 0})  # taken by the writer, which blocks on the insert
+    await asyncio.sleep(0.01)
+    await writer.enqueue({"n": 1})  # fills the buffer
+    blocked = asyncio.create_task(writer.enqueue({"n": 2}))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    release.set()
+    await asyncio.wait_for(blocked, timeout=1)
+    await writer.close()
+    assert writer.written == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_counted_and_writer_keeps_running():
+    collection = FakeCollection(fail=True)
+    writer = TranslationLogWriter(batch_size=2, flush_interval_seconds=60, max_buffered=100)
+    writer.start(collection)
+
+    for i in range(2):
+        await writer.enqueue({"n": i})
+    await asyncio.sleep(0.01)
+    collection.fail = False
+    await writer.enqueue({"n": 2})
+    await writer.close()
+
+    assert writer.failed == 2
+    assert writer.written == 1
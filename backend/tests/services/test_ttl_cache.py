@@ -0,0 +1,44 @@
+from services import ttl_cache
+from services.ttl_cache import TTLCache
+
+
+def test_get_returns_value_until_it_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    cache = TTLCache(max_entries=10, ttl_seconds=5)
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    now[0] += 5
+    assert cache.get("a") is None
+    assert cache.stats() == {"entries": 0, "hits": 1, "misses": 1}
+
+
+def test_entry_lifetime_can_be_shortened_but_not_extended(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    cache = TTLCache(max_entries=10, ttl_seconds=5)
+
+    cache.set("short", 1, ttl_seconds=1)
+    cache.set("long", 2, ttl_seconds=60)
+    cache.set("expired", 3, ttl_seconds=-1)
+    now[0] = 2
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert cache.get("expired") is None
+    now[0] = 5
+    assert cache.get("long") is None
+
+
+def test_least_recently_used_entry_is_evicted_and_invalidate_removes():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert len(cache) == 1
@@ -0,0 +1,60 @@
+import pytest
+
+from services.user_connections import UserConnections
+
+
+class FakeWebSocket:
+    def __init__(self, fail=False):
+        self.sent = []
+        self.fail = fail
+
+    async def send_json(self, message):
+        if self.fail:
+            raise RuntimeError("closed")
+        self.sent.append(message)
+
+
+@pytest.mark.asyncio
+async def test_send_to_user_reaches_only_that_users_connections():
+    connections = UserConnections()
+    phone, headset, other = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    connections.register("u1", phone)
+    connections.register("u1", headset)
+    connections.register("u2", other)
+
+    assert await connections.send_to_user("u1", {"type": "ping"}) == 2
+    assert phone.sent == headset.sent == [{"type": "ping"}]
+    assert other.sent == []
+    assert await connections.send_to_user("nobody", {"type": "ping"}) == 0
+
+
+@pytest.mark.asyncio
+async def test_unreachable_connections_are_unregistered():
+    connections = UserConnections()
+    alive, dead = FakeWebSocket(), FakeWebSocket(fail=True)
+    connections.register("u1", alive)
+    connections.register("u1", dead)
+
+    assert await connections.send_to_user("u1", {"type": "ping"}) == 1
+    assert connections.connection_count("u1") == 1
+
+    connections.unregister("u1", alive)
+    assert connections.connection_count("u1") == 0
+
+
+@pytest.mark.asyncio
+async def test_stalled_connections_time_out_and_are_unregistered():
+    import asyncio
+
+    class StalledWebSocket(FakeWebSocket):
+        async def send_json(self, message):
+            await asyncio.sleep(10)
+
+    connections = UserConnections(push_timeout_seconds=0.01)
+    alive, stalled = FakeWebSocket(), StalledWebSocket()
+    connections.register("u1", alive)
+    connections.register("u1", stalled)
+
+    assert await asyncio.wait_for(connections.send_to_user("u1", {"type": "ping"}), 1) == 1
+    assert alive.sent == [{"type": "ping"}]
+    assert connections.connection_count("u1") == 1
@@ -1,3 +1,5 @@
+from types import SimpleNamespace
+
 import pytest
 from bson import ObjectId
 
@@ -17,6 +19,9 @@ class MockUserCollection:
 
     async def find_one(self, query: dict):
         """Simulates finding a document."""
+        if "_id" in query:
+            matches = [doc for doc in self._data.values() if doc["_id"] == query["_id"]]
+            return matches[0].copy() if matches else None
         google_id = query.get("googleId")
         # Return a copy to prevent tests from modifying the mock's internal state
         return self._data.get(google_id, {}).copy() or None
@@ -33,6 +38,12 @@ class MockUserCollection:
         doc_with_id = {"_id": ObjectId(), **doc}
         self._data[google_id] = doc_with_id
 
+    async def update_one(self, query: dict, update: dict):
+        """Simulates a `$set` update of the document with the given _id."""
+        for doc in self._data.values():
+            if doc["_id"] == query["_id"]:
+                doc.update(update["$set"])
+
     def reset(self):
         """Resets the mock's state between tests."""
         self._data = {}
@@ -64,7 +75,7 @@ async def test_get_or_create_user_returns_existing_user(mock_users_collection):
     result = await get_or_create_user_by_google_id(
         users_collection=mock_users_collection,
         google_id=existing_user_google_id,
-        email="irrelevant@email.com",  # Email should be ignored if user exists
+        email="existing@test.com",
     )
 
     # Assert: Check that the correct user was returned and no new user was created
@@ -128,3 +139,58 @@ async def test_get_or_create_user_handles_db_error_on_create(mock_users_collecti
 
     # Assert: The function should return None as it failed to create the user
     assert result is None
+
+
+async def test_get_or_create_user_returns_user_created_concurrently(mock_users_collection):
+    """
+    Tests that losing an insert race against the unique googleId index returns the user
+    created by the other request instead of failing.
+    """
+    from pymongo.errors import DuplicateKeyError
+
+    winner = {"_id": ObjectId(), "googleId": "race_id", "email": "race@email.com"}
+
+    async def racing_insert(doc):
+        mock_users_collection._data["race_id"] = winner
+        raise DuplicateKeyError("E11000 duplicate key error")
+
+    mock_users_collection.insert_one = racing_insert
+
+    result = await get_or_create_user_by_google_id(
+        users_collection=mock_users_collection,
+        google_id="race_id",
+        email="race@email.com",
+    )
+
+    assert result["_id"] == winner["_id"]
+
+
+async def test_login_with_a_new_email_updates_the_user_and_its_cached_copy(mock_users_collection):
+    """
+    Tests that when Google reports a different email for an existing user, the stored
+    user is updated and authenticated requests see it right away, not after the cache TTL.
+    """
+    from security import auth
+
+    user_id = ObjectId()
+    mock_users_collection._data["moved_id"] = {
+        "_id": user_id,
+        "googleId": "moved_id",
+        "email": "old@test.com",
+    }
+    request = SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(db={auth.USERS_COLLECTION: mock_users_collection})
+        )
+    )
+    assert (await auth._load_user(request, str(user_id)))["email"] == "old@test.com"
+
+    result = await get_or_create_user_by_google_id(
+        users_collection=mock_users_collection,
+        google_id="moved_id",
+        email="new@test.com",
+    )
+
+    assert result["email"] == "new@test.com"
+    assert mock_users_collection._data["moved_id"]["email"] == "new@test.com"
+    assert (await auth._load_user(request, str(user_id)))["email"] == "new@test.com"
@@ -0,0 +1,78 @@
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from services.audio_formats import PcmAudio
+from services.voice_activity import VoiceActivityGate
+
+SAMPLE_RATE = 16000
+
+
+def _samples(silence_before: float, speech: float, silence_after: float) -> np.ndarray:
+    t = np.arange(int(SAMPLE_RATE * speech)) / SAMPLE_RATE
+    tone = (0.3 * np.sin(2 * np.pi * 220 * t) * 32767).astype("<i2")
+    return np.concatenate(
+        [
+            np.zeros(int(SAMPLE_RATE * silence_before), dtype="<i2"),
+            tone,
+            np.zeros(int(SAMPLE_RATE * silence_after), dtype="<i2"),
+        ]
+    )
+
+
+def _pcm(*segments: float) -> PcmAudio:
+    return PcmAudio(_samples(*segments).tobytes(), "pcm_s16le", SAMPLE_RATE)
+
+
+def _wav(*segments: float) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(_samples(*segments).tobytes())
+    return buffer.getvalue()
+
+
+def test_silent_chunk_is_skipped_and_counted():
+    gate = VoiceActivityGate(enabled=True)
+    audio, offset = gate.apply(_pcm(1.0, 0.0, 0.0))
+
+    assert audio is None and offset == 0.0
+    assert gate.stats()["chunks_skipped"] == 1
+    assert gate.stats()["seconds_skipped"] == pytest.approx(1.0)
+
+
+def test_pcm_speech_is_trimmed_with_padding():
+    gate = VoiceActivityGate(enabled=True, padding_seconds=0.3)
+    audio, offset = gate.apply(_pcm(1.0, 1.0, 1.0))
+
+    assert isinstance(audio, PcmAudio)
+    assert offset == pytest.approx(0.7, abs=0.03)
+    assert audio.duration_seconds == pytest.approx(1.6, abs=0.06)
+    assert gate.stats()["seconds_trimmed"] == pytest.approx(1.4, abs=0.06)
+
+
+def test_wav_speech_is_trimmed_and_stays_a_valid_wav():
+    gate = VoiceActivityGate(enabled=True, padding_seconds=0.0)
+    audio, offset = gate.apply(_wav(0.5, 0.5, 0.0))
+
+    with wave.open(io.BytesIO(audio)) as wav_file:
+        seconds = wav_file.getnframes() / wav_file.getframerate()
+    assert seconds == pytest.approx(0.5, abs=0.03)
+    assert offset == pytest.approx(0.5, abs=0.03)
+
+
+def test_uninspectable_audio_passes_through():
+    gate = VoiceActivityGate(enabled=True)
+    assert gate.apply(b"not a wav") == (b"not a wav", 0.0)
+    assert gate.has_speech(b"not a wav")
+
+
+def test_disabled_gate_passes_everything():
+    gate = VoiceActivityGate(enabled=False)
+    silence = _pcm(1.0, 0.0, 0.0)
+    assert gate.apply(silence) == (silence, 0.0)
+    assert gate.stats()["chunks_total"] == 0
@@ -2,10 +2,16 @@ import asyncio
 import io
 import logging
 import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, File, HTTPException, UploadFile
-from faster_whisper import WhisperModel
+import numpy as np
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from faster_whisper.audio import decode_audio
+from faster_whisper.vad import VadOptions, get_speech_timestamps
 
 # --- Logging Configuration ---
 logging.basicConfig(level=logging.INFO, format="%(name)s - %(levelname)s - %(message)s")
@@ -16,22 +22,429 @@ MODEL_SIZE = "base"
 DEVICE = os.getenv("STT_DEVICE", "cpu")
 COMPUTE_TYPE = "int8" if DEVICE == "cpu" else "auto"
 
+# Requests that arrive within BATCH_MAX_WAIT_MS of each other are transcribed together in
+# one batched decode. A max batch size of 1 turns batching off.
+BATCH_MAX_SIZE = int(os.getenv("STT_BATCH_MAX_SIZE", "8"))
+BATCH_MAX_WAIT_MS = float(os.getenv("STT_BATCH_MAX_WAIT_MS", "25"))
+
+
+def _available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# Inference runs on a dedicated pool of INFERENCE_WORKERS threads (faster-whisper's
+# `num_workers`), each allowed CPU_THREADS_PER_WORKER threads of its own. Requests beyond
+# MAX_QUEUED_REQUESTS waiting for a worker are rejected straight away with a 503.
+CPU_CORES = _available_cores()
+INFERENCE_WORKERS = int(os.getenv("STT_INFERENCE_WORKERS", str(max(1, CPU_CORES // 4))))
+CPU_THREADS_PER_WORKER = int(
+    os.getenv("STT_CPU_THREADS", str(max(1, CPU_CORES // INFERENCE_WORKERS)))
+)
+MAX_QUEUED_REQUESTS = int(os.getenv("STT_MAX_QUEUED_REQUESTS", "32"))
+RETRY_AFTER_SECONDS = int(os.getenv("STT_RETRY_AFTER_SECONDS", "2"))
+
+# Optional per-speaker sessions (`session_id`): keep the detected language and the tail of
+# the previous transcription as Whisper's `initial_prompt`. Idle sessions expire. Callers
+# that track the language themselves send `detect_language` when they want a real detection.
+SESSION_MAX_ENTRIES = int(os.getenv("STT_SESSION_MAX_ENTRIES", "1000"))
+SESSION_TTL_SECONDS = float(os.getenv("STT_SESSION_TTL_SECONDS", "300"))
+SESSION_PROMPT_CHARS = int(os.getenv("STT_SESSION_PROMPT_CHARS", "200"))
+SESSION_LANGUAGE_PROBABILITY = float(os.getenv("STT_SESSION_LANGUAGE_PROBABILITY", "0.8"))
+SESSION_REDETECT_CHUNKS = int(os.getenv("STT_SESSION_REDETECT_CHUNKS", "10"))
+
+SAMPLE_RATE = 16000
+MAX_BATCHED_AUDIO_SECONDS = 30.0  # One Whisper window; longer audio is transcribed alone.
+NO_SPEECH_THRESHOLD = 0.6
+
+# Raw PCM uploads: little-endian mono samples, described by the `encoding` query parameter.
+PCM_DTYPES = {"pcm_s16le": np.dtype("<i2"), "pcm_f32le": np.dtype("<f4")}
+MIN_PCM_SAMPLE_RATE = 8000
+MAX_PCM_SAMPLE_RATE = 192000
+
 ml_models = {}
 
 
+def pcm_to_float32(data: bytes, encoding: str, sample_rate: int) -> np.ndarray:
+    """
+    Converts raw little-endian PCM to the 16 kHz float32 array Whisper expects.
+
+    float32 input is viewed in place (no copy); int16 input is converted and scaled in a
+    single float32 buffer. Resampling is vectorized: integer ratios (e.g. 48 kHz -> 16 kHz)
+    average each group of samples, which also acts as a simple anti-aliasing filter, and
+    any other ratio uses linear interpolation.
+    """
+    dtype = PCM_DTYPES[encoding]
+    audio = np.frombuffer(data, dtype=dtype)
+    if dtype.kind == "i":
+        audio = audio.astype(np.float32)
+        audio *= 1.0 / 32768.0
+
+    if sample_rate == SAMPLE_RATE:
+        return audio
+    if sample_rate % SAMPLE_RATE == 0:
+        factor = sample_rate // SAMPLE_RATE
+        usable = audio.shape[0] - audio.shape[0] % factor
+        return audio[:usable].reshape(-1, factor).mean(axis=1, dtype=np.float32)
+
+    target_length = int(audio.shape[0] * SAMPLE_RATE / sample_rate)
+    positions = np.arange(target_length) * (sample_rate / SAMPLE_RATE)
+    return np.interp(positions, np.arange(audio.shape[0]), audio).astype(np.float32)
+
+
+def _segments_to_result(segments, offset: float = 0.0) -> dict:
+    """
+    Joins segment text and collects word timestamps, relative to the start of the request's
+    audio (`offset` is where that audio starts in the decoded input).
+    """
+    transcription_parts = []
+    words = []
+    for segment in segments:
+        if segment.no_speech_prob >= NO_SPEECH_THRESHOLD:
+            continue
+        transcription_parts.append(segment.text)
+        for word in segment.words or []:
+            words.append(
+                {
+                    "word": word.word,
+                    "start": round(max(0.0, word.start - offset), 2),
+                    "end": round(max(0.0, word.end - offset), 2),
+                    "probability": round(word.probability, 3),
+                }
+            )
+    return {"transcription": "".join(transcription_parts).strip(), "words": words}
+
+
+class TranscriptionSession:
+    """What the STT service remembers about one speaker between requests."""
+
+    def __init__(self):
+        self.language: str | None = None
+        self.prompt: str | None = None
+        self.chunks_since_detection = 0
+        self.last_used = time.monotonic()
+
+    def language_hint(self) -> str | None:
+        """The sticky language, or None every SESSION_REDETECT_CHUNKS chunks to re-detect."""
+        if self.language is None:
+            return None
+        self.chunks_since_detection += 1
+        if self.chunks_since_detection >= SESSION_REDETECT_CHUNKS:
+            return None
+        return self.language
+
+    def update(self, result: dict) -> None:
+        if result.get("language_detected"):
+            self.chunks_since_detection = 0
+            if result["language_probability"] >= SESSION_LANGUAGE_PROBABILITY:
+                self.language = result["detected_language"]
+        text = result.get("transcription", "")
+        if text:
+            self.prompt = text[-SESSION_PROMPT_CHARS:]
+
+
+class SessionStore:
+    """LRU map of session id to `TranscriptionSession`, dropping sessions idle past the TTL."""
+
+    def __init__(
+        self, max_entries: int = SESSION_MAX_ENTRIES, ttl_seconds: float = SESSION_TTL_SECONDS
+    ):
+        self._sessions: OrderedDict[str, TranscriptionSession] = OrderedDict()
+        self._max_entries = max(1, max_entries)
+        self._ttl_seconds = ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> TranscriptionSession:
+        now = time.monotonic()
+        # Sessions are ordered by last use, so expired ones are at the front.
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_used < self._ttl_seconds:
+                break
+            self._sessions.popitem(last=False)
+
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = TranscriptionSession()
+            if len(self._sessions) > self._max_entries:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_used = now
+        return session
+
+
+sessions = SessionStore()
+
+
+class SchedulerFull(Exception):
+    """Raised when the inference queue is full and a request should be retried later."""
+
+
+class InferenceScheduler:
+    """
+    Central queue in front of the Whisper model.
+
+    Requests are decoded to 16 kHz float32 arrays and queued. The scheduler takes the first
+    waiting request, keeps collecting for up to `max_wait_seconds` (or until `max_batch_size`
+    requests are waiting), and transcribes the whole group with faster-whisper's batched
+    pipeline: one encoder/decoder pass per detected language instead of one per request.
+
+    Requests may name their `language` (a client that has already confirmed it), which
+    skips Whisper's language detection pass for them, and an `initial_prompt`. Prompts are
+    used when a request is decoded on its own; a batched call can only take one prompt,
+    so requests that end up batched with others are decoded without theirs.
+
+    Batches run on a dedicated pool of `workers` threads, and at most `max_queued` requests
+    may wait for a worker; beyond that `transcribe` raises `SchedulerFull`.
+    """
+
+    def __init__(
+        self,
+        model: WhisperModel,
+        max_batch_size: int,
+        max_wait_seconds: float,
+        workers: int = 1,
+        max_queued: int = MAX_QUEUED_REQUESTS,
+    ):
+        self._model = model
+        self._pipeline = BatchedInferencePipeline(model=model)
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait_seconds = max_wait_seconds
+        self._workers = max(1, workers)
+        self._max_queued = max(1, max_queued)
+        self._queue: asyncio.Queue[tuple[np.ndarray, str | None, str | None, asyncio.Future]] = (
+            asyncio.Queue()
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._workers, thread_name_prefix="whisper-inference"
+        )
+        self._slots: asyncio.Semaphore | None = None
+        self._batches: set[asyncio.Task] = set()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def is_full(self) -> bool:
+        return self._queue.qsize() >= self._max_queued
+
+    def start(self) -> None:
+        self._slots = asyncio.Semaphore(self._workers)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+    async def transcribe(
+        self, audio: np.ndarray, language: str | None = None, initial_prompt: str | None = None
+    ) -> dict:
+        if self.is_full:
+            raise SchedulerFull()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((audio, language, initial_prompt, future))
+        return await future
+
+    async def _collect_batch(
+        self,
+    ) -> list[tuple[np.ndarray, str | None, str | None, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._max_wait_seconds
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            # Only start collecting the next batch once a worker is free, so requests keep
+            # waiting (and batching up) in the queue rather than piling up on the pool.
+            await self._slots.acquire()
+            try:
+                batch = await self._collect_batch()
+            except BaseException:
+                self._slots.release()
+                raise
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(
+        self, batch: list[tuple[np.ndarray, str | None, str | None, asyncio.Future]]
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        audios = [audio for audio, _, _, _ in batch]
+        languages = [language for _, language, _, _ in batch]
+        prompts = [prompt for _, _, prompt, _ in batch]
+        try:
+            results = await loop.run_in_executor(
+                self._executor, self.transcribe_batch, audios, languages, prompts
+            )
+        except Exception as e:
+            logger.error("Batched transcription failed: %s", e, exc_info=True)
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+        for (_, _, _, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+    def transcribe_batch(
+        self,
+        audios: list[np.ndarray],
+        languages: list[str | None] | None = None,
+        prompts: list[str | None] | None = None,
+    ) -> list[dict]:
+        """Transcribes a group of requests. Runs on an executor thread."""
+        languages = languages or [None] * len(audios)
+        prompts = prompts or [None] * len(audios)
+        if len(audios) == 1:
+            return [self._transcribe_single(audios[0], languages[0], prompts[0])]
+
+        results: list[dict | None] = [None] * len(audios)
+        groups: dict[str, list[int]] = {}
+        vad_options = VadOptions(max_speech_duration_s=MAX_BATCHED_AUDIO_SECONDS)
+        for index, (audio, language) in enumerate(zip(audios, languages, strict=True)):
+            duration = audio.shape[0] / SAMPLE_RATE
+            if duration > MAX_BATCHED_AUDIO_SECONDS:
+                results[index] = self._transcribe_single(audio, language, prompts[index])
+                continue
+            language_detected = language is None
+            if language is not None:
+                language_probability = 1.0
+            else:
+                language, language_probability, _ = self._model.detect_language(audio=audio)
+            results[index] = {
+                "transcription": "",
+                "words": [],
+                "detected_language": language,
+                "language_probability": language_probability,
+                "language_detected": language_detected,
+            }
+            # Chunks without any speech never reach the decoder, like vad_filter=True.
+            if get_speech_timestamps(audio, vad_options):
+                groups.setdefault(language, []).append(index)
+
+        for language, indices in groups.items():
+            # A lone request in its language group can still use its own prompt.
+            prompt = prompts[indices[0]] if len(indices) == 1 else None
+            transcripts = self._transcribe_group([audios[i] for i in indices], language, prompt)
+            for index, transcript in zip(indices, transcripts, strict=True):
+                results[index].update(transcript)
+
+        logger.info(
+            "Transcribed a batch of %d requests in %d language group(s).", len(audios), len(groups)
+        )
+        return results
+
+    def _transcribe_single(
+        self, audio: np.ndarray, language: str | None = None, initial_prompt: str | None = None
+    ) -> dict:
+        segments, info = self._model.transcribe(
+            audio,
+            language=language,
+            initial_prompt=initial_prompt,
+            vad_filter=True,
+            word_timestamps=True,
+        )
+        return {
+            **_segments_to_result(segments),
+            "detected_language": info.language,
+            "language_probability": info.language_probability,
+            "language_detected": language is None,
+        }
+
+    def _transcribe_group(
+        self, audios: list[np.ndarray], language: str, initial_prompt: str | None = None
+    ) -> list[dict]:
+        """
+        Decodes several same-language clips in one batched call. The clips are laid end to
+        end and passed as `clip_timestamps`, so each one becomes its own batch item; the
+        segment start times tell us which request each segment belongs to.
+        """
+        offsets = np.cumsum([0] + [audio.shape[0] for audio in audios]) / SAMPLE_RATE
+        clips = [
+            {"start": float(start), "end": float(end)}
+            for start, end in zip(offsets[:-1], offsets[1:], strict=True)
+        ]
+        segments, _ = self._pipeline.transcribe(
+            np.concatenate(audios),
+            language=language,
+            clip_timestamps=clips,
+            batch_size=len(audios),
+            word_timestamps=True,
+            initial_prompt=initial_prompt,
+        )
+
+        parts: list[list] = [[] for _ in audios]
+        for segment in segments:
+            index = int(np.searchsorted(offsets, segment.start + 1e-3, side="right")) - 1
+            parts[min(max(index, 0), len(audios) - 1)].append(segment)
+        return [
+            _segments_to_result(segment_list, float(offset))
+            for segment_list, offset in zip(parts, offsets[:-1], strict=True)
+        ]
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Application startup...")
     logger.info("Loading Whisper model '%s' onto '%s' device...", MODEL_SIZE, DEVICE)
     try:
         ml_models["whisper_model"] = WhisperModel(
-            MODEL_SIZE, device=DEVICE, compute_type=COMPUTE_TYPE
+            MODEL_SIZE,
+            device=DEVICE,
+            compute_type=COMPUTE_TYPE,
+            cpu_threads=CPU_THREADS_PER_WORKER,
+            num_workers=INFERENCE_WORKERS,
         )
         logger.info("Whisper model loaded successfully.")
+        ml_models["scheduler"] = InferenceScheduler(
+            ml_models["whisper_model"],
+            BATCH_MAX_SIZE,
+            BATCH_MAX_WAIT_MS / 1000,
+            workers=INFERENCE_WORKERS,
+            max_queued=MAX_QUEUED_REQUESTS,
+        )
+        ml_models["scheduler"].start()
+        logger.info(
+            "Inference scheduler started (%d worker(s) x %d CPU threads, max batch size %d, "
+            "max wait %.0f ms, max queued %d).",
+            INFERENCE_WORKERS,
+            CPU_THREADS_PER_WORKER,
+            BATCH_MAX_SIZE,
+            BATCH_MAX_WAIT_MS,
+            MAX_QUEUED_REQUESTS,
+        )
     except Exception as e:
         logger.critical("CRITICAL: Failed to load Whisper model: %s", e, exc_info=True)
     yield
     logger.info("Application shutdown...")
+    if "scheduler" in ml_models:
+        await ml_models["scheduler"].stop()
     ml_models.clear()
     logger.info("Whisper model unloaded.")
 
@@ -39,64 +452,167 @@ async def lifespan(app: FastAPI):
 app = FastAPI(lifespan=lifespan)
 
 
+def _overloaded() -> HTTPException:
+    logger.warning("Rejecting transcription request: inference queue is full.")
+    return HTTPException(
+        status_code=503,
+        detail="STT service is overloaded. Please retry later.",
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
+
+
+async def _transcribe(
+    audio: np.ndarray,
+    language: str | None = None,
+    session_id: str | None = None,
+    detect_language: bool = False,
+) -> dict:
+    session = sessions.get(session_id) if session_id else None
+    initial_prompt = None
+    if session is not None:
+        if not detect_language:
+            language = language or session.language_hint()
+        initial_prompt = session.prompt
+
+    try:
+        result = await ml_models["scheduler"].transcribe(audio, language, initial_prompt)
+    except SchedulerFull as e:
+        raise _overloaded() from e
+    if session is not None:
+        session.update(result)
+
+    logger.info(
+        "Detected language '%s' with probability %f",
+        result["detected_language"],
+        result["language_probability"],
+    )
+    logger.info(
+        "Successfully transcribed audio. Result length: %d chars.",
+        len(result["transcription"]),
+    )
+    return result
+
+
+def _check_ready() -> None:
+    if "scheduler" not in ml_models:
+        logger.error("Transcription request failed because the model is not loaded.")
+        raise HTTPException(status_code=503, detail="Model is not loaded or ready.")
+    if ml_models["scheduler"].is_full:
+        # Reject before reading and decoding the upload; the client should back off.
+        raise _overloaded()
+
+
+def _check_language(language: str | None) -> None:
+    model = ml_models.get("whisper_model")
+    if language and model is not None and language not in model.supported_languages:
+        raise HTTPException(status_code=400, detail=f"Unsupported language '{language}'.")
+
+
 @app.post("/transcribe")
-async def transcribe_audio(audio_file: UploadFile = File(...)):  # noqa: B008
+async def transcribe_audio(
+    audio_file: UploadFile = File(...),  # noqa: B008
+    language: str | None = Form(None),  # noqa: B008
+    session_id: str | None = Form(None),  # noqa: B008
+    detect_language: bool = Form(False),  # noqa: B008
+):
     """
     Transcribes audio from an uploaded file using a pre-loaded Whisper model.
 
     Args:
         - audio_file (UploadFile): The audio file to be transcribed. This is expected to be
         - an instance of FastAPI's UploadFile, which allows for asynchronous file handling.
+        - language (str, optional): The spoken language, if the caller already knows it.
+        - Skips language detection; 'detected_language' is then this language.
+        - session_id (str, optional): Identifies the speaker across requests. The session
+        - keeps the detected language (so later requests skip detection) and the end of the
+        - previous transcription as context for the next one.
+        - detect_language (bool, optional): Detect the language for this request even if the
+        - session has one (a given `language` still wins). The result updates the session.
 
     Raises:
         - HTTPException:
+            - 400: If the language is not supported by the model.
             - 503: If the Whisper model is not loaded or ready.
+            - 503 (with Retry-After): If the inference queue is full.
             - 500: If an error occurs during the transcription process.
     Returns:
         - dict: A dictionary containing:
             - 'transcription': the transcribed text
+            - 'words': word timestamps (seconds from the start of the audio)
             - 'detected_language': the ISO language code detected by Whisper
             - 'language_probability': confidence score for the detected language
+            - 'language_detected': False if the language was given rather than detected
     """
-
-    if "whisper_model" not in ml_models:
-        logger.error("Transcription request failed because the model is not loaded.")
-        raise HTTPException(status_code=503, detail="Model is not loaded or ready.")
+    _check_ready()
+    _check_language(language)
 
     logger.info("Received audio file '%s' for transcription.", audio_file.filename)
     try:
         audio_bytes = await audio_file.read()
-        audio_stream = io.BytesIO(audio_bytes)
 
-        loop = asyncio.get_event_loop()
-        segments, info = await loop.run_in_executor(
-            None,
-            lambda: ml_models["whisper_model"].transcribe(audio_stream, vad_filter=True),
+        loop = asyncio.get_running_loop()
+        audio = await loop.run_in_executor(
+            None, lambda: decode_audio(io.BytesIO(audio_bytes), sampling_rate=SAMPLE_RATE)
         )
+        return await _transcribe(audio, language, session_id, detect_language)
 
-        detected_language = info.language
-        language_probability = info.language_probability
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error during transcription: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"An error occurred: {e}") from e
 
-        logger.info(
-            "Detected language '%s' with probability %f",
-            detected_language,
-            language_probability,
-        )
 
-        transcription_parts = [segment.text for segment in segments if segment.no_speech_prob < 0.6]
-        transcription = "".join(transcription_parts).strip()
+@app.post("/transcribe/pcm")
+async def transcribe_pcm(
+    request: Request,
+    sample_rate: int = Query(..., ge=MIN_PCM_SAMPLE_RATE, le=MAX_PCM_SAMPLE_RATE),
+    encoding: str = Query("pcm_s16le"),
+    language: str | None = Query(None),
+    session_id: str | None = Query(None),
+    detect_language: bool = Query(False),
+):
+    """
+    Transcribes raw mono PCM sent as the request body (application/octet-stream).
+    Skips container decoding entirely; see `pcm_to_float32` for the conversion.
+
+    Args:
+        - sample_rate (int): Sample rate of the PCM data, e.g. 48000.
+        - encoding (str): 'pcm_s16le' (16-bit int) or 'pcm_f32le' (32-bit float).
+        - language (str, optional): As for `/transcribe`.
+        - session_id (str, optional): As for `/transcribe`.
+        - detect_language (bool, optional): As for `/transcribe`.
 
-        logger.info(
-            "Successfully transcribed audio. Result length: %d chars.",
-            len(transcription),
+    Raises:
+        - HTTPException:
+            - 400: If the encoding or language is unknown, or the body is not a whole number
+              of samples.
+            - 503: If the model is not loaded, or (with Retry-After) the queue is full.
+            - 500: If an error occurs during the transcription process.
+    Returns:
+        - dict: The same fields as `/transcribe`.
+    """
+    _check_ready()
+    _check_language(language)
+
+    if encoding not in PCM_DTYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported encoding '{encoding}'. Use one of: {', '.join(PCM_DTYPES)}.",
         )
-        
-        return {
-            "transcription": transcription,
-            "detected_language": detected_language,
-            "language_probability": language_probability,
-        }
+    data = await request.body()
+    if len(data) % PCM_DTYPES[encoding].itemsize:
+        raise HTTPException(status_code=400, detail="Body length is not a whole number of samples.")
+
+    logger.info(
+        "Received %d bytes of %s PCM at %d Hz for transcription.", len(data), encoding, sample_rate
+    )
+    try:
+        audio = pcm_to_float32(data, encoding, sample_rate)
+        return await _transcribe(audio, language, session_id, detect_language)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Error during transcription: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"An error occurred: {e}") from e
@@ -106,4 +622,10 @@ async def transcribe_audio(audio_file: UploadFile = File(...)):  # noqa: B008
 def health_check():
     """Simple health check endpoint."""
     model_loaded = "whisper_model" in ml_models
-    return {"status": "ok", "model_loaded": model_loaded}
+    queued = ml_models["scheduler"].queued if "scheduler" in ml_models else 0
+    return {
+        "status": "ok",
+        "model_loaded": model_loaded,
+        "queued_requests": queued,
+        "active_sessions": len(sessions),
+    }
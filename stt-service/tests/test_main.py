@@ -1,4 +1,11 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
 import pytest
+from fastapi.testclient import TestClient
+
+import main
 
 
 def test_synchronous_pass():
@@ -14,3 +21,372 @@ async def test_asynchronous_pass():
     Verifies that pytest-asyncio is configured correctly.
     """
     assert "test" != None
+
+
+# --- Inference scheduler ---
+
+
+class FakeModel:
+    """Stands in for WhisperModel; each clip's 'language' is encoded in its first sample."""
+
+    languages = {1.0: "en", 2.0: "es"}
+
+    def detect_language(self, audio):
+        return self.languages[float(audio[0])], 0.9, []
+
+    def transcribe(self, audio, **kwargs):
+        word = SimpleNamespace(word=" single", start=0.2, end=0.6, probability=0.9)
+        segment = SimpleNamespace(text=" single", no_speech_prob=0.1, words=[word])
+        return [segment], SimpleNamespace(language="en", language_probability=0.8)
+
+
+class FakePipeline:
+    def __init__(self):
+        self.calls = []
+        self.prompts = []
+
+    def transcribe(
+        self, audio, language, clip_timestamps, batch_size, word_timestamps, initial_prompt
+    ):
+        self.calls.append((language, batch_size))
+        self.prompts.append(initial_prompt)
+        segments = [
+            SimpleNamespace(
+                start=clip["start"],
+                text=f" {language}{i}",
+                no_speech_prob=0.1,
+                words=[
+                    SimpleNamespace(
+                        word=f" {language}{i}",
+                        start=clip["start"] + 0.25,
+                        end=clip["start"] + 0.5,
+                        probability=0.9,
+                    )
+                ],
+            )
+            for i, clip in enumerate(clip_timestamps)
+        ]
+        return segments, None
+
+
+def _clip(marker: float, seconds: float = 1.0) -> np.ndarray:
+    return np.full(int(main.SAMPLE_RATE * seconds), marker, dtype=np.float32)
+
+
+def test_transcribe_batch_groups_requests_by_language(monkeypatch):
+    monkeypatch.setattr(main, "get_speech_timestamps", lambda audio, options: [{"start": 0}])
+    scheduler = main.InferenceScheduler(FakeModel(), max_batch_size=8, max_wait_seconds=0.01)
+    scheduler._pipeline = FakePipeline()
+
+    results = scheduler.transcribe_batch([_clip(1.0), _clip(2.0), _clip(1.0, seconds=2.0)])
+
+    assert sorted(scheduler._pipeline.calls) == [("en", 2), ("es", 1)]
+    assert [r["transcription"] for r in results] == ["en0", "es0", "en1"]
+    assert [r["detected_language"] for r in results] == ["en", "es", "en"]
+
+
+def test_transcribe_batch_word_timestamps_are_relative_to_each_request(monkeypatch):
+    monkeypatch.setattr(main, "get_speech_timestamps", lambda audio, options: [{"start": 0}])
+    scheduler = main.InferenceScheduler(FakeModel(), max_batch_size=8, max_wait_seconds=0.01)
+    scheduler._pipeline = FakePipeline()
+
+    results = scheduler.transcribe_batch([_clip(1.0, seconds=2.0), _clip(1.0)])
+
+    assert [r["words"] for r in results] == [
+        [{"word": " en0", "start": 0.25, "end": 0.5, "probability": 0.9}],
+        [{"word": " en1", "start": 0.25, "end": 0.5, "probability": 0.9}],
+    ]
+
+
+def test_single_request_returns_word_timestamps():
+    scheduler = main.InferenceScheduler(FakeModel(), max_batch_size=8, max_wait_seconds=0.01)
+    result = scheduler.transcribe_batch([_clip(1.0)])[0]
+    assert result["words"] == [{"word": " single", "start": 0.2, "end": 0.6, "probability": 0.9}]
+
+
+def test_transcribe_batch_skips_detection_for_requests_with_a_language(monkeypatch):
+    monkeypatch.setattr(main, "get_speech_timestamps", lambda audio, options: [{"start": 0}])
+    model = FakeModel()
+    detected = []
+    monkeypatch.setattr(
+        model, "detect_language", lambda audio: detected.append(audio) or ("en", 0.9, [])
+    )
+    scheduler = main.InferenceScheduler(model, max_batch_size=8, max_wait_seconds=0.01)
+    scheduler._pipeline = FakePipeline()
+
+    results = scheduler.transcribe_batch([_clip(1.0), _clip(1.0)], ["es", None])
+
+    assert len(detected) == 1
+    assert sorted(scheduler._pipeline.calls) == [("en", 1), ("es", 1)]
+    assert results[0]["detected_language"] == "es"
+    assert results[0]["language_probability"] == 1.0
+
+
+def test_transcribe_batch_skips_decoder_for_silent_requests(monkeypatch):
+    monkeypatch.setattr(main, "get_speech_timestamps", lambda audio, options: [])
+    scheduler = main.InferenceScheduler(FakeModel(), max_batch_size=8, max_wait_seconds=0.01)
+    scheduler._pipeline = FakePipeline()
+
+    results = scheduler.transcribe_batch([_clip(1.0), _clip(2.0)])
+
+    assert scheduler._pipeline.calls == []
+    assert [r["transcription"] for r in results] == ["", ""]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_batches_requests_arriving_together():
+    scheduler = main.InferenceScheduler(FakeModel(), max_batch_size=2, max_wait_seconds=0.05)
+    batch_sizes = []
+
+    def fake_transcribe_batch(audios, languages, prompts):
+        batch_sizes.append(len(audios))
+        return [{"transcription": str(float(a[0]))} for a in audios]
+
+    scheduler.transcribe_batch = fake_transcribe_batch
+    scheduler.start()
+    try:
+        results = await asyncio.gather(*(scheduler.transcribe(_clip(float(i))) for i in range(3)))
+    finally:
+        await scheduler.stop()
+
+    assert batch_sizes == [2, 1]
+    assert [r["transcription"] for r in results] == ["0.0", "1.0", "2.0"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_rejects_requests_when_queue_is_full():
+    scheduler = main.InferenceScheduler(
+        FakeModel(), max_batch_size=1, max_wait_seconds=0.0, max_queued=1
+    )
+    # Not started, so the first request stays queued.
+    pending = asyncio.ensure_future(scheduler.transcribe(_clip(1.0)))
+    await asyncio.sleep(0)
+
+    with pytest.raises(main.SchedulerFull):
+        await scheduler.transcribe(_clip(1.0))
+
+    pending.cancel()
+
+
+def test_transcribe_endpoint_returns_503_with_retry_after_when_overloaded(monkeypatch):
+    monkeypatch.setitem(main.ml_models, "scheduler", SimpleNamespace(is_full=True))
+
+    response = TestClient(main.app).post(
+        "/transcribe", files={"audio_file": ("chunk.wav", b"RIFF", "audio/wav")}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(main.RETRY_AFTER_SECONDS)
+
+
+# --- Raw PCM conversion ---
+
+
+def test_pcm_to_float32_scales_int16_and_keeps_16k():
+    data = np.array([0, 16384, -32768], dtype="<i2").tobytes()
+
+    audio = main.pcm_to_float32(data, "pcm_s16le", 16000)
+
+    assert audio.dtype == np.float32
+    np.testing.assert_allclose(audio, [0.0, 0.5, -1.0])
+
+
+def test_pcm_to_float32_downsamples_48k_by_averaging():
+    data = np.array([0.0, 0.3, 0.6, 1.0, 1.0, 1.0, 0.5], dtype="<f4").tobytes()
+
+    audio = main.pcm_to_float32(data, "pcm_f32le", 48000)
+
+    np.testing.assert_allclose(audio, [0.3, 1.0], rtol=1e-6)
+
+
+def test_pcm_to_float32_interpolates_non_integer_ratios():
+    data = np.linspace(0.0, 1.0, 22050, dtype=np.float32).tobytes()
+
+    audio = main.pcm_to_float32(data, "pcm_f32le", 22050)
+
+    assert audio.dtype == np.float32
+    assert audio.shape[0] == 16000
+    assert audio[0] == 0.0 and audio[-1] <= 1.0
+
+
+def test_transcribe_pcm_rejects_unknown_encoding(monkeypatch):
+    monkeypatch.setitem(main.ml_models, "scheduler", SimpleNamespace(is_full=False))
+
+    response = TestClient(main.app).post(
+        "/transcribe/pcm?sample_rate=16000&encoding=mp3", content=b"\x00\x00"
+    )
+
+    assert response.status_code == 400
+
+
+def test_transcribe_pcm_transcribes_raw_body(monkeypatch):
+    captured = {}
+
+    async def fake_transcribe(audio, language, initial_prompt):
+        captured["audio"] = audio
+        captured["language"] = language
+        return {"transcription": "hi", "detected_language": "en", "language_probability": 0.9}
+
+    monkeypatch.setitem(
+        main.ml_models,
+        "scheduler",
+        SimpleNamespace(is_full=False, transcribe=fake_transcribe),
+    )
+    body = np.zeros(48000, dtype="<i2").tobytes()
+
+    response = TestClient(main.app).post(
+        "/transcribe/pcm?sample_rate=48000&encoding=pcm_s16le", content=body
+    )
+
+    assert response.status_code == 200
+    assert response.json()["transcription"] == "hi"
+    assert captured["audio"].shape == (16000,)
+    assert captured["language"] is None
+
+
+def test_transcribe_pcm_passes_language_hint(monkeypatch):
+    captured = {}
+
+    async def fake_transcribe(audio, language, initial_prompt):
+        captured["language"] = language
+        return {"transcription": "hola", "detected_language": language, "language_probability": 1.0}
+
+    monkeypatch.setitem(
+        main.ml_models,
+        "scheduler",
+        SimpleNamespace(is_full=False, transcribe=fake_transcribe),
+    )
+    monkeypatch.setitem(
+        main.ml_models, "whisper_model", SimpleNamespace(supported_languages=["en", "es"])
+    )
+    client = TestClient(main.app)
+    body = np.zeros(1600, dtype="<i2").tobytes()
+
+    response = client.post("/transcribe/pcm?sample_rate=16000&language=es", content=body)
+    assert response.status_code == 200
+    assert captured["language"] == "es"
+
+    response = client.post("/transcribe/pcm?sample_rate=16000&language=xx", content=body)
+    assert response.status_code == 400
+
+
+# --- Sticky sessions ---
+
+
+def test_session_keeps_confident_language_and_prompt():
+    session = main.TranscriptionSession()
+    assert session.language_hint() is None
+
+    session.update(
+        {
+            "transcription": "hola a todos",
+            "detected_language": "es",
+            "language_probability": 0.95,
+            "language_detected": True,
+        }
+    )
+    assert session.language_hint() == "es"
+    assert session.prompt == "hola a todos"
+
+    # Results for a forced language don't change what was detected.
+    session.update({"transcription": "", "detected_language": "fr", "language_probability": 1.0})
+    assert session.language == "es" and session.prompt == "hola a todos"
+
+
+def test_session_redetects_language_periodically(monkeypatch):
+    monkeypatch.setattr(main, "SESSION_REDETECT_CHUNKS", 3)
+    session = main.TranscriptionSession()
+    session.language = "en"
+
+    assert [session.language_hint() for _ in range(3)] == ["en", "en", None]
+
+
+def test_session_store_evicts_least_recently_used_and_idle_sessions(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(main.time, "monotonic", lambda: now[0])
+    store = main.SessionStore(max_entries=2, ttl_seconds=10)
+
+    a = store.get("a")
+    store.get("b")
+    assert store.get("a") is a
+    store.get("c")  # evicts "b", the least recently used
+    assert len(store) == 2 and store.get("a") is a
+
+    now[0] = 20.0
+    assert store.get("a") is not a  # expired while idle
+    assert len(store) == 1
+
+
+def test_lone_batched_request_keeps_its_prompt(monkeypatch):
+    monkeypatch.setattr(main, "get_speech_timestamps", lambda audio, options: [{"start": 0}])
+    scheduler = main.InferenceScheduler(FakeModel(), max_batch_size=8, max_wait_seconds=0.01)
+    scheduler._pipeline = FakePipeline()
+
+    scheduler.transcribe_batch(
+        [_clip(1.0), _clip(1.0), _clip(2.0)], prompts=["en prompt", "other", "es prompt"]
+    )
+
+    # The two English requests share a batched call, so neither prompt can be used.
+    assert sorted(scheduler._pipeline.prompts, key=str) == [None, "es prompt"]
+
+
+def test_transcribe_pcm_with_session_reuses_language_and_prompt(monkeypatch):
+    calls = []
+
+    async def fake_transcribe(audio, language, initial_prompt):
+        calls.append((language, initial_prompt))
+        return {
+            "transcription": "guten tag",
+            "detected_language": language or "de",
+            "language_probability": 1.0 if language else 0.9,
+            "language_detected": language is None,
+        }
+
+    monkeypatch.setattr(main, "sessions", main.SessionStore())
+    monkeypatch.setitem(
+        main.ml_models,
+        "scheduler",
+        SimpleNamespace(is_full=False, transcribe=fake_transcribe),
+    )
+    client = TestClient(main.app)
+    body = np.zeros(1600, dtype="<i2").tobytes()
+
+    for _ in range(2):
+        response = client.post("/transcribe/pcm?sample_rate=16000&session_id=s1", content=body)
+        assert response.status_code == 200
+
+    assert calls == [(None, None), ("de", "guten tag")]
+
+
+def test_transcribe_detect_language_skips_the_session_language(monkeypatch):
+    calls = []
+    detections = iter(["de", "fr"])
+
+    async def fake_transcribe(audio, language, initial_prompt):
+        calls.append(language)
+        return {
+            "transcription": "bonjour",
+            "detected_language": language or next(detections),
+            "language_probability": 1.0 if language else 0.9,
+            "language_detected": language is None,
+        }
+
+    monkeypatch.setattr(main, "sessions", main.SessionStore())
+    monkeypatch.setattr(main, "decode_audio", lambda *args, **kwargs: _clip(1.0))
+    monkeypatch.setitem(
+        main.ml_models,
+        "scheduler",
+        SimpleNamespace(is_full=False, transcribe=fake_transcribe),
+    )
+    client = TestClient(main.app)
+
+    for detect in (False, True, False):
+        response = client.post(
+            "/transcribe",
+            files={"audio_file": ("chunk.wav", b"RIFF", "audio/wav")},
+            data={"session_id": "s1", "detect_language": str(detect).lower()},
+        )
+        assert response.status_code == 200
+
+    # The re-check ran a real detection, and its confident result became the session's.
+    assert calls == [None, None, "fr"]
@@ -1,8 +1,17 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
 import logging
 import os
+import re
+from contextlib import asynccontextmanager
+from typing import Literal
 
 import httpx
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 logging.basicConfig(level=logging.INFO, format="%(name)s - %(levelname)s - %(message)s")
@@ -12,14 +21,210 @@ logger = logging.getLogger(__name__)
 
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://ollama:11434")
 MODEL_NAME = os.getenv("OLLAMA_MODEL", "phi3:mini")
+# Texts longer than this are summarized in parts first (map-reduce), so no prompt
+# outgrows the model's context window.
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "1200"))
+# Parts summarized at the same time; Ollama queues requests beyond its own parallelism.
+SUMMARY_MAP_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "2"))
+# Rough characters per token for English text; close enough to size prompts.
+CHARS_PER_TOKEN = 4
+# Generations sent to Ollama at once, across all endpoints and callers (the advice service
+# goes through /generate). Everything beyond this waits in the priority queue.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "2"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "300"))
+# How long Ollama keeps the model in memory after the last request (Ollama's own default
+# is five minutes, after which the next request pays for loading the model again).
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+OLLAMA_PRELOAD = os.getenv("OLLAMA_PRELOAD", "true").lower() == "true"
 
-app = FastAPI()
+# Lower values are served first.
+PRIORITIES = {"interactive": 0, "background": 1}
+Priority = Literal["interactive", "background"]
 
 LENGTH_PROMPTS = {
     "short": "Summarize the following text in one to two sentences.",
     "medium": "Provide a concise summary of the following text, covering the main points.",
     "long": "Provide a detailed summary of the following text, including key details and nuances.",
 }
+CHUNK_PROMPT = (
+    "Summarize the following part of a longer conversation. "
+    "Keep the key points, decisions, names and numbers."
+)
+UPDATE_PROMPT = (
+    "Below is the summary of a conversation so far, followed by what was said since. "
+    "Rewrite the summary so it also covers the new part. Reply with the updated summary only."
+)
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?。！？])\s+|\n+")
+
+
+class LLMGateway:
+    """
+    The one way this service talks to Ollama.
+
+    All generations share a pooled HTTP client and at most `max_concurrency` of them run
+    at once; the rest wait in a priority queue, interactive requests (summaries someone is
+    waiting for) ahead of background ones (advice), first come first served within a
+    priority. Identical prompts that are already being generated are not sent again:
+    later callers wait for the same result (single-flight). Every request asks Ollama to
+    keep the model loaded for OLLAMA_KEEP_ALIVE.
+    """
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY):
+        self._max_concurrency = max(1, max_concurrency)
+        self._active = 0
+        self._waiting: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._client: httpx.AsyncClient | None = None
+        self.generated = 0
+        self.coalesced = 0
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=LLM_TIMEOUT_SECONDS)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _acquire(self, priority: int) -> None:
+        if self._active < self._max_concurrency and not self._waiting:
+            self._active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._sequence), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was already handed to us; pass it on.
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        while self._waiting:
+            _, _, waiter = heapq.heappop(self._waiting)
+            if not waiter.done():
+                # Hand the slot straight to the next waiter, so no newcomer can jump the queue.
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    @staticmethod
+    def _payload(prompt: str, stream: bool) -> dict:
+        return {
+            "model": MODEL_NAME,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+        }
+
+    async def generate(self, prompt: str, priority: Priority = "interactive") -> str:
+        key = hashlib.sha256(f"{MODEL_NAME}\0{prompt}".encode()).hexdigest()
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(self._generate(prompt, PRIORITIES[priority]))
+            self._in_flight[key] = flight
+            flight.add_done_callback(lambda done: self._finish_flight(key, done))
+        else:
+            self.coalesced += 1
+            logger.info("Joining an identical generation that is already in flight.")
+        # A caller that goes away must not cancel the generation for the others.
+        return await asyncio.shield(flight)
+
+    def _finish_flight(self, key: str, flight: asyncio.Future) -> None:
+        self._in_flight.pop(key, None)
+        if not flight.cancelled():
+            flight.exception()  # retrieved here in case every caller went away
+
+    async def _generate(self, prompt: str, priority: int) -> str:
+        await self._acquire(priority)
+        try:
+            payload = self._payload(prompt, stream=False)
+            logger.debug(f"Ollama payload: {payload}")
+            response = await self._http().post(f"{OLLAMA_URL}/api/generate", json=payload)
+            logger.info(f"Ollama response status code: {response.status_code}")
+            logger.debug(f"Ollama raw response: {response.text}")
+            response.raise_for_status()
+            data = response.json()
+        finally:
+            self._release()
+        self.generated += 1
+
+        if "response" not in data:
+            logger.error(f"Invalid response from Ollama: {data}")
+            raise HTTPException(status_code=500, detail="Invalid response from Ollama.")
+        return data["response"].strip()
+
+    async def open_stream(self, prompt: str, priority: Priority = "interactive") -> httpx.Response:
+        """
+        Starts a streamed generation and returns Ollama's response once it has answered.
+        The stream holds a slot until it is passed to `close_stream`, which must happen
+        exactly once. Streams are never coalesced, since every caller consumes its own
+        tokens.
+        """
+        await self._acquire(PRIORITIES[priority])
+        try:
+            client = self._http()
+            response = await client.send(
+                client.build_request(
+                    "POST", f"{OLLAMA_URL}/api/generate", json=self._payload(prompt, stream=True)
+                ),
+                stream=True,
+            )
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+        except BaseException:
+            self._release()
+            raise
+        return response
+
+    async def close_stream(self, response: httpx.Response) -> None:
+        try:
+            await response.aclose()
+        finally:
+            self.generated += 1
+            self._release()
+
+    async def preload(self) -> None:
+        """Loads the model into memory ahead of the first request."""
+        try:
+            response = await self._http().post(
+                f"{OLLAMA_URL}/api/generate",
+                json={"model": MODEL_NAME, "keep_alive": OLLAMA_KEEP_ALIVE},
+            )
+            response.raise_for_status()
+            logger.info(f"Model '{MODEL_NAME}' is loaded (keep_alive {OLLAMA_KEEP_ALIVE}).")
+        except Exception as e:
+            logger.warning(f"Could not preload model '{MODEL_NAME}': {e}")
+
+    def stats(self) -> dict:
+        return {
+            "active": self._active,
+            "queued": sum(1 for _, _, waiter in self._waiting if not waiter.done()),
+            "in_flight": len(self._in_flight),
+            "generated": self.generated,
+            "coalesced": self.coalesced,
+        }
+
+
+llm_gateway = LLMGateway()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    preload = asyncio.create_task(llm_gateway.preload()) if OLLAMA_PRELOAD else None
+    yield
+    if preload is not None:
+        preload.cancel()
+    await llm_gateway.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 class SummarizationRequest(BaseModel):
@@ -31,37 +236,141 @@ class SummarizationResponse(BaseModel):
     summary: str
 
 
-@app.post("/summarize", response_model=SummarizationResponse)
-async def summarize(request: SummarizationRequest):
-    logger.info(f"Received summarization request with length: {request.length}")
+class SummaryUpdateRequest(BaseModel):
+    summary: str = ""
+    text: str
+    length: str = "medium"
+
+
+class GenerateRequest(BaseModel):
+    prompt: str
+    priority: Priority = "background"
+
+
+class GenerateResponse(BaseModel):
+    response: str
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _sentences(text: str, max_chars: int):
+    """Yields the text's sentences, cutting any longer than `max_chars` at a space."""
+    for sentence in _SENTENCE_BREAK.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            yield sentence[:cut]
+            sentence = sentence[cut:].strip()
+        if sentence:
+            yield sentence
+
+
+def split_into_chunks(text: str, max_tokens: int | None = None) -> list[str]:
+    """
+    Packs whole sentences into chunks of at most `max_tokens` (estimated; defaults to
+    SUMMARY_CHUNK_TOKENS) each.
+    """
+    max_chars = max(1, max_tokens or SUMMARY_CHUNK_TOKENS) * CHARS_PER_TOKEN
+    chunks: list[str] = []
+    current = ""
+    for sentence in _sentences(text, max_chars):
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def _condense(text: str, priority: Priority = "interactive") -> str:
+    """
+    Map-reduce for long texts: splits the text into chunks on sentence boundaries,
+    summarizes the chunks concurrently (at most SUMMARY_MAP_CONCURRENCY at a time) and
+    repeats on the joined summaries until they fit in one prompt. Short texts are returned
+    unchanged.
+    """
+    semaphore = asyncio.Semaphore(max(1, SUMMARY_MAP_CONCURRENCY))
+
+    async def summarize_chunk(chunk: str) -> str:
+        async with semaphore:
+            return await llm_gateway.generate(f"{CHUNK_PROMPT}\n\n{chunk}", priority)
+
+    while estimate_tokens(text) > SUMMARY_CHUNK_TOKENS:
+        chunks = split_into_chunks(text)
+        logger.info(f"Summarizing long text in {len(chunks)} parts.")
+        condensed = "\n".join(await asyncio.gather(*(summarize_chunk(c) for c in chunks)))
+        if len(condensed) >= len(text):
+            # The model isn't shortening anything; stop rather than loop.
+            break
+        text = condensed
+    return text
+
+
+async def _build_prompt(request: SummarizationRequest) -> str:
     instruction = LENGTH_PROMPTS.get(request.length, LENGTH_PROMPTS["medium"])
-    prompt = f"{instruction}\n\n{request.text}"
+    text = await _condense(request.text)
+    return f"{instruction}\n\n{text}"
 
-    payload = {"model": MODEL_NAME, "prompt": prompt, "stream": False}
 
+@app.post("/summarize", response_model=SummarizationResponse)
+async def summarize(request: SummarizationRequest):
+    logger.info(f"Received summarization request with length: {request.length}")
     logger.info(
         "Forwarding summarization request with length '%s' to model '%s' at URL '%s'...",
         request.length,
         MODEL_NAME,
         OLLAMA_URL,
     )
-    logger.debug(f"Ollama payload: {payload}")
 
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            response = await client.post(f"{OLLAMA_URL}/api/generate", json=payload)
-            logger.info(f"Ollama response status code: {response.status_code}")
-            logger.debug(f"Ollama raw response: {response.text}")
-            response.raise_for_status()
-            data = response.json()
+        prompt = await _build_prompt(request)
+        summary_text = await llm_gateway.generate(prompt)
+        logger.info(f"Successfully generated summary. Length: {len(summary_text)} chars.")
+        return SummarizationResponse(summary=summary_text)
+
+    except httpx.RequestError as e:
+        logger.error(f"Could not connect to Ollama: {e}", exc_info=True)
+        raise HTTPException(status_code=503, detail=f"Error connecting to Ollama: {e}") from e
+    except httpx.HTTPStatusError as e:
+        logger.error(f"Ollama returned an error: {e.response.status_code} - {e.response.text}")
+        raise HTTPException(status_code=500, detail=f"Ollama failed: {e}") from e
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during summarization: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.") from e
 
-            if "response" not in data:
-                logger.error(f"Invalid response from Ollama: {data}")
-                raise HTTPException(status_code=500, detail="Invalid response from Ollama.")
 
-            summary_text = data["response"].strip()
-            logger.info(f"Successfully generated summary. Length: {len(summary_text)} chars.")
-            return SummarizationResponse(summary=summary_text)
+@app.post("/summarize/update", response_model=SummarizationResponse)
+async def update_summary(request: SummaryUpdateRequest):
+    """
+    Folds new text into an existing summary, so a running summary of a conversation can
+    be kept up to date without summarizing the whole transcript again. Without a previous
+    summary this is the same as /summarize.
+    """
+    logger.info(
+        "Received summary update request: %d chars of summary, %d chars of new text.",
+        len(request.summary),
+        len(request.text),
+    )
+    try:
+        if not request.summary.strip():
+            prompt = await _build_prompt(
+                SummarizationRequest(text=request.text, length=request.length)
+            )
+        else:
+            new_text = await _condense(request.text)
+            prompt = (
+                f"{UPDATE_PROMPT}\n\nSummary so far:\n{request.summary}"
+                f"\n\nNew part of the conversation:\n{new_text}"
+            )
+        summary_text = await llm_gateway.generate(prompt)
+        logger.info(f"Successfully updated summary. Length: {len(summary_text)} chars.")
+        return SummarizationResponse(summary=summary_text)
 
     except httpx.RequestError as e:
         logger.error(f"Could not connect to Ollama: {e}", exc_info=True)
@@ -70,10 +379,110 @@ async def summarize(request: SummarizationRequest):
         logger.error(f"Ollama returned an error: {e.response.status_code} - {e.response.text}")
         raise HTTPException(status_code=500, detail=f"Ollama failed: {e}") from e
     except Exception as e:
-        logger.error(f"An unexpected error occurred during summarization: {e}", exc_info=True)
+        logger.error(f"An unexpected error occurred while updating a summary: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="An unexpected error occurred.") from e
 
 
+async def _relay_tokens(response: httpx.Response):
+    """
+    Turns Ollama's streamed generation into NDJSON lines: `{"token": ...}` per piece of
+    text, then `{"done": true, "summary": ...}` with the whole summary, or `{"error": ...}`
+    if generation fails part way.
+    """
+    parts = []
+    try:
+        async for line in response.aiter_lines():
+            if not line.strip():
+                continue
+            chunk = json.loads(line)
+            if chunk.get("error"):
+                raise RuntimeError(chunk["error"])
+            token = chunk.get("response", "")
+            if token:
+                parts.append(token)
+                yield json.dumps({"token": token}) + "\n"
+            if chunk.get("done"):
+                break
+        summary_text = "".join(parts).strip()
+        logger.info(f"Successfully streamed summary. Length: {len(summary_text)} chars.")
+        yield json.dumps({"done": True, "summary": summary_text}) + "\n"
+    except Exception as e:
+        logger.error(f"Summary stream failed: {e}", exc_info=True)
+        yield json.dumps({"error": "Summarization failed while streaming."}) + "\n"
+
+
+async def _stream_summary(request: SummarizationRequest):
+    """
+    Builds the prompt, opens a gateway stream and relays it (see `_relay_tokens`). Runs as
+    the response body, so the client has its headers before the long texts are condensed
+    or a slot is free; failures up to that point are reported as an `{"error": ...}` line.
+    """
+    try:
+        # For long texts the parts are summarized first; only the final pass streams.
+        prompt = await _build_prompt(request)
+        response = await llm_gateway.open_stream(prompt)
+    except httpx.RequestError as e:
+        logger.error(f"Could not connect to Ollama: {e}", exc_info=True)
+        yield json.dumps({"error": f"Error connecting to Ollama: {e}"}) + "\n"
+        return
+    except (httpx.HTTPStatusError, HTTPException) as e:
+        logger.error(f"Ollama returned an error: {e}")
+        yield json.dumps({"error": f"Ollama failed: {e}"}) + "\n"
+        return
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during summarization: {e}", exc_info=True)
+        yield json.dumps({"error": "An unexpected error occurred."}) + "\n"
+        return
+
+    try:
+        async for line in _relay_tokens(response):
+            yield line
+    finally:
+        await llm_gateway.close_stream(response)
+
+
+class _ClosingStreamingResponse(StreamingResponse):
+    """
+    Closes its body generator however the response ends, so a gateway slot held by the
+    generator is handed back even when the client goes away mid-stream.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+
+
+@app.post("/summarize/stream")
+async def summarize_stream(request: SummarizationRequest):
+    """
+    Like /summarize, but streams the summary as it is generated (NDJSON, see
+    `_stream_summary`), so the first words arrive long before the whole summary is done.
+    """
+    logger.info(f"Received streaming summarization request with length: {request.length}")
+    return _ClosingStreamingResponse(_stream_summary(request), media_type="application/x-ndjson")
+
+
+@app.post("/generate", response_model=GenerateResponse)
+async def generate(request: GenerateRequest):
+    """
+    Runs a raw prompt through the gateway, so other services (the advice service) share
+    its queue, single-flight and loaded model instead of calling Ollama on their own.
+    Callers default to background priority.
+    """
+    logger.info(f"Received {request.priority} generation request ({len(request.prompt)} chars).")
+    try:
+        text = await llm_gateway.generate(request.prompt, request.priority)
+        return GenerateResponse(response=text)
+    except httpx.RequestError as e:
+        logger.error(f"Could not connect to Ollama: {e}", exc_info=True)
+        raise HTTPException(status_code=503, detail=f"Error connecting to Ollama: {e}") from e
+    except httpx.HTTPStatusError as e:
+        logger.error(f"Ollama returned an error: {e.response.status_code} - {e.response.text}")
+        raise HTTPException(status_code=500, detail=f"Ollama failed: {e}") from e
+
+
 @app.get("/health")
 def health_check():
-    return {"status": "ok", "model": MODEL_NAME}
+    return {"status": "ok", "model": MODEL_NAME, "llm": llm_gateway.stats()}
@@ -14,3 +14,296 @@ async def test_asynchronous_pass():
     Verifies that pytest-asyncio is configured correctly.
     """
     assert 1 == 1
+
+
+def _fake_ollama(monkeypatch, handler):
+    """Routes the service's calls to Ollama to `handler` instead of the network."""
+    import httpx
+
+    import main
+
+    real_client = httpx.AsyncClient
+
+    def client_factory(*args, **kwargs):
+        return real_client(transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(main.httpx, "AsyncClient", client_factory)
+    monkeypatch.setattr(main, "llm_gateway", main.LLMGateway())
+
+
+def test_summarize_stream_relays_tokens_then_summary(monkeypatch):
+    import json
+
+    import httpx
+    from fastapi.testclient import TestClient
+
+    import main
+
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        lines = [
+            {"response": " The", "done": False},
+            {"response": " gist.", "done": False},
+            {"response": "", "done": True},
+        ]
+        return httpx.Response(200, content="\n".join(json.dumps(line) for line in lines))
+
+    _fake_ollama(monkeypatch, handler)
+
+    response = TestClient(main.app).post("/summarize/stream", json={"text": "long text"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events == [
+        {"token": " The"},
+        {"token": " gist."},
+        {"done": True, "summary": "The gist."},
+    ]
+    assert requests[0]["stream"] is True
+    assert requests[0]["prompt"].endswith("long text")
+
+
+def test_summarize_stream_reports_ollama_errors_as_a_line(monkeypatch):
+    import json
+
+    import httpx
+    from fastapi.testclient import TestClient
+
+    import main
+
+    _fake_ollama(monkeypatch, lambda request: httpx.Response(500, text="model not loaded"))
+
+    response = TestClient(main.app).post("/summarize/stream", json={"text": "long text"})
+
+    # The headers are already sent before Ollama is asked, so the failure is a line.
+    assert response.status_code == 200
+    (event,) = [json.loads(line) for line in response.text.splitlines()]
+    assert "Ollama failed" in event["error"]
+    assert main.llm_gateway.stats()["active"] == 0
+
+
+def test_split_into_chunks_keeps_sentences_whole():
+    import main
+
+    sentence = "This sentence is exactly forty chars ok."
+    text = " ".join([sentence] * 10)
+
+    chunks = main.split_into_chunks(text, max_tokens=25)  # 100 characters
+
+    assert len(chunks) == 5
+    assert all(chunk == f"{sentence} {sentence}" for chunk in chunks)
+
+
+def test_split_into_chunks_cuts_overlong_sentence_at_spaces():
+    import main
+
+    text = " ".join(["word"] * 100)  # no sentence boundary at all
+
+    chunks = main.split_into_chunks(text, max_tokens=10)  # 40 characters
+
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_summarize_long_text_maps_chunks_then_reduces(monkeypatch):
+    import json
+
+    import httpx
+    from fastapi.testclient import TestClient
+
+    import main
+
+    monkeypatch.setattr(main, "SUMMARY_CHUNK_TOKENS", 50)  # 200 characters
+    monkeypatch.setattr(main, "SUMMARY_MAP_CONCURRENCY", 2)
+    prompts = []
+
+    def handler(request):
+        prompt = json.loads(request.content)["prompt"]
+        prompts.append(prompt)
+        if prompt.startswith(main.CHUNK_PROMPT):
+            return httpx.Response(200, json={"response": f"part {len(prompts)}."})
+        return httpx.Response(200, json={"response": "Final summary."})
+
+    _fake_ollama(monkeypatch, handler)
+    text = " ".join(f"Sentence number {i} of the meeting." for i in range(30))
+
+    response = TestClient(main.app).post("/summarize", json={"text": text, "length": "short"})
+
+    assert response.status_code == 200
+    assert response.json() == {"summary": "Final summary."}
+    map_prompts = [p for p in prompts if p.startswith(main.CHUNK_PROMPT)]
+    assert len(map_prompts) == len(main.split_into_chunks(text, 50)) > 1
+    # One final pass with the length instruction over the joined part summaries.
+    final_prompt = prompts[-1]
+    assert final_prompt.startswith(main.LENGTH_PROMPTS["short"])
+    assert "part" in final_prompt and "Sentence number" not in final_prompt
+
+
+def test_summarize_update_folds_new_text_into_previous_summary(monkeypatch):
+    import json
+
+    import httpx
+    from fastapi.testclient import TestClient
+
+    import main
+
+    prompts = []
+
+    def handler(request):
+        prompts.append(json.loads(request.content)["prompt"])
+        return httpx.Response(200, json={"response": " Updated summary. "})
+
+    _fake_ollama(monkeypatch, handler)
+
+    response = TestClient(main.app).post(
+        "/summarize/update",
+        json={"summary": "They greeted each other.", "text": "Then they discussed the budget."},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"summary": "Updated summary."}
+    assert len(prompts) == 1
+    assert prompts[0].startswith(main.UPDATE_PROMPT)
+    assert "They greeted each other." in prompts[0]
+    assert "Then they discussed the budget." in prompts[0]
+
+
+def test_generate_asks_ollama_to_keep_the_model_loaded(monkeypatch):
+    import json
+
+    import httpx
+    from fastapi.testclient import TestClient
+
+    import main
+
+    payloads = []
+
+    def handler(request):
+        payloads.append(json.loads(request.content))
+        return httpx.Response(200, json={"response": " Some advice. "})
+
+    _fake_ollama(monkeypatch, handler)
+
+    response = TestClient(main.app).post("/generate", json={"prompt": "Advise me."})
+
+    assert response.status_code == 200
+    assert response.json() == {"response": "Some advice."}
+    assert payloads[0]["prompt"] == "Advise me."
+    assert payloads[0]["keep_alive"] == main.OLLAMA_KEEP_ALIVE
+
+
+async def test_gateway_coalesces_identical_prompts(monkeypatch):
+    import asyncio
+    import json
+
+    import httpx
+
+    import main
+
+    prompts = []
+
+    async def handler(request):
+        prompts.append(json.loads(request.content)["prompt"])
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"response": "Same answer."})
+
+    _fake_ollama(monkeypatch, handler)
+    gateway = main.llm_gateway
+
+    results = await asyncio.gather(
+        gateway.generate("Summarize this."),
+        gateway.generate("Summarize this."),
+        gateway.generate("Something else."),
+    )
+
+    assert results == ["Same answer."] * 3
+    assert sorted(prompts) == ["Something else.", "Summarize this."]
+    assert gateway.coalesced == 1
+    assert gateway.stats()["in_flight"] == 0
+
+
+async def test_gateway_limits_concurrency_and_serves_interactive_first(monkeypatch):
+    import asyncio
+    import json
+
+    import httpx
+
+    import main
+
+    started = []
+    running = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal running, peak
+        started.append(json.loads(request.content)["prompt"])
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return httpx.Response(200, json={"response": "ok"})
+
+    _fake_ollama(monkeypatch, handler)
+    gateway = main.LLMGateway(max_concurrency=1)
+
+    first = asyncio.create_task(gateway.generate("first", "background"))
+    await asyncio.sleep(0)  # let it take the only slot
+    queued = [
+        asyncio.create_task(gateway.generate("advice 1", "background")),
+        asyncio.create_task(gateway.generate("advice 2", "background")),
+        asyncio.create_task(gateway.generate("summary", "interactive")),
+    ]
+    await asyncio.gather(first, *queued)
+
+    assert peak == 1
+    assert started == ["first", "summary", "advice 1", "advice 2"]
+    assert gateway.stats()["active"] == 0
+
+
+@pytest.mark.parametrize("failing_message", ["http.response.start", "http.response.body"])
+async def test_summarize_stream_gives_slot_back_when_client_disconnects(
+    monkeypatch, failing_message
+):
+    import json
+
+    import httpx
+
+    import main
+
+    def handler(request):
+        return httpx.Response(200, content=json.dumps({"response": "x", "done": True}))
+
+    _fake_ollama(monkeypatch, handler)
+    body = json.dumps({"text": "long text"}).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/summarize/stream",
+        "raw_path": b"/summarize/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == failing_message:
+            raise OSError("client went away")
+
+    with pytest.raises(Exception):  # noqa: B017
+        await main.app(scope, receive, send)
+
+    assert main.llm_gateway.stats()["active"] == 0
@@ -1,8 +1,14 @@
+import asyncio
 import logging
 import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
 
 import httpx
 from fastapi import FastAPI, HTTPException
+from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel
 
 logging.basicConfig(level=logging.INFO, format="%(name)s - %(levelname)s - %(message)s")
@@ -10,7 +16,159 @@ logger = logging.getLogger(__name__)
 
 LIBRETRANSLATE_URL = os.getenv("LIBRETRANSLATE_URL", "http://libretranslate:5000")
 
-app = FastAPI()
+# --- Cache configuration ---
+CACHE_ENABLED = os.getenv("TRANSLATION_CACHE_ENABLED", "true").lower() == "true"
+CACHE_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL_SECONDS = float(os.getenv("TRANSLATION_CACHE_TTL_SECONDS", "86400"))
+# Long texts rarely repeat; only short phrases are worth keeping.
+CACHE_MAX_TEXT_LENGTH = int(os.getenv("TRANSLATION_CACHE_MAX_TEXT_LENGTH", "500"))
+# Optional MongoDB store shared by all translation replicas.
+CACHE_SHARED_URL = os.getenv("TRANSLATION_CACHE_MONGO_URL")
+CACHE_SHARED_DB = os.getenv("TRANSLATION_CACHE_MONGO_DB", "translatar_db")
+CACHE_SHARED_COLLECTION = "translation_cache"
+
+# --- Batch configuration ---
+BATCH_MAX_SEGMENTS = int(os.getenv("TRANSLATION_BATCH_MAX_SEGMENTS", "500"))
+# Texts sent to LibreTranslate in one list-valued `q`.
+BATCH_GROUP_SIZE = int(os.getenv("TRANSLATION_BATCH_GROUP_SIZE", "50"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("TRANSLATION_BATCH_MAX_CONCURRENCY", "4"))
+
+
+def normalize_text(text: str) -> str:
+    """Cache key form of a phrase: surrounding and repeated whitespace removed."""
+    return " ".join(text.split())
+
+
+class MongoCacheStore:
+    """
+    Shared second cache tier in MongoDB, so replicas benefit from each other's results.
+    Entries expire through a TTL index on `expires_at`.
+    """
+
+    def __init__(self, url: str, db_name: str, ttl_seconds: float):
+        self._client = AsyncIOMotorClient(url)
+        self._collection = self._client[db_name][CACHE_SHARED_COLLECTION]
+        self._ttl = timedelta(seconds=ttl_seconds)
+
+    async def start(self) -> None:
+        await self._collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def get(self, key: tuple[str, str, str]) -> str | None:
+        doc = await self._collection.find_one(
+            {"_id": "|".join(key), "expires_at": {"$gt": datetime.now(UTC)}},
+            {"translated_text": 1},
+        )
+        return doc["translated_text"] if doc else None
+
+    async def set(self, key: tuple[str, str, str], value: str) -> None:
+        await self._collection.replace_one(
+            {"_id": "|".join(key)},
+            {"translated_text": value, "expires_at": datetime.now(UTC) + self._ttl},
+            upsert=True,
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class TranslationCache:
+    """
+    LRU cache of translations keyed on (normalized text, source, target), with a TTL and
+    an optional shared store behind it. Conversational speech repeats short phrases a lot,
+    and every hit saves a LibreTranslate call.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+        shared_store=None,
+    ):
+        self._entries: OrderedDict[tuple[str, str, str], tuple[float, str]] = OrderedDict()
+        self._max_entries = max(1, max_entries)
+        self._ttl_seconds = ttl_seconds
+        self.shared_store = shared_store
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def _get_local(self, key: tuple[str, str, str]) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_local(self, key: tuple[str, str, str], value: str) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: tuple[str, str, str]) -> str | None:
+        value = self._get_local(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        if self.shared_store is not None:
+            try:
+                value = await self.shared_store.get(key)
+            except Exception as e:
+                logger.warning("Shared translation cache lookup failed: %s", e)
+            if value is not None:
+                self.shared_hits += 1
+                self._set_local(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: tuple[str, str, str], value: str) -> None:
+        self._set_local(key, value)
+        if self.shared_store is not None:
+            try:
+                await self.shared_store.set(key, value)
+            except Exception as e:
+                logger.warning("Shared translation cache update failed: %s", e)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.shared_hits) / lookups, 3) if lookups else 0.0,
+            "shared_store": self.shared_store is not None,
+        }
+
+
+translation_cache = TranslationCache()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if CACHE_ENABLED and CACHE_SHARED_URL:
+        store = MongoCacheStore(CACHE_SHARED_URL, CACHE_SHARED_DB, CACHE_TTL_SECONDS)
+        try:
+            await store.start()
+            translation_cache.shared_store = store
+            logger.info("Using shared translation cache at %s.", CACHE_SHARED_URL)
+        except Exception as e:
+            logger.warning("Shared translation cache unavailable: %s", e)
+            store.close()
+    yield
+    if translation_cache.shared_store is not None:
+        translation_cache.shared_store.close()
+        translation_cache.shared_store = None
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 class TranslationRequest(BaseModel):
@@ -23,6 +181,14 @@ class TranslationResponse(BaseModel):
     translated_text: str
 
 
+class BatchTranslationRequest(BaseModel):
+    segments: list[TranslationRequest]
+
+
+class BatchTranslationResponse(BaseModel):
+    translations: list[str]
+
+
 @app.post("/translate", response_model=TranslationResponse)
 async def translate(request: TranslationRequest):
     """
@@ -45,8 +211,23 @@ async def translate(request: TranslationRequest):
     Logs:
         - info: When forwarding the translation request and upon successful translation
         - error: When connection fails, invalid responses occur, or unexpected errors happen
+    Caching:
+        Short phrases are answered from `translation_cache` when the same
+        (normalized text, source, target) was translated recently.
     """
 
+    cache_key = (normalize_text(request.text), request.source_lang, request.target_lang)
+    cacheable = CACHE_ENABLED and len(cache_key[0]) <= CACHE_MAX_TEXT_LENGTH
+    if cacheable:
+        cached_text = await translation_cache.get(cache_key)
+        if cached_text is not None:
+            logger.info(
+                "Translation cache hit for lang '%s'->'%s'.",
+                request.source_lang,
+                request.target_lang,
+            )
+            return TranslationResponse(translated_text=cached_text)
+
     payload = {
         "q": request.text,
         "source": request.source_lang,
@@ -77,6 +258,8 @@ async def translate(request: TranslationRequest):
                 "Successfully received translation. Result length: %d chars.",
                 len(translated_text),
             )
+            if cacheable:
+                await translation_cache.set(cache_key, translated_text)
             return TranslationResponse(translated_text=translated_text)
 
     except httpx.RequestError as e:
@@ -96,6 +279,129 @@ async def translate(request: TranslationRequest):
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {e}") from e
 
 
+async def _translate_group(
+    client: httpx.AsyncClient, texts: list[str], source_lang: str, target_lang: str
+) -> list[str]:
+    """
+    Translates several texts of one language pair with a single list-valued `q`. Falls back
+    to one request per text if the engine answers a list with a single string.
+    """
+    payload = {"q": texts, "source": source_lang, "target": target_lang, "format": "text"}
+    response = await client.post(f"{LIBRETRANSLATE_URL}/translate", json=payload)
+    response.raise_for_status()
+    translated = response.json().get("translatedText")
+
+    if isinstance(translated, list) and len(translated) == len(texts):
+        return translated
+    if isinstance(translated, str) and len(texts) == 1:
+        return [translated]
+
+    logger.warning("Translation engine did not accept a list-valued 'q'; translating one by one.")
+    results = []
+    for text in texts:
+        payload["q"] = text
+        response = await client.post(f"{LIBRETRANSLATE_URL}/translate", json=payload)
+        response.raise_for_status()
+        data = response.json()
+        if "translatedText" not in data:
+            raise ValueError(f"Invalid response from translation engine: {data}")
+        results.append(data["translatedText"])
+    return results
+
+
+@app.post("/translate/batch", response_model=BatchTranslationResponse)
+async def translate_batch(request: BatchTranslationRequest):
+    """
+    Translate many segments in one call. Segments may have different language pairs.
+
+    Cached segments are answered straight away. The rest are de-duplicated on their
+    normalized text (the cache key), grouped by language pair, and one original text per
+    key is sent to LibreTranslate in list-valued `q` requests of up to
+    `BATCH_GROUP_SIZE` texts, with at most `BATCH_MAX_CONCURRENCY` requests in flight.
+    Args:
+        request (BatchTranslationRequest): A list of `segments`, each with the same fields
+            as a `/translate` request.
+    Returns:
+        BatchTranslationResponse: `translations`, in the same order as the segments.
+    Raises:
+        HTTPException:
+            - 413 status: When more than `BATCH_MAX_SEGMENTS` segments are sent
+            - 503 status: When unable to connect to the LibreTranslate service
+            - 500 status: When the translation engine returns an error or invalid response
+    """
+    segments = request.segments
+    if len(segments) > BATCH_MAX_SEGMENTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many segments; at most {BATCH_MAX_SEGMENTS} per batch.",
+        )
+
+    translations: list[str | None] = [None] * len(segments)
+    # (source, target) -> normalized text -> indices of the segments with that text
+    pending: dict[tuple[str, str], dict[str, list[int]]] = {}
+    for index, segment in enumerate(segments):
+        key = normalize_text(segment.text)
+        if not key:
+            translations[index] = ""
+            continue
+        if CACHE_ENABLED and len(key) <= CACHE_MAX_TEXT_LENGTH:
+            cached_text = await translation_cache.get(
+                (key, segment.source_lang, segment.target_lang)
+            )
+            if cached_text is not None:
+                translations[index] = cached_text
+                continue
+        pair = (segment.source_lang, segment.target_lang)
+        pending.setdefault(pair, {}).setdefault(key, []).append(index)
+
+    groups = []
+    for pair, by_key in pending.items():
+        keys = list(by_key)
+        for start in range(0, len(keys), BATCH_GROUP_SIZE):
+            groups.append((pair, keys[start : start + BATCH_GROUP_SIZE]))
+    logger.info(
+        "Batch of %d segments: %d to translate in %d request(s) over %d language pair(s).",
+        len(segments),
+        sum(len(by_key) for by_key in pending.values()),
+        len(groups),
+        len(pending),
+    )
+
+    semaphore = asyncio.Semaphore(max(1, BATCH_MAX_CONCURRENCY))
+
+    async def run_group(client: httpx.AsyncClient, pair: tuple[str, str], keys: list[str]):
+        # The engine gets the text as written, like `/translate`; the key only de-duplicates.
+        texts = [segments[pending[pair][key][0]].text for key in keys]
+        async with semaphore:
+            results = await _translate_group(client, texts, *pair)
+        for key, translated_text in zip(keys, results, strict=True):
+            for index in pending[pair][key]:
+                translations[index] = translated_text
+            if CACHE_ENABLED and len(key) <= CACHE_MAX_TEXT_LENGTH:
+                await translation_cache.set((key, *pair), translated_text)
+
+    try:
+        async with httpx.AsyncClient() as client:
+            await asyncio.gather(*(run_group(client, pair, keys) for pair, keys in groups))
+    except httpx.RequestError as e:
+        logger.error("Could not connect to translation engine: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=503, detail=f"Error connecting to translation engine: {e}"
+        ) from e
+    except httpx.HTTPStatusError as e:
+        logger.error(
+            "Translation engine returned an error: %s - %s",
+            e.response.status_code,
+            e.response.text,
+        )
+        raise HTTPException(status_code=500, detail=f"Translation engine failed: {e}") from e
+    except Exception as e:
+        logger.error("An unexpected error occurred: %s", str(e), exc_info=True)
+        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {e}") from e
+
+    return BatchTranslationResponse(translations=translations)
+
+
 @app.get("/health")
 def health_check():
-    return {"status": "ok", "provider": "libretranslate"}
+    return {"status": "ok", "provider": "libretranslate", "cache": translation_cache.stats()}
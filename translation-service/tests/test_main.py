@@ -1,4 +1,8 @@
+import httpx
 import pytest
+from fastapi import HTTPException
+
+import main
 
 
 def test_synchronous_pass():
@@ -14,3 +18,236 @@ async def test_asynchronous_pass():
     Verifies that pytest-asyncio is configured correctly.
     """
     assert "test" == "test"
+
+
+# --- Translation cache ---
+
+
+class FakeLibreTranslate:
+    """Stands in for httpx.AsyncClient and counts calls to LibreTranslate."""
+
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def post(self, url, json):
+        FakeLibreTranslate.calls += 1
+        request = httpx.Request("POST", url)
+        return httpx.Response(200, json={"translatedText": f"<{json['q']}>"}, request=request)
+
+
+class FakeSharedStore:
+    def __init__(self):
+        self.entries = {}
+
+    async def get(self, key):
+        return self.entries.get(key)
+
+    async def set(self, key, value):
+        self.entries[key] = value
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    FakeLibreTranslate.calls = 0
+    monkeypatch.setattr(main.httpx, "AsyncClient", FakeLibreTranslate)
+    cache = main.TranslationCache(max_entries=2, ttl_seconds=60)
+    monkeypatch.setattr(main, "translation_cache", cache)
+    return cache
+
+
+async def test_repeated_phrase_is_served_from_cache(cache):
+    request = main.TranslationRequest(text="thank you", source_lang="en", target_lang="es")
+    first = await main.translate(request)
+    second = await main.translate(
+        main.TranslationRequest(text="  thank   you ", source_lang="en", target_lang="es")
+    )
+
+    assert first.translated_text == second.translated_text == "<thank you>"
+    assert FakeLibreTranslate.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+async def test_cache_key_includes_language_pair(cache):
+    await main.translate(main.TranslationRequest(text="yes", source_lang="en", target_lang="es"))
+    await main.translate(main.TranslationRequest(text="yes", source_lang="en", target_lang="fr"))
+
+    assert FakeLibreTranslate.calls == 2
+
+
+async def test_least_recently_used_entry_is_evicted(cache):
+    await cache.set(("a", "en", "es"), "A")
+    await cache.set(("b", "en", "es"), "B")
+    await cache.get(("a", "en", "es"))
+    await cache.set(("c", "en", "es"), "C")
+
+    assert await cache.get(("b", "en", "es")) is None
+    assert await cache.get(("a", "en", "es")) == "A"
+
+
+async def test_expired_entries_are_not_returned(monkeypatch):
+    cache = main.TranslationCache(max_entries=10, ttl_seconds=5)
+    now = [100.0]
+    monkeypatch.setattr(main.time, "monotonic", lambda: now[0])
+    await cache.set(("hello", "en", "es"), "hola")
+    now[0] += 6
+
+    assert await cache.get(("hello", "en", "es")) is None
+    assert cache.stats()["entries"] == 0
+
+
+async def test_shared_store_hit_fills_local_cache():
+    store = FakeSharedStore()
+    await main.TranslationCache(shared_store=store).set(("hello", "en", "es"), "hola")
+
+    replica = main.TranslationCache(shared_store=store)
+    assert await replica.get(("hello", "en", "es")) == "hola"
+    store.entries.clear()
+    assert await replica.get(("hello", "en", "es")) == "hola"
+    assert replica.stats()["shared_hits"] == 1 and replica.stats()["hits"] == 1
+
+
+class FakeMongoCollection:
+    def __init__(self):
+        self.docs = {}
+        self.indexes = []
+
+    async def create_index(self, field, **kwargs):
+        self.indexes.append((field, kwargs))
+
+    async def find_one(self, query, projection=None):
+        doc = self.docs.get(query["_id"])
+        if doc is None or doc["expires_at"] <= query["expires_at"]["$gt"]:
+            return None
+        return doc
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = doc
+
+
+class FakeMotorClient:
+    collection = FakeMongoCollection()
+
+    def __init__(self, url):
+        self.url = url
+        self.closed = False
+
+    def __getitem__(self, db_name):
+        return {main.CACHE_SHARED_COLLECTION: FakeMotorClient.collection}
+
+    def close(self):
+        self.closed = True
+
+
+async def test_lifespan_enables_the_shared_mongo_store(monkeypatch, cache):
+    FakeMotorClient.collection = FakeMongoCollection()
+    monkeypatch.setattr(main, "AsyncIOMotorClient", FakeMotorClient)
+    monkeypatch.setattr(main, "CACHE_SHARED_URL", "mongodb://mongo:27017")
+
+    async with main.lifespan(main.app):
+        store = cache.shared_store
+        assert isinstance(store, main.MongoCacheStore)
+        assert FakeMotorClient.collection.indexes == [("expires_at", {"expireAfterSeconds": 0})]
+
+        await main.translate(main.TranslationRequest(text="hi", source_lang="en", target_lang="es"))
+        assert FakeMotorClient.collection.docs["hi|en|es"]["translated_text"] == "<hi>"
+        # Another replica with an empty local cache is answered from Mongo.
+        replica = main.TranslationCache(shared_store=store)
+        assert await replica.get(("hi", "en", "es")) == "<hi>"
+
+    assert cache.shared_store is None
+    assert store._client.closed
+
+
+# --- Batch translation ---
+
+
+class FakeBatchLibreTranslate(FakeLibreTranslate):
+    """Accepts list-valued `q` like LibreTranslate and records every request."""
+
+    requests = []
+
+    async def post(self, url, json):
+        FakeBatchLibreTranslate.requests.append(json)
+        q = json["q"]
+        translated = [f"{json['target']}:{t}" for t in q] if isinstance(q, list) else q
+        request = httpx.Request("POST", url)
+        return httpx.Response(200, json={"translatedText": translated}, request=request)
+
+
+@pytest.fixture
+def batch_engine(monkeypatch, cache):
+    FakeBatchLibreTranslate.requests = []
+    monkeypatch.setattr(main.httpx, "AsyncClient", FakeBatchLibreTranslate)
+    return FakeBatchLibreTranslate.requests
+
+
+def _segments(*spec):
+    return main.BatchTranslationRequest(
+        segments=[
+            main.TranslationRequest(text=text, source_lang="en", target_lang=target)
+            for text, target in spec
+        ]
+    )
+
+
+async def test_batch_groups_segments_by_language_pair(batch_engine):
+    response = await main.translate_batch(
+        _segments(("hello", "es"), ("bye", "fr"), ("thanks", "es"), ("hello", "es"))
+    )
+
+    assert response.translations == ["es:hello", "fr:bye", "es:thanks", "es:hello"]
+    assert sorted((r["target"], r["q"]) for r in batch_engine) == [
+        ("es", ["hello", "thanks"]),
+        ("fr", ["bye"]),
+    ]
+
+
+async def test_batch_sends_original_text_but_dedups_on_normalized_text(batch_engine, cache):
+    response = await main.translate_batch(
+        _segments(("Hello,\n  world.", "es"), ("Hello, world.", "es"))
+    )
+
+    # Line breaks and spacing reach the engine as written; the normalized form is only a key.
+    assert [r["q"] for r in batch_engine] == [["Hello,\n  world."]]
+    assert response.translations == ["es:Hello,\n  world."] * 2
+    assert await cache.get(("Hello, world.", "en", "es")) == "es:Hello,\n  world."
+
+
+async def test_batch_uses_and_fills_the_cache(batch_engine, cache):
+    await cache.set(("hello", "en", "es"), "hola")
+    response = await main.translate_batch(_segments(("hello", "es"), ("", "es"), ("bye", "es")))
+
+    assert response.translations == ["hola", "", "es:bye"]
+    assert [r["q"] for r in batch_engine] == [["bye"]]
+    assert await cache.get(("bye", "en", "es")) == "es:bye"
+
+
+async def test_batch_splits_large_groups(batch_engine, monkeypatch):
+    monkeypatch.setattr(main, "BATCH_GROUP_SIZE", 2)
+    await main.translate_batch(_segments(*[(f"t{i}", "es") for i in range(5)]))
+
+    assert sorted(len(r["q"]) for r in batch_engine) == [1, 2, 2]
+
+
+async def test_batch_falls_back_when_list_q_is_unsupported(monkeypatch, cache):
+    # The single-text fake answers a list `q` with one string.
+    FakeLibreTranslate.calls = 0
+    response = await main.translate_batch(_segments(("a", "es"), ("b", "es")))
+
+    assert len(response.translations) == 2
+    assert FakeLibreTranslate.calls == 3
+
+
+async def test_batch_rejects_too_many_segments(monkeypatch):
+    monkeypatch.setattr(main, "BATCH_MAX_SEGMENTS", 1)
+    with pytest.raises(HTTPException) as exc:
+        await main.translate_batch(_segments(("a", "es"), ("b", "es")))
+    assert exc.value.status_code == 413